@@ -0,0 +1,43 @@
+"""
+Conditional GET helpers (ETag / If-None-Match).
+
+Views compute a cheap version fingerprint (ids, max `updated_at`, counts)
+before doing any serialization work. If the client already holds that
+version, they answer 304 Not Modified straight away.
+"""
+
+import hashlib
+
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the given version parts."""
+    digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request, etag: str) -> bool:
+    """True if the request's If-None-Match covers `etag` (weak comparison, RFC 9110)."""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in header.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    return with_cache_headers(response, etag, cache_control)
+
+
+def with_cache_headers(response, etag: str, cache_control: str):
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    # Fingerprints include the caller's identity where it matters
+    patch_vary_headers(response, ['Authorization'])
+    return response
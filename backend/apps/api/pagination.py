@@ -0,0 +1,239 @@
+"""
+API Pagination classes.
+"""
+
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class StandardPageNumberPagination(PageNumberPagination):
+    """Page-number pagination that honours the `page_size` parameter sent by the LIFF app."""
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+def _cursor_value(value):
+    """JSON fallback for cursor values. Keeps full microsecond precision (DjangoJSONEncoder truncates)."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor (keyset) pagination over a composite ordering.
+
+    Instead of OFFSET, each page continues from the last row of the previous
+    one: `WHERE (a, b, id) > (last_a, last_b, last_id)`. Deep pages therefore
+    cost the same as page 1, and no COUNT(*) is run unless asked for.
+
+    - Ordering comes from the queryset's `order_by()` (or the view's
+      `cursor_ordering`), and must end with a unique field; `id` is appended
+      otherwise. Ordering fields must be non-nullable.
+    - `next` / `previous` are links with an opaque `cursor` parameter.
+    - `?with_total=1` adds `count`, capped at `total_cap` rows
+      (`count_is_approximate` is true when the cap was hit). The
+      `next`/`previous` links drop the flag, so the count is paid once.
+    - Requests that send `page` are served by `StandardPageNumberPagination`,
+      so existing page-number clients keep working unchanged.
+    """
+
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    total_query_param = 'with_total'
+    total_cap = 1000
+    fallback_class = StandardPageNumberPagination
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fallback = None
+        if self.fallback_class and 'page' in request.query_params and self.cursor_query_param not in request.query_params:
+            self.fallback = self.fallback_class()
+            self.fallback.page_size = self.page_size
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        queryset = queryset.order_by(*self.ordering)
+        self.count = self.get_approximate_count(queryset, view) if self._wants_total(request) else None
+
+        cursor = self.decode_cursor(request)
+        reverse = False
+        if cursor is not None:
+            reverse = cursor['reverse']
+            values = self.parse_values(queryset, cursor['values'])
+            queryset = queryset.filter(self.keyset_filter(values, reverse))
+        if reverse:
+            queryset = queryset.reverse()
+
+        # Fetch one extra row to know whether another page exists
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        return rows
+
+    def _wants_total(self, request):
+        return request.query_params.get(self.total_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+
+        payload = OrderedDict()
+        if self.count is not None:
+            payload['count'], payload['count_is_approximate'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True},
+                'count_is_approximate': {'type': 'boolean'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Ordering & keyset filter
+    # ------------------------------------------------------------------
+
+    def get_ordering(self, queryset, view):
+        ordering = list(queryset.query.order_by) or list(getattr(view, 'cursor_ordering', None) or [])
+        if not ordering:
+            ordering = list(queryset.model._meta.ordering or [])
+        if not all(isinstance(field, str) for field in ordering):
+            raise ValueError('KeysetPagination only supports plain field orderings')
+
+        unique = {'id', 'pk', queryset.model._meta.pk.name}
+        if not ordering or ordering[-1].lstrip('-') not in unique:
+            ordering.append('id')
+        return ordering
+
+    def keyset_filter(self, values, reverse):
+        """
+        Expand a row comparison over mixed ASC/DESC fields into
+        (a > x) | (a = x & b > y) | (a = x & b = y & id > z).
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            lookup = f"{name}__lt" if descending else f"{name}__gt"
+            condition |= equal & Q(**{lookup: value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def row_values(self, row):
+        return [getattr(row, field.lstrip('-')) for field in self.ordering]
+
+    def parse_values(self, queryset, raw_values):
+        """Convert JSON cursor values back to Python using each field's type."""
+        if len(raw_values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        values = []
+        for field, raw in zip(self.ordering, raw_values):
+            name = field.lstrip('-')
+            try:
+                if name in queryset.query.annotations:
+                    output_field = queryset.query.annotations[name].output_field
+                else:
+                    output_field = queryset.model._meta.pk if name == 'pk' else queryset.model._meta.get_field(name)
+                values.append(output_field.to_python(raw))
+            except Exception:
+                raise NotFound(self.invalid_cursor_message)
+        return values
+
+    # ------------------------------------------------------------------
+    # Cursors
+    # ------------------------------------------------------------------
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps({'v': values, 'r': int(reverse)}, default=_cursor_value, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            return {'values': list(payload['v']), 'reverse': bool(payload.get('r'))}
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self.encode_cursor(self.row_values(self.page[-1]), reverse=False)
+        return self._link(cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        cursor = self.encode_cursor(self.row_values(self.page[0]), reverse=True)
+        return self._link(cursor)
+
+    def _link(self, cursor):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.total_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    # ------------------------------------------------------------------
+    # Sizes & totals
+    # ------------------------------------------------------------------
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_approximate_count(self, queryset, view=None):
+        """
+        Count at most `total_cap + 1` rows, so the cost stays bounded on
+        large tables. Returns (count, is_approximate).
+        """
+        capped = queryset.order_by()[:self.total_cap + 1].count()
+        if capped > self.total_cap:
+            return self.total_cap, True
+        return capped, False
+
+
+class ParticipantPagination(KeysetPagination):
+    """Larger pages for the admin campaign participant table."""
+    page_size = 50
+    max_page_size = 200
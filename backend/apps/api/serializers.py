@@ -4,9 +4,10 @@ API Serializers
 
 from rest_framework import serializers
 from decimal import Decimal
+from django.utils import timezone
 from apps.users.models import User
-from apps.influencers.models import Interest, InfluencerProfile, SocialPlatformAccount, BlacklistedInfluencer
-from apps.campaigns.models import Campaign, CampaignApplication
+from apps.influencers.models import Interest, InfluencerProfile, SocialPlatformAccount, SocialFetchJob, BlacklistedInfluencer
+from apps.campaigns.models import Campaign, CampaignApplication, InsightAnalysisJob
 
 
 class InterestSerializer(serializers.ModelSerializer):
@@ -17,32 +18,49 @@ class InterestSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'name_th', 'icon', 'image']
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserAvatarMixin:
+    """
+    `picture_url` / `picture_small_url` point at our mirrored thumbnails
+    (medium / small), or at LINE's picture until it has been mirrored.
+    """
+
+    def get_picture_url(self, obj):
+        return obj.avatar_url('medium')
+
+    def get_picture_small_url(self, obj):
+        return obj.avatar_url('small')
+
+
+class UserSerializer(UserAvatarMixin, serializers.ModelSerializer):
     """Serializer for User model."""
     
     has_profile = serializers.SerializerMethodField()
+    picture_url = serializers.SerializerMethodField()
+    picture_small_url = serializers.SerializerMethodField()
     
     class Meta:
         model = User
         fields = [
             'id', 'line_user_id', 'display_name', 'is_superuser', 'is_staff',
-            'picture_url', 'status', 'has_profile'
+            'picture_url', 'picture_small_url', 'status', 'has_profile'
         ]
     
     def get_has_profile(self, obj):
         return hasattr(obj, 'profile')
 
 
-class UserWithProfileSerializer(serializers.ModelSerializer):
+class UserWithProfileSerializer(UserAvatarMixin, serializers.ModelSerializer):
     """Serializer for User with profile information."""
     
     profile = serializers.SerializerMethodField()
+    picture_url = serializers.SerializerMethodField()
+    picture_small_url = serializers.SerializerMethodField()
     
     class Meta:
         model = User
         fields = [
             'id', 'line_user_id', 'display_name', 'is_superuser', 'is_staff',
-            'picture_url', 'status', 'profile'
+            'picture_url', 'picture_small_url', 'status', 'profile'
         ]
     
     def get_profile(self, obj):
@@ -187,6 +205,10 @@ class CampaignListSerializer(serializers.ModelSerializer):
     
     def get_user_status(self, obj):
         """Get user's application status for this campaign."""
+        # CampaignListView annotates the status onto each row
+        if hasattr(obj, 'user_status'):
+            return obj.user_status
+        
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             try:
@@ -198,6 +220,10 @@ class CampaignListSerializer(serializers.ModelSerializer):
     
     def get_priority(self, obj):
         """Calculate display priority for sorting."""
+        # CampaignListView annotates the priority it sorts by
+        if hasattr(obj, 'priority'):
+            return obj.priority
+        
         user_status = self.get_user_status(obj)
         
         if user_status in ['APPROVED', 'WORK_IN_PROGRESS', 'SCRIPT_APPROVED', 'DRAFT_APPROVED']:
@@ -326,23 +352,72 @@ class SubmitWorkSerializer(serializers.Serializer):
         return data
 
 
+class InsightAnalysisJobSerializer(serializers.ModelSerializer):
+    """Status of a background insight analysis, polled by the LIFF app."""
+    
+    status_url = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = InsightAnalysisJob
+        fields = ['id', 'status', 'attempts', 'error', 'created_at', 'started_at', 'finished_at', 'status_url']
+    
+    def get_status_url(self, obj):
+        request = self.context.get('request')
+        path = f'/api/v1/applications/{obj.application_id}/insight-analysis/'
+        return request.build_absolute_uri(path) if request else path
+
+
+
+class SocialFetchJobSerializer(serializers.ModelSerializer):
+    """Handle for a social profile fetch queued behind its platform's rate limit."""
+    
+    eta_seconds = serializers.SerializerMethodField()
+    status_url = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = SocialFetchJob
+        fields = ['token', 'purpose', 'platform', 'status', 'scheduled_for', 'eta_seconds', 'created_at', 'finished_at', 'status_url']
+    
+    def get_eta_seconds(self, obj):
+        if obj.status != 'PENDING':
+            return 0
+        return max(round((obj.scheduled_for - timezone.now()).total_seconds()), 0)
+    
+    def get_status_url(self, obj):
+        request = self.context.get('request')
+        path = f'/api/v1/social/fetch-jobs/{obj.token}/'
+        return request.build_absolute_uri(path) if request else path
+
 class ValidateDriveLinkSerializer(serializers.Serializer):
     """Serializer for Google Drive link validation."""
     
     link = serializers.URLField()
 
 
+class ValidateDriveLinksSerializer(serializers.Serializer):
+    """Serializer for batch Google Drive link validation."""
+    
+    MAX_LINKS = 50
+    
+    links = serializers.ListField(
+        child=serializers.URLField(), allow_empty=False, max_length=MAX_LINKS
+    )
+
+
 class SocialPlatformAccountSerializer(serializers.ModelSerializer):
     """Serializer for connected social media accounts."""
     
     platform_display = serializers.CharField(source='get_platform_display', read_only=True)
     followers_formatted = serializers.CharField(read_only=True)
+    # Mirrored thumbnails, or the platform's URL until mirrored
+    profile_picture_url = serializers.SerializerMethodField()
+    profile_picture_small_url = serializers.SerializerMethodField()
     
     class Meta:
         model = SocialPlatformAccount
         fields = [
             'id', 'platform', 'platform_display', 'platform_user_id',
-            'username', 'profile_url', 'profile_picture_url',
+            'username', 'profile_url', 'profile_picture_url', 'profile_picture_small_url',
             'followers_count', 'followers_formatted', 'following_count',
             'posts_count', 'is_verified', 'connected_at', 'last_synced_at'
         ]
@@ -352,6 +427,12 @@ class SocialPlatformAccountSerializer(serializers.ModelSerializer):
             'is_verified', 'connected_at', 'last_synced_at'
         ]
 
+    def get_profile_picture_url(self, obj):
+        return obj.avatar_url('medium')
+
+    def get_profile_picture_small_url(self, obj):
+        return obj.avatar_url('small')
+
 
 class SocialConnectSerializer(serializers.Serializer):
     """Connect a new social media account."""
@@ -359,7 +440,7 @@ class SocialConnectSerializer(serializers.Serializer):
     profile_url = serializers.URLField()
 
 
-class InfluencerApprovalSerializer(serializers.ModelSerializer):
+class InfluencerApprovalSerializer(UserAvatarMixin, serializers.ModelSerializer):
     """
     Comprehensive serializer for Admin Influencer Approval Dashboard.
     Consolidates data from User, Profile, and Social Accounts.
@@ -367,12 +448,14 @@ class InfluencerApprovalSerializer(serializers.ModelSerializer):
     profile = serializers.SerializerMethodField()
     social_accounts = SocialPlatformAccountSerializer(many=True, read_only=True)
     blacklist_matches = serializers.SerializerMethodField()
+    picture_url = serializers.SerializerMethodField()
+    picture_small_url = serializers.SerializerMethodField()
     
     class Meta:
         model = User
         fields = [
             'id', 'line_user_id', 'display_name', 'is_superuser', 'picture_url', 
-            'status', 'created_at', 'profile', 'social_accounts',
+            'picture_small_url', 'status', 'created_at', 'profile', 'social_accounts',
             'blacklist_matches'
         ]
 
@@ -540,7 +623,7 @@ class CampaignCreateSerializer(serializers.ModelSerializer):
             'application_deadline', 'content_deadline',
             'application_deadline', 'content_deadline',
             'script_deadline', 'draft_deadline', 'final_deadline', 'insight_deadline',
-            'requirements', 'status'
+            'requirements', 'status', 'publish_at'
         ]
 
 class CampaignUpdateSerializer(serializers.ModelSerializer):
@@ -556,5 +639,111 @@ class CampaignUpdateSerializer(serializers.ModelSerializer):
             'budget', 'location', 'show_slip_to_client', 'followers_required', 'brief_url',
             'application_deadline', 'content_deadline',
             'script_deadline', 'draft_deadline', 'final_deadline', 'insight_deadline',
-            'requirements', 'status'
+            'requirements', 'status', 'publish_at'
+        ]
+
+
+class CampaignParticipantSerializer(serializers.ModelSerializer):
+    """
+    One application as a row of the admin campaign page.
+
+    `fields` selects what is rendered: 'summary' (default) leaves out the
+    heavy per-participant JSON (submissions, insight_data, feedback notes),
+    'full' includes it, or pass a list / comma-separated string of names.
+    Expects user, user__profile and insight_metric to be select_related and
+    user__social_accounts / user__profile__interests to be prefetched.
+    """
+
+    DETAIL_FIELDS = ['submissions', 'insight_data', 'insight_feedback', 'insight_note']
+
+    user_id = serializers.IntegerField(read_only=True)
+    display_name = serializers.CharField(source='user.display_name', read_only=True)
+    picture_url = serializers.SerializerMethodField()
+    current_stage = serializers.ReadOnlyField()
+    in_revision = serializers.SerializerMethodField()
+    payment_slip = serializers.SerializerMethodField()
+    insight_submitted_at = serializers.SerializerMethodField()
+    metrics = serializers.SerializerMethodField()
+    profile = serializers.SerializerMethodField()
+    social_accounts = serializers.SerializerMethodField()
+    submissions = serializers.JSONField(source='submission_data', read_only=True)
+
+    class Meta:
+        model = CampaignApplication
+        fields = [
+            'id', 'user_id', 'display_name', 'picture_url', 'status', 'current_stage',
+            'in_revision', 'applied_at', 'updated_at', 'insight_files', 'insight_image',
+            'insight_submitted_at', 'payment_slip', 'metrics', 'profile', 'social_accounts',
+            'submissions', 'insight_data', 'insight_feedback', 'insight_note',
+        ]
+        read_only_fields = fields
+
+    def __init__(self, *args, fields='summary', **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.resolve_fields(fields)
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def resolve_fields(cls, value):
+        """Field names for a `fields` value ('summary', 'full', or names). Unknown names are ignored."""
+        if not value or value == 'summary':
+            return [name for name in cls.Meta.fields if name not in cls.DETAIL_FIELDS]
+        if value == 'full':
+            return list(cls.Meta.fields)
+        names = value.split(',') if isinstance(value, str) else value
+        requested = {name.strip() for name in names}
+        return [name for name in cls.Meta.fields if name in requested or name == 'id']
+
+    def get_picture_url(self, obj):
+        return obj.user.avatar_url('small')
+
+    def get_in_revision(self, obj):
+        """True if the latest submission of any stage was sent back for changes."""
+        for data in (obj.submission_data or {}).values():
+            latest = data[-1] if isinstance(data, list) and data else data
+            if isinstance(latest, dict) and latest.get('status') == 'revision_requested':
+                return True
+        return False
+
+    def get_payment_slip(self, obj):
+        return obj.payment_slip.url if obj.payment_slip else None
+
+    def get_insight_submitted_at(self, obj):
+        return obj.insight_submitted_at.isoformat() if obj.insight_submitted_at else None
+
+    def get_metrics(self, obj):
+        metric = obj.insight_metric if hasattr(obj, 'insight_metric') else None
+        return {
+            'total_views': getattr(metric, 'total_views', 0),
+            'total_likes': getattr(metric, 'total_likes', 0),
+            'total_comments': getattr(metric, 'total_comments', 0),
+            'total_shares': getattr(metric, 'total_shares', 0),
+            'engagement_rate': getattr(metric, 'engagement_rate', 0.0),
+            'cost_per_view': getattr(metric, 'cost_per_view', 0.0),
+        }
+
+    def get_profile(self, obj):
+        profile = obj.user.profile if hasattr(obj.user, 'profile') else None
+        return {
+            'phone': profile.phone if profile else '',
+            'fullname': profile.full_name_th if profile else '',
+            'email': profile.email if profile else '',
+            'interests': [
+                {'id': i.id, 'name': i.name_th, 'icon': i.icon}
+                for i in profile.interests.all()
+            ] if profile else [],
+            'line_id': obj.user.line_user_id,
+        }
+
+    def get_social_accounts(self, obj):
+        return [
+            {
+                'platform': acc.platform,
+                'username': acc.username,
+                'profile_url': acc.profile_url,
+                'followers_count': acc.followers_count,
+                'followers_formatted': acc.followers_formatted,
+            } for acc in obj.user.social_accounts.all()
         ]
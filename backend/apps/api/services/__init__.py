@@ -1,2 +1,5 @@
 from .google_drive import GoogleDriveValidator
 from .gemini import GeminiService
+from .feed_cache import FeedCache
+from .image_proxy import ImageProxyCache, ImageProxyError
+from .campaign_report import SharedCampaignReport
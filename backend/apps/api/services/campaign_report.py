@@ -0,0 +1,243 @@
+"""
+Shared Campaign Report (Excel export of a public shared campaign)
+"""
+
+import logging
+import re
+from io import BytesIO
+from itertools import islice
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Prefetch
+
+from apps.campaigns.models import CampaignApplication
+from apps.campaigns.services import PaymentSlipService
+from apps.influencers.models import SocialPlatformAccount
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCampaignReport:
+    """
+    Builds the .xlsx behind SharedCampaignExportView and caches the finished
+    file per campaign.
+
+    - openpyxl write-only workbook: rows are streamed to the sheet as they
+      are built instead of keeping a cell grid in memory.
+    - Applications are read in chunks with their TikTok account prefetched;
+      each chunk's slip thumbnails are read from storage concurrently
+      (PaymentSlipService.read_thumbnails).
+    - Cache entries embed a per-campaign version, bumped whenever the
+      campaign or one of its applications is saved or deleted (api.signals).
+      Profile and follower changes only show up after the TTL
+      (SHARED_REPORT_CACHE_TIMEOUT).
+    """
+
+    CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    PREFIX = 'report'
+    VERSION_KEY = 'report:v:campaign:{campaign_id}'
+    STATS_KEY = 'report:stats:{name}'
+
+    CHUNK_SIZE = 200  # applications per query, and per batch of slip reads
+    SLIP_HEIGHT = 80  # px, as shown in the sheet
+
+    @staticmethod
+    def _cache():
+        return caches[getattr(settings, 'SHARED_REPORT_CACHE_ALIAS', 'default')]
+
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'SHARED_REPORT_CACHE_TIMEOUT', 600)
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def invalidate(cls, campaign_id) -> None:
+        """Call when the campaign or any of its applications changes."""
+        key = cls.VERSION_KEY.format(campaign_id=campaign_id)
+        cache = cls._cache()
+        try:
+            # Versions must outlive the entries they guard
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, 1, timeout=None)
+        except Exception as e:
+            logger.warning(f"[SharedReport] Could not bump {key}: {e}")
+
+    @classmethod
+    def build_key(cls, campaign) -> str:
+        version = cls._cache().get(cls.VERSION_KEY.format(campaign_id=campaign.pk)) or 0
+        return f"{cls.PREFIX}:{campaign.pk}:{version}"
+
+    @classmethod
+    def get(cls, campaign) -> Tuple[bytes, bool]:
+        """(xlsx bytes, served from cache)."""
+        key = cls.build_key(campaign)
+        try:
+            content = cls._cache().get(key)
+        except Exception as e:
+            logger.warning(f"[SharedReport] Read failed: {e}")
+            content = None
+        if content is not None:
+            cls._count('hit')
+            return content, True
+
+        cls._count('miss')
+        content = cls.render(campaign)
+        if len(content) <= getattr(settings, 'SHARED_REPORT_CACHE_MAX_BYTES', 20 * 1024 * 1024):
+            try:
+                cls._cache().set(key, content, timeout=cls._timeout())
+            except Exception as e:
+                logger.warning(f"[SharedReport] Write failed: {e}")
+        return content, False
+
+    # ------------------------------------------------------------------
+    # Workbook
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def applications(campaign):
+        return CampaignApplication.objects.filter(campaign=campaign).select_related('user').prefetch_related(
+            Prefetch(
+                'user__social_accounts',
+                queryset=SocialPlatformAccount.objects.filter(platform='tiktok'),
+                to_attr='tiktok_accounts',
+            )
+        ).order_by('-applied_at', 'id')
+
+    @staticmethod
+    def latest_link(submission_data, stage):
+        data = submission_data.get(stage)
+        if not data:
+            return ''
+        return (data[-1].get('link') if isinstance(data, list) else data.get('link')) or ''
+
+    @classmethod
+    def render(cls, campaign) -> bytes:
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.drawing.image import Image as XLImage
+        from openpyxl.styles import Alignment, Font, PatternFill
+        from openpyxl.utils import get_column_letter
+
+        show_slips = campaign.show_slip_to_client
+
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Campaign Report")
+
+        headers = [
+            'ID', 'Influencer', 'TikTok', 'Followers',
+            'Status' if not show_slips else 'Payment Slip',
+            'Script Link', 'Draft Link', 'Final Link',
+            'Last Update'
+        ]
+
+        # Column widths must be set before the first row is written
+        for col_num in range(1, len(headers) + 1):
+            ws.column_dimensions[get_column_letter(col_num)].width = 20
+        ws.column_dimensions['B'].width = 30  # Name
+        ws.column_dimensions['F'].width = 40  # Script
+        ws.column_dimensions['G'].width = 40  # Draft
+        ws.column_dimensions['H'].width = 40  # Final
+
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="8B5CF6", end_color="8B5CF6", fill_type="solid")  # Purple
+        header_alignment = Alignment(horizontal="center")
+        header_row = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            header_row.append(cell)
+        ws.append(header_row)
+
+        row_alignment = Alignment(vertical="center")
+        row_num = 1
+        applications = cls.applications(campaign).iterator(chunk_size=cls.CHUNK_SIZE)
+        while True:
+            chunk = list(islice(applications, cls.CHUNK_SIZE))
+            if not chunk:
+                break
+            slips: Dict[int, bytes] = PaymentSlipService.read_thumbnails(chunk) if show_slips else {}
+
+            for app in chunk:
+                row_num += 1
+                tiktok = app.user.tiktok_accounts[0] if app.user.tiktok_accounts else None
+                display_name = re.sub(r'\?{2,}', '', app.user.display_name or '').strip('?').strip()
+                submission_data = app.submission_data or {}
+
+                # Slip column: empty cell, the image is anchored over it
+                slip = slips.get(app.id)
+                if slip:
+                    try:
+                        img = XLImage(BytesIO(slip))
+                        # Keep aspect ratio
+                        img.width = int(cls.SLIP_HEIGHT * img.width / img.height)
+                        img.height = cls.SLIP_HEIGHT
+                        img.anchor = f'E{row_num}'
+                        ws.add_image(img)
+                        # Row height to fit the image (set before the row is written)
+                        ws.row_dimensions[row_num].height = 65
+                    except Exception as e:
+                        logger.warning(f"[SharedReport] Error embedding slip for app {app.id}: {e}")
+
+                values = [
+                    app.id,
+                    display_name,
+                    tiktok.username if tiktok else '-',
+                    tiktok.followers_count if tiktok else 0,
+                    '' if show_slips else app.status,
+                    cls.latest_link(submission_data, 'script'),
+                    cls.latest_link(submission_data, 'draft'),
+                    cls.latest_link(submission_data, 'final'),
+                    app.updated_at.strftime('%Y-%m-%d %H:%M')
+                ]
+                row = []
+                for value in values:
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.alignment = row_alignment
+                    row.append(cell)
+                ws.append(row)
+
+        output = BytesIO()
+        wb.save(output)
+        return output.getvalue()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _count(cls, name: str) -> None:
+        key = cls.STATS_KEY.format(name=name)
+        cache = cls._cache()
+        try:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+        except Exception:
+            pass
+
+    @classmethod
+    def stats(cls) -> Dict:
+        """Hit/miss counters (per process for local memory, shared for Redis)."""
+        cache = cls._cache()
+        hits = cache.get(cls.STATS_KEY.format(name='hit')) or 0
+        misses = cache.get(cls.STATS_KEY.format(name='miss')) or 0
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+            'timeout': cls._timeout(),
+        }
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cls._cache().delete_many([cls.STATS_KEY.format(name='hit'), cls.STATS_KEY.format(name='miss')])
@@ -0,0 +1,157 @@
+"""
+Campaign Feed Cache Service
+"""
+
+import hashlib
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+class FeedCache:
+    """
+    Versioned cache of the rendered campaign feed per (user, status tab).
+
+    Entries are never deleted. Every key embeds two version counters:
+    - a global version, bumped whenever any Campaign changes
+    - a per-user version, bumped whenever that user's applications change
+    Bumping a version makes the old entries unreachable; they expire on TTL.
+
+    Uses the cache alias in FEED_CACHE_ALIAS: local memory on a single
+    instance, Redis (REDIS_URL) when several instances share the feed.
+    """
+
+    PREFIX = 'feed'
+    GLOBAL_VERSION_KEY = 'feed:v:global'
+    USER_VERSION_KEY = 'feed:v:user:{user_id}'
+    STATS_KEY = 'feed:stats:{name}'
+
+    # Query parameters that never affect the result (cache busters)
+    IGNORED_PARAMS = {'_t'}
+
+    @staticmethod
+    def _cache():
+        return caches[getattr(settings, 'FEED_CACHE_ALIAS', 'default')]
+
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'FEED_CACHE_TIMEOUT', 300)
+
+    # ------------------------------------------------------------------
+    # Versions
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _get_version(cls, key: str) -> int:
+        return cls._cache().get(key) or 0
+
+    @classmethod
+    def _bump(cls, key: str) -> None:
+        cache = cls._cache()
+        try:
+            # Versions must outlive the entries they guard
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, 1, timeout=None)
+        except Exception as e:
+            logger.warning(f"[FeedCache] Could not bump {key}: {e}")
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        """Call when any Campaign changes (including bulk updates, which fire no signals)."""
+        cls._bump(cls.GLOBAL_VERSION_KEY)
+
+    @classmethod
+    def invalidate_user(cls, user_id) -> None:
+        """Call when a user's CampaignApplication rows change."""
+        cls._bump(cls.USER_VERSION_KEY.format(user_id=user_id))
+
+    @classmethod
+    def invalidate_users(cls, user_ids: Iterable) -> None:
+        for user_id in set(user_ids):
+            cls.invalidate_user(user_id)
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build_key(cls, request, tab: Optional[str]) -> str:
+        """
+        Key for one rendered page of the feed. Includes the user's approval
+        status (it decides whether there is a feed at all), the host (links
+        in the payload are absolute) and the pagination parameters.
+        """
+        user = request.user
+        cache = cls._cache()
+        versions = cache.get_many([cls.GLOBAL_VERSION_KEY, cls.USER_VERSION_KEY.format(user_id=user.pk)])
+        global_version = versions.get(cls.GLOBAL_VERSION_KEY, 0)
+        user_version = versions.get(cls.USER_VERSION_KEY.format(user_id=user.pk), 0)
+
+        params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            if name not in cls.IGNORED_PARAMS
+            for value in values
+        )
+        fingerprint = hashlib.md5(
+            repr((request.get_host(), user.status, tab or '', params)).encode('utf-8')
+        ).hexdigest()
+        return f"{cls.PREFIX}:{global_version}:{user_version}:{user.pk}:{fingerprint}"
+
+    @classmethod
+    def get(cls, key: str):
+        try:
+            data = cls._cache().get(key)
+        except Exception as e:
+            logger.warning(f"[FeedCache] Read failed: {e}")
+            data = None
+        cls._count('hit' if data is not None else 'miss')
+        return data
+
+    @classmethod
+    def set(cls, key: str, data) -> None:
+        try:
+            cls._cache().set(key, data, timeout=cls._timeout())
+        except Exception as e:
+            logger.warning(f"[FeedCache] Write failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _count(cls, name: str) -> None:
+        key = cls.STATS_KEY.format(name=name)
+        cache = cls._cache()
+        try:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+        except Exception:
+            pass
+
+    @classmethod
+    def stats(cls) -> Dict:
+        """Hit/miss counters (per process for local memory, shared for Redis)."""
+        cache = cls._cache()
+        hits = cache.get(cls.STATS_KEY.format(name='hit')) or 0
+        misses = cache.get(cls.STATS_KEY.format(name='miss')) or 0
+        total = hits + misses
+        return {
+            'backend': cache.__class__.__name__,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+            'global_version': cls._get_version(cls.GLOBAL_VERSION_KEY),
+            'timeout': cls._timeout(),
+        }
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cls._cache().delete_many([cls.STATS_KEY.format(name='hit'), cls.STATS_KEY.format(name='miss')])
@@ -1,38 +1,232 @@
-from django.conf import settings
+import hashlib
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
+
+class GeminiBusyError(Exception):
+    """
+    No Gemini capacity became free within GEMINI_ACQUIRE_TIMEOUT, or Gemini
+    itself answered with a rate-limit error. Worth retrying later.
+    """
+
+
+class _GeminiLimiter:
+    """
+    Gate for outbound Gemini calls, shared by OCR, follow-ups and insight
+    analysis:
+
+    - Rate: GEMINI_REQUESTS_PER_MINUTE across every web and worker process,
+      paced through apps.core.ratelimit (bursts of up to
+      GEMINI_MAX_CONCURRENCY after an idle period).
+    - Concurrency: at most GEMINI_MAX_CONCURRENCY calls in flight per process.
+    """
+
+    KEY = 'gemini'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._semaphore = None
+
+    def _setup(self):
+        if self._semaphore is None:
+            self._semaphore = threading.BoundedSemaphore(getattr(settings, 'GEMINI_MAX_CONCURRENCY', 4))
+
+    def _pacer(self):
+        from apps.core.ratelimit import PacedRateLimiter
+
+        return PacedRateLimiter(
+            self.KEY,
+            interval=60.0 / max(getattr(settings, 'GEMINI_REQUESTS_PER_MINUTE', 60), 1),
+            burst=max(getattr(settings, 'GEMINI_MAX_CONCURRENCY', 4), 1),
+        )
+
+    @contextmanager
+    def acquire(self):
+        """Block until a slot and a rate slot are free. Yields the seconds spent waiting."""
+        with self._lock:
+            self._setup()
+        started = time.monotonic()
+        deadline = started + getattr(settings, 'GEMINI_ACQUIRE_TIMEOUT', 60)
+        if not self._semaphore.acquire(timeout=getattr(settings, 'GEMINI_ACQUIRE_TIMEOUT', 60)):
+            raise GeminiBusyError('Gemini concurrency limit: no slot available')
+        try:
+            # Only book a slot we will actually wait for
+            delay = self._pacer().reserve(max_delay=deadline - time.monotonic())
+            if delay is None:
+                raise GeminiBusyError('Gemini rate limit: no slot within GEMINI_ACQUIRE_TIMEOUT')
+            if delay:
+                time.sleep(delay)
+            yield time.monotonic() - started
+        finally:
+            self._semaphore.release()
+
+
+class _GeminiMetrics:
+    """Per-operation call counts, latency and token usage (this process only)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def record(self, operation, latency, wait, error=False, prompt_tokens=0, output_tokens=0):
+        with self._lock:
+            entry = self._data.setdefault(operation, {
+                'calls': 0, 'errors': 0, 'total_latency': 0.0, 'max_latency': 0.0,
+                'total_wait': 0.0, 'prompt_tokens': 0, 'output_tokens': 0,
+            })
+            entry['calls'] += 1
+            entry['errors'] += int(error)
+            entry['total_latency'] += latency
+            entry['max_latency'] = max(entry['max_latency'], latency)
+            entry['total_wait'] += wait
+            entry['prompt_tokens'] += prompt_tokens
+            entry['output_tokens'] += output_tokens
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                operation: {
+                    'calls': entry['calls'],
+                    'errors': entry['errors'],
+                    'avg_latency_ms': round(entry['total_latency'] / entry['calls'] * 1000),
+                    'max_latency_ms': round(entry['max_latency'] * 1000),
+                    'avg_wait_ms': round(entry['total_wait'] / entry['calls'] * 1000),
+                    'prompt_tokens': entry['prompt_tokens'],
+                    'output_tokens': entry['output_tokens'],
+                }
+                for operation, entry in self._data.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+
 class GeminiService:
-    """Service for interacting with Gemini AI."""
+    """
+    Service for interacting with Gemini AI.
     
-    @staticmethod
-    def _get_model():
-        """Configure and return the Gemini model."""
-        # Force reload .env from base directory to pick up changes without server restart
+    The configured model is cached per process and rebuilt only when the API
+    key or model settings change (.env is re-read only when its mtime
+    changes). Every call goes through a shared limiter and is recorded in
+    per-operation metrics (see stats()).
+    """
+    
+    MODEL_NAME = 'gemini-2.5-flash-lite-preview-09-2025'
+    GENERATION_CONFIG = {"temperature": 0.1}
+    
+    # Status -> what the follow-up should ask for
+    FOLLOW_UP_STATUS_CONTEXT = {
+        'APPLICATION_APPROVED': 'เพิ่งผ่านการอนุมัติเข้าร่วมแคมเปญ รบกวนกดรับงานและเริ่มดำเนินการ',
+        'WORKING_ON_CONTENT': 'อยู่ระหว่างการผลิตคอนเทนต์ รบกวนสอบถามความคืบหน้า',
+        'SUBMITTED_SCRIPT': 'ส่งสคริปต์แล้ว รอตรวจ (อันนี้ไม่ควรทวง Admin ต้องตรวจ)',
+        'SCRIPT_APPROVED': 'สคริปต์ผ่านแล้ว รบกวนเริ่มถ่ายทำและส่งดราฟท์',
+        'REVISE_SCRIPT': 'สคริปต์ต้องแก้ไข รบกวนแก้ตามคอมเมนต์และส่งใหม่',
+        'SUBMITTED_DRAFT': 'ส่งดราฟท์แล้ว รอตรวจ',
+        'DRAFT_APPROVED': 'ดราฟท์ผ่านแล้ว รบกวนโพสต์งานจริง',
+        'REVISE_DRAFT': 'ดราฟท์ต้องแก้ไข รบกวนแก้ตามคอมเมนต์และส่งใหม่',
+        'FINAL_APPROVED': 'โพสต์งานแล้ว รอส่ง Insight',
+        'REVISE_FINAL': 'งานโพสต์มีการแก้ไข รบกวนตรวจสอบ',
+        'REVISE_INSIGHT': 'ข้อมูล Insight ไม่ครบถ้วน รบกวนส่งใหม่',
+        'WAITING': 'รอการอนุมัติ (หากนานเกินไป)'
+    }
+    
+    FOLLOW_UP_BATCH_SIZE = 25
+    FOLLOW_UP_CONCURRENCY = 4
+    FOLLOW_UP_CACHE_TIMEOUT = 6 * 60 * 60
+    
+    _client_lock = threading.Lock()
+    _client = {'fingerprint': None, 'model': None}
+    _env_mtime = None
+    _limiter = _GeminiLimiter()
+    _metrics = _GeminiMetrics()
+    
+    @classmethod
+    def _reload_env(cls):
+        """Pick up .env edits without a restart, but only read the file when it changed."""
         dotenv_path = os.path.join(settings.BASE_DIR, '.env')
-        load_dotenv(dotenv_path=dotenv_path, override=True)
-        
+        try:
+            mtime = os.path.getmtime(dotenv_path)
+        except OSError:
+            return
+        if mtime != cls._env_mtime:
+            load_dotenv(dotenv_path=dotenv_path, override=True)
+            cls._env_mtime = mtime
+    
+    @classmethod
+    def _get_model(cls):
+        """Return (model, error). Cached until the API key or model config changes."""
         try:
             import google.generativeai as genai
         except ImportError:
             return None, "google-generativeai not installed"
 
-        # Dynamically get API key to pick up .env changes
-        api_key = os.environ.get('GEMINI_API_KEY')
-        print(f"Debug: GEMINI_API_KEY found, length={len(api_key) if api_key else 0}")
-        
-        if not api_key or api_key == "your_gemini_api_key_here":
-            return None, "GEMINI_API_KEY not configured"
+        with cls._client_lock:
+            cls._reload_env()
+            api_key = os.environ.get('GEMINI_API_KEY')
+            if not api_key or api_key == "your_gemini_api_key_here":
+                return None, "GEMINI_API_KEY not configured"
+
+            fingerprint = (api_key, cls.MODEL_NAME, tuple(sorted(cls.GENERATION_CONFIG.items())))
+            if cls._client['fingerprint'] == fingerprint:
+                return cls._client['model'], None
 
+            try:
+                genai.configure(api_key=api_key)
+                # Use Gemini 2.5 Flash-Lite for high performance and low latency
+                model = genai.GenerativeModel(cls.MODEL_NAME, generation_config=dict(cls.GENERATION_CONFIG))
+            except Exception as e:
+                return None, f"Config error: {str(e)}"
+            logger.info("[Gemini] Client configured")
+            cls._client = {'fingerprint': fingerprint, 'model': model}
+            return model, None
+
+    @classmethod
+    def _generate(cls, model, operation, contents):
+        """model.generate_content() through the shared limiter, with metrics."""
+        with cls._limiter.acquire() as waited:
+            started = time.monotonic()
+            try:
+                response = model.generate_content(contents)
+            except Exception as e:
+                cls._metrics.record(operation, time.monotonic() - started, waited, error=True)
+                if cls._is_rate_limited(e):
+                    raise GeminiBusyError(f'Gemini rate limited the request: {e}') from e
+                raise
+        usage = getattr(response, 'usage_metadata', None)
+        cls._metrics.record(
+            operation, time.monotonic() - started, waited,
+            prompt_tokens=getattr(usage, 'prompt_token_count', 0) or 0,
+            output_tokens=getattr(usage, 'candidates_token_count', 0) or 0,
+        )
+        return response
+
+    @staticmethod
+    def _is_rate_limited(error):
+        """429 / RESOURCE_EXHAUSTED from the API."""
         try:
-            genai.configure(api_key=api_key)
-            # Use Gemini 2.5 Flash-Lite for high performance and low latency
-            return genai.GenerativeModel(
-                'gemini-2.5-flash-lite-preview-09-2025',
-                generation_config={"temperature": 0.1}
-            ), None
-        except Exception as e:
-            return None, f"Config error: {str(e)}"
+            from google.api_core import exceptions as api_exceptions
+        except ImportError:
+            return False
+        return isinstance(error, (api_exceptions.ResourceExhausted, api_exceptions.TooManyRequests))
+
+    @classmethod
+    def stats(cls):
+        return cls._metrics.snapshot()
+
+    @classmethod
+    def reset_stats(cls):
+        cls._metrics.reset()
 
     @classmethod
     def generate_follow_up_message(cls, influencer_name, campaign_title, status, deadline=None):
@@ -44,23 +238,7 @@ class GeminiService:
             # Fallback with error info for debugging
             return f"สวัสดีค่ะคุณ {influencer_name} รบกวนติดตามงานแคมเปญ {campaign_title} ด้วยนะคะ (System: {error})"
 
-        # Map status to context
-        status_context = {
-            'APPLICATION_APPROVED': 'เพิ่งผ่านการอนุมัติเข้าร่วมแคมเปญ รบกวนกดรับงานและเริ่มดำเนินการ',
-            'WORKING_ON_CONTENT': 'อยู่ระหว่างการผลิตคอนเทนต์ รบกวนสอบถามความคืบหน้า',
-            'SUBMITTED_SCRIPT': 'ส่งสคริปต์แล้ว รอตรวจ (อันนี้ไม่ควรทวง Admin ต้องตรวจ)',
-            'SCRIPT_APPROVED': 'สคริปต์ผ่านแล้ว รบกวนเริ่มถ่ายทำและส่งดราฟท์',
-            'REVISE_SCRIPT': 'สคริปต์ต้องแก้ไข รบกวนแก้ตามคอมเมนต์และส่งใหม่',
-            'SUBMITTED_DRAFT': 'ส่งดราฟท์แล้ว รอตรวจ',
-            'DRAFT_APPROVED': 'ดราฟท์ผ่านแล้ว รบกวนโพสต์งานจริง',
-            'REVISE_DRAFT': 'ดราฟท์ต้องแก้ไข รบกวนแก้ตามคอมเมนต์และส่งใหม่',
-            'FINAL_APPROVED': 'โพสต์งานแล้ว รอส่ง Insight',
-            'REVISE_FINAL': 'งานโพสต์มีการแก้ไข รบกวนตรวจสอบ',
-            'REVISE_INSIGHT': 'ข้อมูล Insight ไม่ครบถ้วน รบกวนส่งใหม่',
-            'WAITING': 'รอการอนุมัติ (หากนานเกินไป)'
-        }
-        
-        context = status_context.get(status, 'รบกวนติดตามงาน')
+        context = cls.FOLLOW_UP_STATUS_CONTEXT.get(status, 'รบกวนติดตามงาน')
         deadline_text = f"กำหนดส่งคือ {deadline}" if deadline else "ให้เร็วที่สุด"
         
         # Add a "seed" of randomness to the prompt to force different wording
@@ -85,19 +263,137 @@ class GeminiService:
         """
         
         try:
-            response = model.generate_content(prompt)
+            response = cls._generate(model, 'follow_up', prompt)
             return response.text.strip()
         except Exception as e:
             print(f"Gemini API Error: {e}")
             # Identify failure in return string
             return f"สวัสดีค่ะคุณ {influencer_name} รบกวนติดตามงานแคมเปญ {campaign_title} ด้วยนะคะ ขอบคุณค่ะ (Fallback: {str(e)[:50]}...)"
 
+    @staticmethod
+    def _follow_up_fallback(influencer_name, campaign_title):
+        return f"สวัสดีค่ะคุณ {influencer_name} รบกวนติดตามงานแคมเปญ {campaign_title} ด้วยนะคะ ขอบคุณค่ะ"
+
+    @classmethod
+    def _follow_up_cache_key(cls, campaign_key, item):
+        digest = hashlib.md5(
+            repr((str(campaign_key), item.get('status'), str(item.get('deadline') or ''), item.get('name'))).encode('utf-8')
+        ).hexdigest()
+        return f"followup:{digest}"
+
+    @classmethod
+    def generate_follow_up_messages(cls, campaign_title, recipients, campaign_key=None, use_cache=True):
+        """
+        Follow-up messages for many influencers at once.
+        
+        recipients: list of {'name', 'status', 'deadline'}; returns one message
+        per recipient, in order. Recipients are sent FOLLOW_UP_BATCH_SIZE at a
+        time in one structured prompt, chunks run concurrently (still within
+        the shared limiter), and results are cached per (campaign, status,
+        deadline, name) so opening the same follow-up again costs nothing.
+        Pass use_cache=False to write fresh messages (they replace the cached ones).
+        """
+        campaign_key = campaign_key or campaign_title
+        keys = [cls._follow_up_cache_key(campaign_key, item) for item in recipients]
+        cached = cache.get_many(keys) if use_cache else {}
+
+        # One generation per distinct key
+        todo = {}
+        for key, item in zip(keys, recipients):
+            if key not in cached and key not in todo:
+                todo[key] = item
+
+        generated = {}
+        if todo:
+            model, error = cls._get_model()
+            if error:
+                logger.warning(f"[Gemini] Follow-up generation unavailable: {error}")
+            else:
+                pending = list(todo.items())
+                chunks = [pending[i:i + cls.FOLLOW_UP_BATCH_SIZE] for i in range(0, len(pending), cls.FOLLOW_UP_BATCH_SIZE)]
+                if len(chunks) == 1:
+                    results = [cls._generate_follow_up_batch(model, campaign_title, chunks[0])]
+                else:
+                    with ThreadPoolExecutor(max_workers=min(cls.FOLLOW_UP_CONCURRENCY, len(chunks))) as executor:
+                        results = list(executor.map(lambda chunk: cls._generate_follow_up_batch(model, campaign_title, chunk), chunks))
+                for result in results:
+                    generated.update(result)
+                if generated:
+                    cache.set_many(generated, timeout=cls.FOLLOW_UP_CACHE_TIMEOUT)
+
+        messages = []
+        for key, item in zip(keys, recipients):
+            message = cached.get(key) or generated.get(key)
+            messages.append(message or cls._follow_up_fallback(item.get('name'), campaign_title))
+        return messages
+
+    @classmethod
+    def _generate_follow_up_batch(cls, model, campaign_title, chunk):
+        """One prompt for a chunk of (cache key, recipient). Returns {cache key: message} for parsed entries."""
+        import json
+
+        entries = [
+            {
+                'index': index,
+                'name': item.get('name'),
+                'status': item.get('status'),
+                'context': cls.FOLLOW_UP_STATUS_CONTEXT.get(item.get('status'), 'รบกวนติดตามงาน'),
+                'deadline': f"กำหนดส่งคือ {item['deadline']}" if item.get('deadline') else "ให้เร็วที่สุด",
+            }
+            for index, (_, item) in enumerate(chunk)
+        ]
+        prompt = f"""
+        Act as a professional and friendly admin of an Influencer Marketing Platform.
+        Write a short, polite, and encouraging follow-up message in Thai to EACH influencer below.
+        
+        Campaign: {campaign_title}
+        Influencers (JSON):
+        {json.dumps(entries, ensure_ascii=False)}
+        
+        Constraints:
+        - Keep each message short (under 50 words), addressed to that influencer by name.
+        - Ask for what their status context says, and mention the deadline.
+        - Use emojis to be friendly.
+        - Do not be aggressive.
+        - Vary the wording between influencers.
+        
+        Return ONLY a JSON array, no markdown, one object per influencer:
+        [{{"index": <index from input>, "message": "<message>"}}]
+        """
+
+        try:
+            response = cls._generate(model, 'follow_up_batch', prompt)
+            text = response.text.strip()
+            if '```json' in text:
+                text = text.split('```json')[1].split('```')[0]
+            elif '```' in text:
+                text = text.split('```')[1].split('```')[0]
+            parsed = json.loads(text.strip())
+        except Exception as e:
+            logger.warning(f"[Gemini] Follow-up batch of {len(chunk)} failed: {e}")
+            return {}
+
+        messages = {}
+        for entry in parsed if isinstance(parsed, list) else []:
+            try:
+                index = int(entry.get('index'))
+                message = str(entry.get('message') or '').strip()
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if message and 0 <= index < len(chunk):
+                messages[chunk[index][0]] = message
+        if len(messages) < len(chunk):
+            logger.warning(f"[Gemini] Follow-up batch returned {len(messages)}/{len(chunk)} messages")
+        return messages
+
     @classmethod
     def extract_document_data(cls, image_source, doc_type):
         """
         Extract data from ID card or Bank Book using Gemini Vision.
         image_source: can be a local path (string) or a file-like object (BytesIO, FileField, etc.)
         doc_type: 'id_card' or 'bank_book'
+        Returns None when the document can't be read; raises GeminiBusyError
+        when Gemini is out of capacity, so queued OCR is retried later.
         """
         import json
         model, error = cls._get_model()
@@ -139,7 +435,7 @@ class GeminiService:
                 Only return the JSON object, no markdown.
                 """
             
-            response = model.generate_content([prompt, img])
+            response = cls._generate(model, 'ocr', [prompt, img])
             text = response.text.strip()
             
             # Clean response header/footer if model adds markdown
@@ -150,22 +446,50 @@ class GeminiService:
             
             return json.loads(text.strip())
             
+        except GeminiBusyError:
+            raise
         except Exception as e:
             print(f"OCR Exception: {e}")
             return None
     @classmethod
     def analyze_insight_images(cls, image_urls):
+        """
+        Analyze insight screenshots given by URL.
+        Downloads them, then delegates to analyze_insight_image_data().
+        image_urls: List[str]
+        """
+        from apps.core import http
+
+        if not image_urls or not isinstance(image_urls, list):
+            return None
+
+        images = []
+        print(f"[AI Analysis] Downloading {len(image_urls)} images...")
+        for url in image_urls:
+            try:
+                response = http.get(url, timeout=10)
+                if response.status_code == 200:
+                    images.append(response.content)
+                else:
+                    print(f"Failed to download: {url}")
+            except Exception as e:
+                print(f"Error downloading {url}: {e}")
+
+        return cls.analyze_insight_image_data(images)
+
+    @classmethod
+    def analyze_insight_image_data(cls, images):
         """
         Analyze multiple social media insight screenshots using Gemini Vision.
         Synthesizes data from multiple views (Overview, Viewers, etc.)
-        image_urls: List[str]
+        images: List of raw image bytes (or file-like objects)
         """
         import json
-        import requests
         from io import BytesIO
         import PIL.Image
 
-        if not image_urls or not isinstance(image_urls, list):
+        if not images:
+            print("[AI Analysis] No valid images to analyze")
             return None
 
         model, error = cls._get_model()
@@ -174,19 +498,13 @@ class GeminiService:
             return None
 
         try:
-            images = []
-            print(f"[AI Analysis] Downloading {len(image_urls)} images...")
-            
-            for url in image_urls:
+            opened = []
+            for image in images:
                 try:
-                    response = requests.get(url, timeout=10)
-                    if response.status_code == 200:
-                        img = PIL.Image.open(BytesIO(response.content))
-                        images.append(img)
-                    else:
-                        print(f"Failed to download: {url}")
+                    opened.append(PIL.Image.open(BytesIO(image) if isinstance(image, bytes) else image))
                 except Exception as e:
-                    print(f"Error downloading {url}: {e}")
+                    print(f"[AI Analysis] Skipping unreadable image: {e}")
+            images = opened
 
             if not images:
                 print("[AI Analysis] No valid images to analyze")
@@ -248,7 +566,7 @@ class GeminiService:
             
             print("[AI Analysis] Sending to Gemini...")
             inputs = [prompt] + images
-            response = model.generate_content(inputs)
+            response = cls._generate(model, 'insight_analysis', inputs)
             text = response.text.strip()
             
             # Clean markdown
@@ -4,7 +4,13 @@ Google Drive Link Validator Service
 
 import re
 import requests
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core import http
 
 
 class GoogleDriveValidator:
@@ -12,7 +18,13 @@ class GoogleDriveValidator:
     Service to validate if Google Drive links are publicly accessible.
     
     Checks various Google Drive URL formats and verifies accessibility
-    by making a HEAD request to the file.
+    by fetching the start of the file's page.
+
+    Results are cached per file id (the LIFF form re-validates as the link
+    is edited): accessible links for DRIVE_LINK_CACHE_TTL seconds, links that
+    need access for only DRIVE_LINK_CACHE_DENIED_TTL, so an influencer who
+    fixes the sharing setting sees it on the next check. Timeouts and
+    network errors are not cached.
     """
     
     # Regex patterns for different Google Drive URL formats
@@ -30,6 +42,11 @@ class GoogleDriveValidator:
     
     # Request timeout in seconds
     TIMEOUT = 10
+
+    CACHE_KEY = 'drivelink:{file_id}'
+    DEFAULT_CACHE_TTL = 300
+    DEFAULT_DENIED_CACHE_TTL = 15
+    DEFAULT_CONCURRENCY = 8
     
     @classmethod
     def extract_file_id(cls, url: str) -> Optional[str]:
@@ -62,18 +79,20 @@ class GoogleDriveValidator:
         return bool(re.search(r'(drive|docs)\.google\.com', url))
     
     @classmethod
-    def validate(cls, url: str) -> Dict:
+    def validate(cls, url: str, use_cache: bool = True) -> Dict:
         """
         Validate if a Google Drive link is publicly accessible.
         
         Args:
             url: The Google Drive URL to validate
+            use_cache: Accept a recent result for the same file id
             
         Returns:
             Dictionary containing:
             - valid: Whether the URL format is valid
             - accessible: Whether the file is publicly accessible
             - message: Human-readable status message
+            - cached: Whether the result came from the cache (Drive URLs only)
         """
         # Check if it's a Google Drive URL
         if not cls.is_google_drive_url(url):
@@ -94,10 +113,56 @@ class GoogleDriveValidator:
                 'message': 'Invalid Google Drive URL format'
             }
         
+        key = cls.CACHE_KEY.format(file_id=file_id)
+        if use_cache:
+            try:
+                cached = cache.get(key)
+            except Exception:
+                cached = None
+            if cached is not None:
+                return {**cached, 'cached': True}
+
+        result = cls._check(url)
+        if result['accessible'] is True:
+            ttl = getattr(settings, 'DRIVE_LINK_CACHE_TTL', cls.DEFAULT_CACHE_TTL)
+        elif result['accessible'] is False:
+            ttl = getattr(settings, 'DRIVE_LINK_CACHE_DENIED_TTL', cls.DEFAULT_DENIED_CACHE_TTL)
+        else:
+            ttl = 0  # timeout / network error: try again next time
+        if ttl > 0:
+            try:
+                cache.set(key, result, timeout=ttl)
+            except Exception:
+                pass
+        return {**result, 'cached': False}
+
+    @classmethod
+    def validate_many(cls, urls: Iterable[str], use_cache: bool = True, max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        Validate several links concurrently. Returns results in input order;
+        links to the same file are checked once.
+        """
+        urls = list(urls)
+        unique = {}
+        for url in urls:
+            unique.setdefault(cls.extract_file_id(url) or url, url)
+        max_workers = max_workers or getattr(settings, 'DRIVE_LINK_VALIDATION_CONCURRENCY', cls.DEFAULT_CONCURRENCY)
+
+        if len(unique) <= 1 or max_workers <= 1:
+            results = {key: cls.validate(url, use_cache=use_cache) for key, url in unique.items()}
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(unique)), thread_name_prefix='drive-validate') as pool:
+                futures = {key: pool.submit(cls.validate, url, use_cache) for key, url in unique.items()}
+                results = {key: future.result() for key, future in futures.items()}
+        return [results[cls.extract_file_id(url) or url] for url in urls]
+
+    @classmethod
+    def _check(cls, url: str) -> Dict:
+        """Fetch the start of the Drive page and decide whether it is shared publicly."""
         try:
             # Check the original URL directly - this is more reliable
             # Google returns 401/403 for restricted files
-            response = requests.get(
+            response = http.get(
                 url,
                 allow_redirects=True,
                 timeout=cls.TIMEOUT,
@@ -108,7 +173,10 @@ class GoogleDriveValidator:
             )
             
             # Read initial content to check for access denial
-            content_chunk = response.raw.read(16384).decode('utf-8', errors='ignore')
+            try:
+                content_chunk = response.raw.read(16384, decode_content=True).decode('utf-8', errors='ignore')
+            finally:
+                response.close()  # Hand the connection back without downloading the rest
             
             # Check for access denied indicators in the HTML
             access_denied_indicators = [
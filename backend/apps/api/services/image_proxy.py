@@ -0,0 +1,416 @@
+"""
+Image Proxy Cache Service
+"""
+
+import hashlib
+import ipaddress
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core import http
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: coalesce within the process only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+# outcome: 'hit', 'miss', 'revalidated' or 'stale'
+CachedImage = namedtuple('CachedImage', ['path', 'content_type', 'size', 'etag', 'outcome'])
+
+
+class ImageProxyError(Exception):
+    """The image could not be served; `status` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=502):
+        super().__init__(message)
+        self.status = status
+
+
+class ImageProxyCache:
+    """
+    Bounded on-disk cache for ImageProxyView.
+
+    Usage:
+        image = ImageProxyCache.get(url)   # raises ImageProxyError
+        open(image.path, 'rb')
+
+    - One body file plus one JSON metadata file per URL (sha256 of the URL).
+    - Entries are served without asking upstream for IMAGE_PROXY_FRESH_SECONDS,
+      then revalidated with If-None-Match / If-Modified-Since; a 304 only
+      refreshes the metadata. If upstream is down, the stale copy is served.
+    - Concurrent misses for one URL are coalesced: a per-URL file lock lets
+      one request (in any worker process) fetch, the others find its result.
+    - LRU: hits bump the body's mtime; when the directory grows past
+      IMAGE_PROXY_CACHE_MAX_BYTES the least recently used entries go.
+    - Only public http(s) hosts, image/* responses (no SVG) and bodies up to
+      IMAGE_PROXY_MAX_IMAGE_BYTES are accepted.
+    """
+
+    STATS_KEY = 'imageproxy:stats:{name}'
+    STATS = ('hit', 'miss', 'revalidated', 'stale', 'coalesced', 'bytes_from_cache', 'bytes_fetched')
+
+    DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+    DEFAULT_MAX_IMAGE_BYTES = 10 * 1024 * 1024
+    DEFAULT_FRESH_SECONDS = 24 * 60 * 60
+    FETCH_TIMEOUT = 10
+    MAX_REDIRECTS = 3
+    CHUNK_SIZE = 64 * 1024
+    EVICT_TO = 0.9  # evict down to this fraction of the limit
+
+    BLOCKED_CONTENT_TYPES = {'image/svg+xml'}  # can carry scripts
+
+    _written_since_scan = 0
+    _scan_lock = threading.Lock()
+    _key_locks = {}
+    _key_locks_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Settings and paths
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def directory() -> str:
+        path = str(getattr(settings, 'IMAGE_PROXY_CACHE_DIR', os.path.join(settings.BASE_DIR, 'cache', 'image_proxy')))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @classmethod
+    def _max_bytes(cls) -> int:
+        return getattr(settings, 'IMAGE_PROXY_CACHE_MAX_BYTES', cls.DEFAULT_MAX_BYTES)
+
+    @classmethod
+    def _max_image_bytes(cls) -> int:
+        return getattr(settings, 'IMAGE_PROXY_MAX_IMAGE_BYTES', cls.DEFAULT_MAX_IMAGE_BYTES)
+
+    @classmethod
+    def _fresh_seconds(cls) -> int:
+        return getattr(settings, 'IMAGE_PROXY_FRESH_SECONDS', cls.DEFAULT_FRESH_SECONDS)
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _paths(cls, key: str):
+        base = os.path.join(cls.directory(), key)
+        return base + '.bin', base + '.json'
+
+    @classmethod
+    def _lock_path(cls, key: str) -> str:
+        return os.path.join(cls.directory(), f"{key}.lock")
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def get(cls, url: str) -> CachedImage:
+        cls.validate_url(url)
+        key = cls.key(url)
+
+        meta = cls._read_meta(key)
+        if meta and cls._is_fresh(meta):
+            return cls._serve(key, meta, 'hit')
+
+        with cls._lock(key):
+            # Another request may have fetched it while we waited
+            current = cls._read_meta(key)
+            if current and cls._is_fresh(current):
+                cls._count('coalesced')
+                return cls._serve(key, current, 'hit')
+            try:
+                return cls._fetch(url, key, current)
+            except (ImageProxyError, requests.RequestException) as e:
+                if current is None:
+                    raise
+                logger.warning(f"[ImageProxy] Serving stale copy of {url}: {e}")
+                return cls._serve(key, current, 'stale')
+
+    @classmethod
+    def validate_url(cls, url: str) -> None:
+        """
+        Only http(s) URLs on public addresses: the view is open to anyone, so
+        it must not reach loopback, private or cloud metadata addresses.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ImageProxyError('Only http(s) image URLs can be proxied', status=400)
+        if getattr(settings, 'IMAGE_PROXY_ALLOW_PRIVATE_HOSTS', False):
+            return
+        try:
+            addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, parts.port or None)}
+        except socket.gaierror as e:
+            raise ImageProxyError(f'Unknown host: {parts.hostname}', status=400) from e
+        for address in addresses:
+            if not ipaddress.ip_address(address.split('%')[0]).is_global:
+                raise ImageProxyError(f'Host not allowed: {parts.hostname}', status=400)
+
+    @classmethod
+    def _is_fresh(cls, meta: Dict) -> bool:
+        return time.time() - meta.get('checked_at', 0) < cls._fresh_seconds()
+
+    @classmethod
+    def _read_meta(cls, key: str) -> Optional[Dict]:
+        body_path, meta_path = cls._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path):
+            return None
+        return meta
+
+    @classmethod
+    def _write_meta(cls, key: str, meta: Dict) -> None:
+        _, meta_path = cls._paths(key)
+        temp_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temp_path, meta_path)
+
+    @classmethod
+    def _serve(cls, key: str, meta: Dict, outcome: str) -> CachedImage:
+        body_path, _ = cls._paths(key)
+        try:
+            os.utime(body_path)  # LRU position
+        except OSError:
+            pass
+        cls._count(outcome)
+        cls._count('bytes_from_cache', meta['size'])
+        return CachedImage(body_path, meta['content_type'], meta['size'], cls.response_etag(key, meta), outcome)
+
+    @staticmethod
+    def response_etag(key: str, meta: Dict) -> str:
+        # Changes only when a new body is stored (not on 304 revalidations)
+        return f'"{key[:16]}-{int(meta["fetched_at"])}"'
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _fetch(cls, url: str, key: str, meta: Optional[Dict]) -> CachedImage:
+        headers = {'User-Agent': 'Mozilla/5.0'}  # mask the Referer to bypass hotlink protection
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        response = cls._get(url, headers)
+        try:
+            if response.status_code == 304 and meta:
+                meta['checked_at'] = time.time()
+                cls._write_meta(key, meta)
+                return cls._serve(key, meta, 'revalidated')
+            if response.status_code != 200:
+                raise ImageProxyError(
+                    f'Failed to fetch image: {response.status_code}',
+                    status=response.status_code if 400 <= response.status_code < 600 else 502,
+                )
+
+            content_type = response.headers.get('Content-Type', 'image/jpeg').split(';')[0].strip().lower()
+            if not content_type.startswith('image/') or content_type in cls.BLOCKED_CONTENT_TYPES:
+                raise ImageProxyError(f'Not an image: {content_type}', status=415)
+
+            max_size = cls._max_image_bytes()
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > max_size:
+                raise ImageProxyError(f'Image too large: {declared} bytes', status=413)
+
+            body_path, _ = cls._paths(key)
+            temp_path = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            size = 0
+            try:
+                with open(temp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=cls.CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > max_size:
+                            raise ImageProxyError(f'Image too large: over {max_size} bytes', status=413)
+                        f.write(chunk)
+                os.replace(temp_path, body_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        finally:
+            response.close()
+
+        now = time.time()
+        meta = {
+            'url': url,
+            'content_type': content_type,
+            'size': size,
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+            'fetched_at': now,
+            'checked_at': now,
+        }
+        cls._write_meta(key, meta)
+        cls._count('miss')
+        cls._count('bytes_fetched', size)
+        cls._note_written(size)
+        return CachedImage(body_path, content_type, size, cls.response_etag(key, meta), 'miss')
+
+    @classmethod
+    def _get(cls, url: str, headers: Dict):
+        """GET following redirects by hand, so every hop passes validate_url()."""
+        for _ in range(cls.MAX_REDIRECTS + 1):
+            response = http.get(url, stream=True, timeout=cls.FETCH_TIMEOUT, headers=headers, allow_redirects=False)
+            if not response.is_redirect:
+                return response
+            location = response.headers.get('Location', '')
+            response.close()
+            url = requests.compat.urljoin(url, location)
+            cls.validate_url(url)
+        raise ImageProxyError('Too many redirects', status=502)
+
+    # ------------------------------------------------------------------
+    # Coalescing
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _lock(cls, key: str):
+        return _KeyLock(cls, key)
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _note_written(cls, size: int) -> None:
+        # Scanning the directory costs a stat per entry: only do it after
+        # roughly a tenth of the budget was written by this process
+        with cls._scan_lock:
+            cls._written_since_scan += size
+            if cls._written_since_scan < cls._max_bytes() / 10:
+                return
+            cls._written_since_scan = 0
+        cls.evict()
+
+    @classmethod
+    def _entries(cls):
+        """[(mtime, size, key)] of every cached body."""
+        directory = cls.directory()
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.bin'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.name[:-len('.bin')]))
+        return entries
+
+    @classmethod
+    def evict(cls) -> int:
+        """Drop least recently used entries until under the size limit. Returns entries removed."""
+        entries = cls._entries()
+        total = sum(size for _, size, _ in entries)
+        limit = cls._max_bytes()
+        if total <= limit:
+            return 0
+        removed = 0
+        for _, size, key in sorted(entries):
+            if total <= limit * cls.EVICT_TO:
+                break
+            for path in (*cls._paths(key), cls._lock_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        logger.info(f"[ImageProxy] Evicted {removed} cached images")
+        return removed
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _count(cls, name: str, amount: int = 1) -> None:
+        key = cls.STATS_KEY.format(name=name)
+        try:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key, amount)
+        except Exception:
+            pass
+
+    @classmethod
+    def stats(cls) -> Dict:
+        counts = {name: cache.get(cls.STATS_KEY.format(name=name)) or 0 for name in cls.STATS}
+        served_from_cache = counts['hit'] + counts['revalidated'] + counts['stale']
+        total = served_from_cache + counts['miss']
+        entries = cls._entries()
+        return {
+            'hits': counts['hit'],
+            'revalidated': counts['revalidated'],
+            'stale': counts['stale'],
+            'misses': counts['miss'],
+            'coalesced': counts['coalesced'],
+            'hit_rate': round(served_from_cache / total, 4) if total else None,
+            'bytes_saved': counts['bytes_from_cache'],
+            'bytes_fetched': counts['bytes_fetched'],
+            'entries': len(entries),
+            'disk_bytes': sum(size for _, size, _ in entries),
+            'max_bytes': cls._max_bytes(),
+        }
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cache.delete_many([cls.STATS_KEY.format(name=name) for name in cls.STATS])
+
+
+class _KeyLock:
+    """
+    Exclusive lock on one cache key: a thread lock within this process plus
+    an flock on '<key>.lock' across worker processes.
+    """
+
+    def __init__(self, owner, key):
+        self.owner = owner
+        self.key = key
+        self.file = None
+
+    def __enter__(self):
+        owner = self.owner
+        with owner._key_locks_lock:
+            lock, users = owner._key_locks.get(self.key, (None, 0))
+            lock = lock or threading.Lock()
+            owner._key_locks[self.key] = (lock, users + 1)
+        lock.acquire()
+        self.lock = lock
+        if fcntl is not None:
+            self.file = open(owner._lock_path(self.key), 'a')
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        owner = self.owner
+        if self.file is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+            self.file.close()
+        self.lock.release()
+        with owner._key_locks_lock:
+            lock, users = owner._key_locks[self.key]
+            if users <= 1:
+                del owner._key_locks[self.key]
+            else:
+                owner._key_locks[self.key] = (lock, users - 1)
+        return False
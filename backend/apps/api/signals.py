@@ -0,0 +1,39 @@
+"""
+API Signals - Keep the campaign feed cache and the shared campaign report
+cache in step with the data they render.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.campaigns.models import Campaign, CampaignApplication
+
+from .services.campaign_report import SharedCampaignReport
+from .services.feed_cache import FeedCache
+
+
+# Bump after commit, so a request running concurrently cannot cache
+# pre-commit rows under the new version.
+
+@receiver([post_save, post_delete], sender=Campaign)
+def invalidate_feed_on_campaign_change(sender, instance, **kwargs):
+    transaction.on_commit(FeedCache.invalidate_all)
+
+
+@receiver([post_save, post_delete], sender=CampaignApplication)
+def invalidate_feed_on_application_change(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: FeedCache.invalidate_user(user_id))
+
+
+@receiver([post_save, post_delete], sender=Campaign)
+def invalidate_report_on_campaign_change(sender, instance, **kwargs):
+    campaign_id = instance.pk
+    transaction.on_commit(lambda: SharedCampaignReport.invalidate(campaign_id))
+
+
+@receiver([post_save, post_delete], sender=CampaignApplication)
+def invalidate_report_on_application_change(sender, instance, **kwargs):
+    campaign_id = instance.campaign_id
+    transaction.on_commit(lambda: SharedCampaignReport.invalidate(campaign_id))
@@ -0,0 +1,28 @@
+"""
+API throttle classes.
+"""
+
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+
+def client_ip(request):
+    """The client address DRF throttles key on (X-Forwarded-For, trusting NUM_PROXIES hops)."""
+    return BaseThrottle().get_ident(request)
+
+
+class SocialFetchIPThrottle(SimpleRateThrottle):
+    """Social profile lookups per client IP, signed in or not."""
+    scope = 'social_fetch_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class SocialFetchUserThrottle(SimpleRateThrottle):
+    """Social profile lookups per signed-in user (anonymous callers are covered by the IP throttle)."""
+    scope = 'social_fetch_user'
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
@@ -26,9 +26,11 @@ urlpatterns = [
     # Applications
     path('applications/', views.UserApplicationsView.as_view(), name='user-applications'),
     path('applications/<int:pk>/submit/', views.SubmitWorkView.as_view(), name='submit-work'),
+    path('applications/<int:pk>/insight-analysis/', views.InsightAnalysisStatusView.as_view(), name='insight-analysis-status'),
     
     # Utilities
     path('validate-drive-link/', views.ValidateDriveLinkView.as_view(), name='validate-drive-link'),
+    path('validate-drive-links/', views.ValidateDriveLinksView.as_view(), name='validate-drive-links'),
     
     # Health check
     path('health/', views.HealthCheckView.as_view(), name='health-check'),
@@ -45,6 +47,7 @@ urlpatterns = [
     path('social/connect/', views.SocialConnectView.as_view(), name='social-connect'),
     path('social/accounts/<int:pk>/', views.SocialDisconnectView.as_view(), name='social-disconnect'),
     path('social/accounts/<int:pk>/sync/', views.SocialSyncView.as_view(), name='social-sync'),
+    path('social/fetch-jobs/<uuid:token>/', views.SocialFetchJobView.as_view(), name='social-fetch-job'),
     
     # Utils
     path('utils/proxy-image/', views.ImageProxyView.as_view(), name='proxy-image'),
@@ -62,9 +65,12 @@ urlpatterns = [
     path('admin/campaigns/generate-follow-up/', views.GenerateFollowUpView.as_view(), name='generate-follow-up'),
     path('admin/campaigns/send-bulk-message/', views.BulkSendMessageView.as_view(), name='send-bulk-message'),
     path('admin/campaigns/<str:uuid>/', views.AdminCampaignDetailView.as_view(), name='admin-campaign-detail'),
+    path('admin/campaigns/<str:uuid>/participants/', views.AdminCampaignParticipantsView.as_view(), name='admin-campaign-participants'),
+    path('admin/campaigns/<str:uuid>/participants/<int:pk>/', views.AdminCampaignParticipantDetailView.as_view(), name='admin-campaign-participant-detail'),
     path('admin/campaigns/<str:uuid>/export/', views.AdminExportParticipantsView.as_view(), name='admin-campaign-export'),
     path('admin/campaigns/<str:uuid>/import/', views.AdminImportParticipantsView.as_view(), name='admin-campaign-import'),
     path('admin/campaigns/<str:uuid>/share-link/', views.AdminCampaignShareLinkView.as_view(), name='admin-campaign-share-link'),
+    path('admin/campaigns/<str:uuid>/drive-links/', views.AdminCampaignDriveLinksView.as_view(), name='admin-campaign-drive-links'),
     path('admin/campaigns/applications/bulk-action/', views.BulkApplicationActionView.as_view(), name='admin-campaign-app-bulk-action'),
     path('admin/campaigns/applications/<int:pk>/review/', views.AdminWorkReviewView.as_view(), name='admin-work-review'),
 
@@ -72,6 +78,9 @@ urlpatterns = [
     # Audit Logs
     path('admin/audit-logs/', AdminLogViewSet.as_view({'get': 'list'}), name='admin-audit-logs'),
     
+    # Runtime Metrics
+    path('admin/metrics/', views.AdminMetricsView.as_view(), name='admin-metrics'),
+    
     # Admin Profile Update
     path('admin/influencers/<int:pk>/update/', views.AdminUpdateInfluencerProfileView.as_view(), name='admin-influencer-update'),
 ]
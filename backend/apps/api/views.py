@@ -3,13 +3,13 @@ API Views for LINE LIFF Influencer Platform
 """
 
 import json
-import requests
+from io import BytesIO
 from django.conf import settings
+from django.core.files.storage import default_storage
 from django.shortcuts import get_object_or_404
-from django.http import StreamingHttpResponse, HttpResponseRedirect
-from django.db import transaction, connection
-from django.db.models import Case, When, Value, IntegerField, Q
-from django.utils import timezone
+from django.http import FileResponse, HttpResponseRedirect
+from django.db import transaction
+from django.db.models import Case, When, Value, IntegerField, Q, F, FilteredRelation, Count, Max, OuterRef, Subquery
 from rest_framework import status, permissions
 from rest_framework.views import APIView
 from rest_framework.generics import ListAPIView, RetrieveAPIView, CreateAPIView
@@ -18,28 +18,36 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 import logging
-import threading
+import time
 from decimal import Decimal
 from apps.api.services.gemini import GeminiService
 
 logger = logging.getLogger(__name__)
 
 from apps.audit_logs.utils import log_action
+from apps.core.tasks import enqueue as enqueue_task
+from apps.core.images import ImageIngestService, ImageIngestError, Rendition
+from apps.core.storage import upload_files, StorageUploadError
+from apps.core import http
 
 from apps.users.models import User
-from apps.influencers.models import Interest, InfluencerProfile, SocialPlatformAccount
+from apps.influencers.models import Interest, InfluencerProfile, SocialPlatformAccount, SocialFetchJob
 from apps.campaigns.models import Campaign, CampaignApplication
 
 from .serializers import (
     InterestSerializer, UserSerializer, UserWithProfileSerializer,
     RegistrationSerializer, CampaignListSerializer, CampaignDetailSerializer,
-    ApplicationSerializer, SubmitWorkSerializer, ValidateDriveLinkSerializer,
+    ApplicationSerializer, SubmitWorkSerializer, ValidateDriveLinkSerializer, ValidateDriveLinksSerializer,
     SocialPlatformAccountSerializer, SocialConnectSerializer,
     InfluencerApprovalSerializer, CampaignCreateSerializer,
-    CampaignUpdateSerializer
+    CampaignUpdateSerializer, InsightAnalysisJobSerializer, SocialFetchJobSerializer,
+    CampaignParticipantSerializer
 )
-from .services import GoogleDriveValidator
-from apps.influencers.services import SocialPlatformService
+from .services import GoogleDriveValidator, FeedCache, ImageProxyCache, ImageProxyError, SharedCampaignReport
+from .pagination import KeysetPagination, ParticipantPagination
+from .throttles import SocialFetchIPThrottle, SocialFetchUserThrottle, client_ip
+from .etags import make_etag, etag_matches, not_modified, with_cache_headers
+from apps.influencers.services import SocialPlatformService, SocialAccountService, SocialProfileCache, SocialFetchLimitError
 
 
 class HealthCheckView(APIView):
@@ -128,6 +136,10 @@ class LineLoginView(APIView):
                         # Handle username uniqueness if needed (get_or_create handles it via defaults but if collision happens...)
                         # actually User.objects.get_or_create(line_user_id=...) is safest.
 
+                    # Thumbnails of a new or changed LINE picture (served instead of LINE's URL)
+                    if user.needs_picture_mirror:
+                        enqueue_task('users.mirror_line_picture', user_id=user.id)
+
             except Exception as e:
                 print(f"[LineLogin] Result: 500 - Database Error: {str(e)}")
                 import traceback
@@ -162,12 +174,10 @@ class LineLoginView(APIView):
             )
     
     def _verify_line_token(self, id_token, access_token=None):
-        import requests
-        
         # 1. Try with access token if available
         if access_token:
             print("[LineLogin] Try /v2/profile")
-            response = requests.get(
+            response = http.get(
                 'https://api.line.me/v2/profile',
                 headers={'Authorization': f'Bearer {access_token}'},
                 timeout=10
@@ -179,7 +189,7 @@ class LineLoginView(APIView):
         
         # 2. Fallback to ID token verification
         print(f"[LineLogin] Try /oauth2/v2.1/verify - ClientID: {settings.LINE_CHANNEL_ID}")
-        response = requests.post(
+        response = http.post(
             'https://api.line.me/oauth2/v2.1/verify',
             data={
                 'id_token': id_token,
@@ -219,48 +229,25 @@ class RegistrationSubmitView(APIView):
     
     permission_classes = [IsAuthenticated]
     
+    # ID card / bank book scans: long edge 1600px, JPEG q70
+    DOCUMENT_RENDITION = Rendition('full', 1600, 1600, 70)
+    
     def compress_uploaded_image(self, uploaded_file):
-        """Compress image to reduce file size."""
+        """Compress image to reduce file size. Raises ImageIngestError for unusable images."""
         if not uploaded_file:
             return None
         
-        try:
-            from PIL import Image
-            from io import BytesIO
-            from django.core.files.uploadedfile import InMemoryUploadedFile
-            import sys
-            
-            uploaded_file.seek(0)
-            image = Image.open(uploaded_file)
-            
-            # Convert to RGB (in case of PNG with transparency)
-            if image.mode in ('RGBA', 'P'):
-                image = image.convert('RGB')
-                
-            # Resize if max dimension > 1600
-            max_size = 1600
-            if max(image.size) > max_size:
-                ratio = max_size / float(max(image.size))
-                new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-                image = image.resize(new_size, Image.Resampling.LANCZOS)
-                
-            output = BytesIO()
-            # Compress quality=70
-            image.save(output, format='JPEG', quality=70, optimize=True)
-            output.seek(0)
-            
-            return InMemoryUploadedFile(
-                output,
-                'ImageField',
-                f"{uploaded_file.name.rsplit('.', 1)[0]}.jpg",
-                'image/jpeg',
-                output.getbuffer().nbytes,
-                None
-            )
-        except Exception as e:
-            logger.error(f"Image compression failed: {e}")
-            uploaded_file.seek(0)
-            return uploaded_file # Fallback to original
+        from django.core.files.uploadedfile import InMemoryUploadedFile
+        
+        image = ImageIngestService.ingest(uploaded_file, [self.DOCUMENT_RENDITION])['full']
+        return InMemoryUploadedFile(
+            BytesIO(image.content),
+            'ImageField',
+            f"{uploaded_file.name.rsplit('.', 1)[0]}.jpg",
+            'image/jpeg',
+            len(image.content),
+            None
+        )
     
     @transaction.atomic
     def post(self, request):
@@ -326,10 +313,16 @@ class RegistrationSubmitView(APIView):
         data['interests'] = normalized_interests
         
         # 3. Handle file uploads with Compression
-        if 'id_card_front' in request.FILES:
-            data['id_card_front'] = self.compress_uploaded_image(request.FILES['id_card_front'])
-        if 'bank_book' in request.FILES:
-            data['bank_book'] = self.compress_uploaded_image(request.FILES['bank_book'])
+        for field in ('id_card_front', 'bank_book'):
+            if field in request.FILES:
+                try:
+                    data[field] = self.compress_uploaded_image(request.FILES[field])
+                except ImageIngestError as e:
+                    logger.warning(f"[Register] Rejected {field}: {e}")
+                    return Response(
+                        {'success': False, 'errors': {field: [str(e)]}},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
 
         serializer = RegistrationSerializer(data=data)
         if not serializer.is_valid():
@@ -436,16 +429,9 @@ class RegistrationSubmitView(APIView):
                 print(f"[Register] Warning: Social accounts processing issue: {e}")
                 # We can continue, as long as the DB transaction wasn't broken by a bad query.
         
-        # --- Background OCR Task (Thread Pool) ---
-        # Using a proper ThreadPoolExecutor allows us to QUEUE requests if many come at once.
-        # This prevents the server from crashing due to too many threads.
-        # The executor is defined globally at the top level of this file (see below) or we create a singleton.
-        
-        # We will define the task function outside the view to be clean (or keep it here for closure access).
-        # Keeping it here for simplicity of 'p.id' access, but wrapped in a helper.
-        
-        # Call OCR task ONLY after transaction commits successfully
-        transaction.on_commit(lambda: RegistrationSubmitView.submit_ocr_task(profile.id))
+        # --- Background OCR (DB task queue, run by `manage.py run_tasks`) ---
+        # Queued in this transaction, so it only exists if the profile commits
+        enqueue_task('influencers.ocr_documents', profile_id=profile.id)
         
         # Update user status to PENDING
         request.user.submit_registration()
@@ -456,90 +442,6 @@ class RegistrationSubmitView(APIView):
             'user': UserSerializer(request.user).data
         }, status=status.HTTP_201_CREATED)
 
-    # Define Executor at class level (or module level)
-    # max_workers=2 means only 2 OCRs run at once. Others wait in queue. High Performance & Safe.
-    from concurrent.futures import ThreadPoolExecutor
-    ocr_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="OCR_Worker")
-
-    @staticmethod
-    def run_ocr_task(pid):
-        """Static method for background OCR execution."""
-        try:
-            from django.db import close_old_connections
-            import time
-            close_old_connections()
-            
-            print(f"[OCR Queue] Starting Processing for Profile #{pid}")
-            
-            # Retry fetching profile (in case of replication lag or race condition)
-            p = None
-            for i in range(5):
-                try:
-                    p = InfluencerProfile.objects.get(pk=pid)
-                    break
-                except InfluencerProfile.DoesNotExist:
-                    print(f"[OCR] Profile {pid} not found (attempt {i+1}). Waiting...")
-                    time.sleep(1)
-            
-            if not p:
-                print(f"[OCR] Error: Profile {pid} never appeared in DB.")
-                return
-
-            service = GeminiService()
-            
-            # 1. ID Card
-            if p.id_card_front:
-                try:
-                    print(f"[OCR] Processing ID Card: {p.id_card_front.name}")
-                    with p.id_card_front.open('rb') as f:
-                        id_data = service.extract_document_data(f, 'id_card')
-                        if id_data:
-                            print(f"[OCR] ID Data: {id_data}")
-                            if 'identification_number' in id_data:
-                                p.identification_number = id_data['identification_number']
-                except Exception as e:
-                    print(f"[OCR] ID Card Failed: {e}")
-
-            # 2. Bank Book
-            if p.bank_book:
-                try:
-                    print(f"[OCR] Processing Bank Book: {p.bank_book.name}")
-                    with p.bank_book.open('rb') as f:
-                        bank_data = service.extract_document_data(f, 'bank_book')
-                        if bank_data:
-                            print(f"[OCR] Bank Data: {bank_data}")
-                            if 'bank_name' in bank_data:
-                                p.bank_name = bank_data['bank_name']
-                            if 'account_number' in bank_data:
-                                p.bank_account_number = bank_data['account_number']
-                except Exception as e:
-                    print(f"[OCR] Bank Book Failed: {e}")
-            
-            # Refresh connection before saving
-            close_old_connections()
-            
-            # Simple retry mechanism for saving
-            for i in range(3):
-                try:
-                    p.save()
-                    print(f"[OCR] Successfully saved OCR data for Profile #{pid}")
-                    break
-                except Exception as save_err:
-                    print(f"[OCR] Save failed (attempt {i+1}): {save_err}")
-                    close_old_connections()
-                    if i == 2: raise save_err
-            
-            print(f"[OCR Queue] Finished Task Profile #{pid}")
-        except Exception as e:
-            print(f"[OCR Queue] Task Failed: {e}")
-            from django.db import close_old_connections
-            close_old_connections()
-
-    @classmethod
-    def submit_ocr_task(cls, pid):
-        cls.ocr_executor.submit(cls.run_ocr_task, pid)
-        return True
-
 
 from rest_framework.parsers import JSONParser
 
@@ -683,102 +585,73 @@ class CampaignListView(ListAPIView):
     Priority:
     1. Active (user is working on it)
     2. Pending Review (user submitted work)
-    3. Open (accepting applications)
-    4. Closed
+    3. Completed (waiting for payment)
+    4. Open (accepting applications, not applied)
+    5. Finished / Rejected / Closed
+    
+    The user's application status and the priority are annotated onto the
+    campaign rows (LEFT JOIN on the user's application), so a page is
+    fetched in a single query regardless of page size or history length.
+    Paginated by keyset over (priority, application_deadline, id).
     """
     
     permission_classes = [IsAuthenticated]
     serializer_class = CampaignListSerializer
+    pagination_class = KeysetPagination
+    
+    # Application status groups
+    WORKING_STATUSES = ['APPROVED', 'WORK_IN_PROGRESS', 'SCRIPT_APPROVED', 'DRAFT_APPROVED']
+    WAITING_STATUSES = ['WAITING', 'SUBMITTED_SCRIPT', 'SUBMITTED_DRAFT', 'SUBMITTED_FINAL']
+    COMPLETED_STATUSES = ['COMPLETED']  # Waiting for payment
+    HISTORY_STATUSES = ['PAYMENT_TRANSFERRED', 'REJECTED']
     
     def get_queryset(self):
-        # 🔄 Trigger automatic status updates based on deadlines
-        try:
-            Campaign.update_all_statuses()
-        except Exception as e:
-            print(f"⚠️ Failed to auto-update campaign statuses: {e}")
+        # Status transitions are applied by `manage.py update_campaign_statuses --loop`
+        # (run by the worker service), so this read path never writes.
 
         # Check if user is approved
         if not self.request.user.is_approved:
             return Campaign.objects.none()
         
-        # Get user's applications
-        user_applications = CampaignApplication.objects.filter(
-            user=self.request.user
-        ).values('campaign_id', 'status')
-        
-        # Create a mapping of campaign_id -> status
-        app_status_map = {app['campaign_id']: app['status'] for app in user_applications}
-        
-        # DEBUG: Print user applications
-        print(f"[CampaignList] User: {self.request.user.id} ({self.request.user.email})")
-        print(f"[CampaignList] Applications raw: {list(user_applications)}")
-        print(f"[CampaignList] App Status Map: {app_status_map}")
-        
-        # Build queryset with sorting
-        queryset = Campaign.objects.exclude(status='DRAFT')
-        
-        # Define Priority Groups
-        # 1. Not Applied (Not in app_status_map AND Open) will be handled by default case + filter
-        
-        # 2. Working
-        working_statuses = ['APPROVED', 'WORK_IN_PROGRESS', 'SCRIPT_APPROVED', 'DRAFT_APPROVED']
-        
-        # 3. Waiting
-        waiting_statuses = ['WAITING', 'SUBMITTED_SCRIPT', 'SUBMITTED_DRAFT', 'SUBMITTED_FINAL']
-        
-        # 4. Completed (Waiting for Payment)
-        completed_statuses = ['COMPLETED']
-
-        # 5. Finished (Money Received)
-        finished_statuses = ['PAYMENT_TRANSFERRED']
-        
-        # Get IDs for each priority group
-        working_ids = [cid for cid, s in app_status_map.items() if s in working_statuses]
-        waiting_ids = [cid for cid, s in app_status_map.items() if s in waiting_statuses]
-        completed_ids = [cid for cid, s in app_status_map.items() if s in completed_statuses]
-        finished_ids = [cid for cid, s in app_status_map.items() if s in finished_statuses]
-        
-        print(f"[CampaignList] Waiting IDs: {waiting_ids}")
-        print(f"[CampaignList] Working IDs: {working_ids}")
-        
-        # Any other ID in map (e.g. REJECTED) or not in map is handled below
-        
-        queryset = queryset.annotate(
+        queryset = Campaign.objects.exclude(status='DRAFT').annotate(
+            my_application=FilteredRelation(
+                'applications',
+                condition=Q(applications__user=self.request.user)
+            ),
+            user_status=F('my_application__status'),
+        ).annotate(
             priority=Case(
                 # Priority 1: Working / Active Revision
-                When(id__in=working_ids, then=Value(1)),
+                When(user_status__in=self.WORKING_STATUSES, then=Value(1)),
                 
                 # Priority 2: Waiting (Submission sent)
-                When(id__in=waiting_ids, then=Value(2)),
+                When(user_status__in=self.WAITING_STATUSES, then=Value(2)),
                 
                 # Priority 3: Completed (Wait for Payment)
-                When(id__in=completed_ids, then=Value(3)),
+                When(user_status__in=self.COMPLETED_STATUSES, then=Value(3)),
                 
                 # Priority 4: Open for Applications (Not applied)
-                When(~Q(id__in=app_status_map.keys()) & Q(status='OPEN'), then=Value(4)),
+                When(user_status__isnull=True, status='OPEN', then=Value(4)),
 
                 # Priority 5: Finished / Rejected / Closed
                 default=Value(5),
                 output_field=IntegerField()
             )
-        ).order_by('priority', 'application_deadline')
+        ).order_by('priority', 'application_deadline', 'id')
         
         # Filter by status if requested (Frontend might want to filter specific tabs)
         # Check both query_params (GET) and data (POST)
         status_filter = self.request.data.get('status') or self.request.query_params.get('status')
-        print(f"[CampaignList] Status Filter: {status_filter}")
         
         if status_filter == 'active':
-             # Show Working + Waiting + Completed (Wait for Payment)
-             ids_to_include = working_ids + waiting_ids + completed_ids
-             print(f"[CampaignList] Filtering active. IDs: {ids_to_include}")
-             queryset = queryset.filter(id__in=ids_to_include)
+            # Show Working + Waiting + Completed (Wait for Payment)
+            queryset = queryset.filter(
+                user_status__in=self.WORKING_STATUSES + self.WAITING_STATUSES + self.COMPLETED_STATUSES
+            )
         elif status_filter == 'history':
-             # Show Finished (Payment Transferred) + Rejected
-             # COMPLETED (Wait for Payment) stays in 'active' tab until transferred
-             history_ids = finished_ids + [cid for cid, s in app_status_map.items() if s == 'REJECTED']
-             print(f"[CampaignList] Filtering history. IDs: {history_ids}")
-             queryset = queryset.filter(id__in=history_ids)
+            # Show Finished (Payment Transferred) + Rejected
+            # COMPLETED (Wait for Payment) stays in 'active' tab until transferred
+            queryset = queryset.filter(user_status__in=self.HISTORY_STATUSES)
         
         return queryset
     
@@ -787,6 +660,22 @@ class CampaignListView(ListAPIView):
         context['request'] = self.request
         return context
     
+    def list(self, request, *args, **kwargs):
+        """Serve the rendered page from the per-user feed cache when possible."""
+        status_filter = request.data.get('status') or request.query_params.get('status')
+        cache_key = FeedCache.build_key(request, status_filter)
+        
+        data = FeedCache.get(cache_key)
+        if data is not None:
+            response = Response(data)
+            response['X-Feed-Cache'] = 'HIT'
+            return response
+        
+        response = super().list(request, *args, **kwargs)
+        FeedCache.set(cache_key, response.data)
+        response['X-Feed-Cache'] = 'MISS'
+        return response
+    
     def post(self, request, *args, **kwargs):
         """Support POST for filtering campaigns (hides params from URL)."""
         return self.list(request, *args, **kwargs)
@@ -831,12 +720,35 @@ class CampaignDetailView(RetrieveAPIView):
     serializer_class = CampaignDetailSerializer
     queryset = Campaign.objects.exclude(status='DRAFT')
     
+    # LIFF WebViews re-fetch on every focus: let them revalidate with the ETag
+    CACHE_CONTROL = 'private, no-cache'
+    
+    def get_queryset(self):
+        # Version of the user's own application, folded into the ETag
+        return super().get_queryset().annotate(
+            my_application_updated_at=Subquery(
+                CampaignApplication.objects.filter(
+                    campaign=OuterRef('pk'), user=self.request.user
+                ).values('updated_at')[:1]
+            )
+        )
+    
     def get(self, request, *args, **kwargs):
         # Story 3.1: Block Unapproved Users from Jobs
         if not request.user.is_approved:
             from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("You must be approved before viewing campaign details.")
-        return super().get(request, *args, **kwargs)
+        
+        campaign = self.get_object()
+        etag = make_etag(
+            'campaign-detail', campaign.pk, campaign.updated_at,
+            campaign.my_application_updated_at, request.user.pk, request.get_host()
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag, self.CACHE_CONTROL)
+        
+        serializer = self.get_serializer(campaign)
+        return with_cache_headers(Response(serializer.data), etag, self.CACHE_CONTROL)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -911,11 +823,29 @@ class UserApplicationsView(ListAPIView):
     
     permission_classes = [IsAuthenticated]
     serializer_class = ApplicationSerializer
+    pagination_class = KeysetPagination
+    CACHE_CONTROL = 'private, no-cache'
     
     def get_queryset(self):
         return CampaignApplication.objects.filter(
             user=self.request.user
-        ).select_related('campaign')
+        ).select_related('campaign').order_by('-applied_at', 'id')
+    
+    def list(self, request, *args, **kwargs):
+        version = CampaignApplication.objects.filter(user=request.user).aggregate(
+            count=Count('id'),
+            latest=Max('updated_at'),
+            campaigns=Max('campaign__updated_at'),
+        )
+        etag = make_etag(
+            'user-applications', request.user.pk, version['count'], version['latest'],
+            version['campaigns'], request.get_host(), request.get_full_path()
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag, self.CACHE_CONTROL)
+        
+        response = super().list(request, *args, **kwargs)
+        return with_cache_headers(response, etag, self.CACHE_CONTROL)
 
 
 class SubmitWorkView(APIView):
@@ -923,6 +853,26 @@ class SubmitWorkView(APIView):
     
     permission_classes = [IsAuthenticated]
     
+    # Insight screenshots: at most 1920px wide (tall screenshots keep their height)
+    INSIGHT_RENDITION = Rendition('full', 1920, None, 70)
+    
+    @staticmethod
+    def delete_insight_files(urls):
+        """Delete replaced insight screenshots (stored as URLs) from storage."""
+        from urllib.parse import unquote
+
+        for old_url in urls:
+            try:
+                # insight_files stores URLs; the storage name starts at campaigns/
+                decoded_url = unquote(old_url)
+                if 'campaigns/' in decoded_url:
+                    rel_path = decoded_url[decoded_url.find('campaigns/'):].split('?')[0]
+                    if default_storage.exists(rel_path):
+                        print(f"[Insight Cleanup] Deleting {rel_path}")
+                        default_storage.delete(rel_path)
+            except Exception as del_err:
+                print(f"[Insight Cleanup Error] Failed to delete {old_url}: {del_err}")
+
     def post(self, request, pk):
         # Get application
         try:
@@ -977,35 +927,13 @@ class SubmitWorkView(APIView):
             kept_urls = request.data.getlist('kept_files') if 'kept_files' in request.data else []
             # Ensure kept_urls are actually from our own storage domain (basic security check optional)
             
-            # Identify files to delete (Old files NOT in kept_urls)
-            old_files = application.insight_files or []
+            # Identify files to delete (Old files NOT in kept_urls). They are only
+            # deleted once the new submission is saved, so a failed upload leaves
+            # insight_files pointing at files that still exist.
+            old_files = list(application.insight_files or [])
             if application.insight_image and application.insight_image not in old_files:
                 old_files.append(application.insight_image)
-            
-            for old_url in old_files:
-                if old_url not in kept_urls:
-                    # DELETE this file
-                    try:
-                        # Extract relative path from URL (assuming default_storage)
-                        # This works for standard Django storage. Adjust if using S3/GCS with signed URLs logic.
-                        # Simple approach: If it stores relative path in DB, great. If full URL, need to parse.
-                        # Here we assume application.insight_files stores the Relative Path or Full URL depending on setup.
-                        # Based on line 1048 `default_storage.url(saved_path)`, it stores the URL.
-                        # To delete, we need the path.
-                        
-                        # Heuristic: Try to find the path suffix
-                        # Unquote URL first
-                        from urllib.parse import unquote
-                        decoded_url = unquote(old_url)
-                        
-                        if 'campaigns/' in decoded_url:
-                            # Extract part after media URL or just search for campaigns/...
-                            rel_path = decoded_url[decoded_url.find('campaigns/'):]
-                            if default_storage.exists(rel_path):
-                                print(f"[Insight Cleanup] Deleting {rel_path}")
-                                default_storage.delete(rel_path)
-                    except Exception as del_err:
-                        print(f"[Insight Cleanup Error] Failed to delete {old_url}: {del_err}")
+            removed_urls = [old_url for old_url in old_files if old_url not in kept_urls]
 
             # Add kept files to the new list
             insight_urls.extend(kept_urls)
@@ -1018,75 +946,38 @@ class SubmitWorkView(APIView):
             else:
                 files = []
 
+            new_paths = {}  # url -> storage name
             if files:
-                try:
-                    from PIL import Image
-                    from io import BytesIO
-                    from django.core.files.uploadedfile import InMemoryUploadedFile
-                    from django.core.files.storage import default_storage
-                    import time
-                    import uuid
-                    import sys
-
-                    print(f"[Insight Upload] Processing {len(files)} new files...")
-
-                    for idx, image_file in enumerate(files):
-                        # Open image
-                        im = Image.open(image_file)
-                        
-                        # Convert to RGB if RGBA
-                        if im.mode == 'RGBA':
-                            im = im.convert('RGB')
-                        
-                        # Resize if too large (max 1920px width)
-                        if im.width > 1920:
-                            ratio = 1920 / im.width
-                            new_height = int(im.height * ratio)
-                            im = im.resize((1920, new_height), Image.Resampling.LANCZOS)
-                        
-                        # Compress
-                        output = BytesIO()
-                        im.save(output, format='JPEG', quality=70, optimize=True)
-                        output.seek(0)
-                        
-                        # Create new Django file
-                        file_size = output.getbuffer().nbytes
-                        file_ext = image_file.name.split('.')[-1]
-                        
-                        # UNIQUE NAMING: user_{id}_insight_{timestamp}_{uuid}.jpg
-                        filename = f"user_{application.user.id}_insight_{int(time.time())}_{uuid.uuid4().hex[:8]}.jpg"
-                        
-                        new_image = InMemoryUploadedFile(
-                            output,
-                            'ImageField',
-                            filename,
-                            'image/jpeg',
-                            file_size,
-                            None
-                        )
-                        
-                        # Save to storage
-                        file_path = f"campaigns/{application.campaign.id}/insights/{filename}"
-                        
-                        saved_path = default_storage.save(file_path, new_image)
-                        
-                        # Get URL
-                        url = default_storage.url(saved_path)
-                        
-                        # Only append cache-busting if we are sure it's not a signed URL
-                        # For GCS/S3, better to rely on their caching policies or just use the URL as is.
-                        # We will remove the manual ?t= appending to be safe.
-                        
-                        insight_urls.append(url)
+                import time
+                import uuid
 
-                except Exception as e:
-                    print(f"[Insight File Processing Error] {e}")
-                    import traceback
-                    traceback.print_exc()
-                    # Continue even if one file fails? Or fail whole request?
-                    # For now, let's just log and continue, but strict strictness depends on reqs.
-                    # Ideally we want to fail if upload fails.
-                    pass
+                print(f"[Insight Upload] Processing {len(files)} new files...")
+
+                rendered = []
+                for image_file in files:
+                    try:
+                        # Max 1920px wide, JPEG q70, upright
+                        image = ImageIngestService.ingest(image_file, [self.INSIGHT_RENDITION])['full']
+                    except ImageIngestError as e:
+                        # Skip this file but keep the others
+                        print(f"[Insight File Processing Error] {image_file.name}: {e}")
+                        continue
+                    # UNIQUE NAMING: user_{id}_insight_{timestamp}_{uuid}.jpg
+                    filename = f"user_{application.user_id}_insight_{int(time.time())}_{uuid.uuid4().hex[:8]}.jpg"
+                    rendered.append((f"campaigns/{application.campaign_id}/insights/{filename}", image.content))
+
+                # All uploads run concurrently; a failed batch leaves nothing behind
+                try:
+                    uploaded = upload_files(rendered)
+                except StorageUploadError as e:
+                    logger.error(f"[Insight Upload] App #{application.id}: {e}")
+                    return Response(
+                        {'error': 'upload_failed', 'message': 'Could not store the screenshots, please try again'},
+                        status=status.HTTP_503_SERVICE_UNAVAILABLE
+                    )
+                for saved_path, url in uploaded:
+                    insight_urls.append(url)
+                    new_paths[url] = saved_path
 
 
             # Update Application Data
@@ -1099,95 +990,39 @@ class SubmitWorkView(APIView):
                 # IMPORTANT: Update stage status
                 application.submit_work(data['stage'], submission_link, notes=data.get('notes', ''))
                 
-                # Explicitly save changes before AI analysis
-                application.save(update_fields=['insight_image', 'insight_files'])
+                # Explicitly save changes before queueing AI analysis
+                application.save(update_fields=['insight_image', 'insight_files', 'updated_at'])
             else:
                  # Fallback if somehow empty, though validation should prevent this
                  submission_link = ""
                  # Still proceed to submit work to trigger status update
                  application.submit_work(data['stage'], submission_link, notes=data.get('notes', ''))
-                    
-            # --- REAL AI ANALYSIS (Gemini Vision Multi-File) ---
-            try:
-                from .services.gemini import GeminiService
-                
-                print(f"[AI Analysis] Triggering Multi-File Analysis for {len(insight_urls)} images")
-                ai_result = GeminiService.analyze_insight_images(insight_urls)
-                        
-                if ai_result:
-                    application.insight_data = ai_result
-                    application.save(update_fields=['insight_data', 'insight_files', 'insight_image'])
-                    print(f"[AI Analysis] Saved REAL data for {application.id}")
 
-                    # --- NEW: Save Dedicated Metrics for Reporting ---
-                    try:
-                        from apps.campaigns.models import CampaignInsightMetric
-                        
-                        # 1. Extract Raw Metrics (Handle K/M suffixes via helper or assume raw numbers if cleaned)
-                        def clean_num(val):
-                            if val is None: return 0
-                            if isinstance(val, (int, float)): return int(val)
-                            s = str(val).lower().replace(',', '').strip()
-                            if not s: return 0
-                            try:
-                                if 'k' in s: return int(float(s.replace('k', '')) * 1000)
-                                if 'm' in s: return int(float(s.replace('m', '')) * 1000000)
-                                return int(float(s))
-                            except:
-                                return 0
-
-                        metrics = ai_result.get('metrics', {})
-                        views = clean_num(metrics.get('views', 0))
-                        likes = clean_num(metrics.get('likes', 0))
-                        comments = clean_num(metrics.get('comments', 0))
-                        shares = clean_num(metrics.get('shares', 0))
-                        
-                        # 2. Calculate KPI
-                        eng_rate = 0.0
-                        if views > 0:
-                            eng_rate = ((likes + comments + shares) / views) * 100
-                        
-                        cpv = 0.0
-                        budget = 0.0
-                        try:
-                            budget = float(application.campaign.budget)
-                        except: pass
-
-                        if views > 0 and budget > 0:
-                            cpv = budget / views
-                            
-                        # 3. Save to DB
-                        CampaignInsightMetric.objects.update_or_create(
-                            application=application,
-                            defaults={
-                                'total_views': views,
-                                'total_likes': likes,
-                                'total_comments': comments,
-                                'total_shares': shares,
-                                'engagement_rate': round(eng_rate, 2),
-                                'cost_per_view': round(cpv, 4)
-                            }
-                        )
-                        print(f"[Metrics] Saved Metrics for App #{application.id}: Views={views}, ER={eng_rate}%, CPV={cpv}")
-                        
-                    except Exception as m_err:
-                        # FAIL OPEN: Do not crash the submission if metrics fail
-                        print(f"[Metrics] Failed to save DB metrics (Ignored): {m_err}")
-                        import traceback
-                        traceback.print_exc()
-                else:
-                    print(f"[AI Analysis] Failed to get result from Gemini")
-                    # Still save file paths even if AI fails
-                    application.save(update_fields=['insight_files', 'insight_image'])
+            if removed_urls:
+                transaction.on_commit(lambda: self.delete_insight_files(removed_urls))
                     
-            except Exception as ai_err:
-                print(f"[AI Analysis] Critical Error: {ai_err}")
-                import traceback
-                traceback.print_exc()
-                # Ensure files are saved at minimum
-                application.save(update_fields=['insight_files', 'insight_image'])
-            
-            return Response({'success': True, 'message': 'Insight submitted successfully', 'link': submission_link, 'files_count': len(insight_urls)})
+            # --- AI ANALYSIS (background task, reads the screenshots from storage) ---
+            from urllib.parse import unquote
+            from apps.campaigns.services import InsightAnalysisService
+
+            image_paths = []
+            for url in insight_urls:
+                if url in new_paths:
+                    image_paths.append(new_paths[url])
+                else:
+                    # Kept from an earlier submission
+                    decoded_url = unquote(url)
+                    if 'campaigns/' in decoded_url:
+                        image_paths.append(decoded_url[decoded_url.find('campaigns/'):].split('?')[0])
+            job = InsightAnalysisService.submit(application, image_paths)
+
+            return Response({
+                'success': True,
+                'message': 'Insight submitted successfully',
+                'link': submission_link,
+                'files_count': len(insight_urls),
+                'analysis_job': InsightAnalysisJobSerializer(job, context={'request': request}).data,
+            })
 
 
 
@@ -1216,6 +1051,39 @@ class SubmitWorkView(APIView):
         })
 
 
+class InsightAnalysisStatusView(APIView):
+    """
+    Latest insight analysis job for an application.
+    The LIFF app polls this after submitting insights; `insight_data` is
+    included once the job has succeeded.
+    """
+    
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, pk):
+        applications = CampaignApplication.objects.all()
+        if not request.user.is_staff:
+            applications = applications.filter(user=request.user)
+        application = applications.filter(pk=pk).only('id', 'insight_data').first()
+        if application is None:
+            return Response(
+                {'error': 'not_found', 'message': 'Application not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        job = application.insight_jobs.order_by('-created_at', '-id').first()
+        if job is None:
+            return Response(
+                {'error': 'not_found', 'message': 'No insight analysis for this application'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response({
+            'job': InsightAnalysisJobSerializer(job, context={'request': request}).data,
+            'insight_data': application.insight_data if job.status == 'SUCCEEDED' else None,
+        })
+
+
 class ValidateDriveLinkView(APIView):
     """Validate Google Drive link accessibility."""
     
@@ -1235,6 +1103,27 @@ class ValidateDriveLinkView(APIView):
         return Response(result)
 
 
+class ValidateDriveLinksView(APIView):
+    """Validate up to 50 Google Drive links at once (checked concurrently)."""
+    
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        serializer = ValidateDriveLinksSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {'success': False, 'errors': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        links = serializer.validated_data['links']
+        results = GoogleDriveValidator.validate_many(links)
+        
+        return Response({
+            'results': [{'link': link, **result} for link, result in zip(links, results)]
+        })
+
+
 class SendMessageView(APIView):
     """
     Send LINE messages via Messaging API.
@@ -1319,13 +1208,67 @@ class SocialAccountsListView(APIView):
         })
 
 
+def queued_fetch_response(request, job):
+    """202 with the handle of a social fetch waiting for its rate-limit slot."""
+    return Response({
+        'success': True,
+        'pending': True,
+        'message': 'Queued until the platform can be fetched again',
+        'job': SocialFetchJobSerializer(job, context={'request': request}).data,
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+def fetch_limit_response(error):
+    """429 for a caller whose queued social fetches are at SOCIAL_FETCH_MAX_PENDING."""
+    return Response(
+        {'success': False, 'error': str(error)},
+        status=status.HTTP_429_TOO_MANY_REQUESTS
+    )
+
+
+class SocialFetchJobView(APIView):
+    """
+    Poll a queued social fetch (see queued_fetch_response).
+    While pending, answers {'pending': true, 'job': ...}. Once finished, the
+    body is what the original endpoint would have returned, plus `job`.
+    """
+    
+    permission_classes = [AllowAny]  # the token is the capability; lookups run before login
+    
+    def get(self, request, token):
+        job = SocialFetchJob.objects.select_related('account').filter(token=token).first()
+        if job is not None and job.user_id and not (request.user.is_staff or request.user.id == job.user_id):
+            job = None
+        if job is None:
+            return Response(
+                {'success': False, 'error': 'Job not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        job_data = SocialFetchJobSerializer(job, context={'request': request}).data
+        if job.status == 'PENDING':
+            return Response({'success': True, 'pending': True, 'job': job_data})
+        
+        if job.purpose == 'lookup':
+            body = dict(job.result)
+        elif job.status == 'SUCCEEDED':
+            verb = 'connected' if job.purpose == 'connect' else 'synced'
+            body = {
+                'success': True,
+                'message': f'{job.platform.title()} account {verb} successfully',
+                'account': SocialPlatformAccountSerializer(job.account).data if job.account else None,
+            }
+        else:
+            body = {'success': False, 'error': job.error}
+        body['job'] = job_data
+        return Response(body)
+
+
 class SocialConnectView(APIView):
     """Connect a new social media account by fetching profile data."""
     
     permission_classes = [IsAuthenticated]
     
-    @transaction.atomic
-    @transaction.atomic
     def post(self, request):
         serializer = SocialConnectSerializer(data=request.data)
         if not serializer.is_valid():
@@ -1389,73 +1332,26 @@ class SocialConnectView(APIView):
             }
             
         else:
-            # 2. Automatic Fetch
+            # 2. Automatic Fetch (queued if the platform was fetched too recently)
             print(f"[SocialConnect] Fetching profile for {platform} at {profile_url}")
-            profile_data = SocialPlatformService.fetch_profile(platform, profile_url)
-            print(f"[SocialConnect] Fetch result success: {profile_data.get('success')}")
-        
-        # 3. Fallback: If fetch failed, try to just save the link (Regex Extraction)
-        if not profile_data.get('success'):
-            print(f"[SocialConnect] Fetch Failed: {profile_data.get('error')}. Attempting Fallback...")
-            
-            # Attempt to extract minimally required data (username) from URL
-            fallback_username = None
             try:
-                if platform == 'tiktok':
-                    from apps.influencers.services import TikTokLocalService
-                    fallback_username = TikTokLocalService.extract_username(profile_url)
-                    if fallback_username: fallback_username = f"@{fallback_username}"
-                elif platform == 'instagram':
-                    from apps.influencers.services import InstaloaderService
-                    fallback_username = InstaloaderService.extract_username(profile_url)
-                    if fallback_username: fallback_username = f"@{fallback_username}"
-                elif platform == 'facebook':
-                    from apps.influencers.services import FacebookLocalService
-                    fallback_username = FacebookLocalService.extract_username(profile_url)
-                elif platform == 'youtube':
-                    from apps.influencers.services import YouTubeService
-                    type_, val = YouTubeService.extract_channel_id_or_handle(profile_url)
-                    fallback_username = val
-            except Exception as e:
-                print(f"[SocialConnect] Fallback Regex Failed: {e}")
-            
-            if fallback_username:
-                print(f"[SocialConnect] Fallback successful. Username: {fallback_username}")
-                profile_data = {
-                    'success': True,
-                    'data': {
-                        'platform': platform,
-                        'username': fallback_username,
-                        'profile_url': profile_url,
-                        'profile_picture_url': '',
-                        'followers_count': 0, # Cannot verify
-                        'following_count': 0,
-                        'posts_count': 0,
-                        'is_verified': False
-                    }
-                }
-            else:
-                # Truly failed
-                return Response(
-                    {'success': False, 'error': profile_data.get('error', 'Failed to fetch profile data and could not verify URL')},
-                    status=status.HTTP_400_BAD_REQUEST
+                profile_data, job = SocialPlatformService.request(
+                    platform, profile_url, purpose='connect', user=request.user,
+                    client_ip=client_ip(request)
                 )
+            except SocialFetchLimitError as e:
+                return fetch_limit_response(e)
+            if job:
+                return queued_fetch_response(request, job)
+            print(f"[SocialConnect] Fetch result success: {profile_data.get('success')}")
         
-        final_data = profile_data['data']
-        
-        # Create the social account record
-        account = SocialPlatformAccount.objects.create(
-            user=request.user,
-            platform=final_data['platform'],
-            platform_user_id=final_data.get('platform_user_id', ''),
-            username=final_data.get('username', ''),
-            profile_url=profile_url,
-            profile_picture_url=final_data.get('profile_picture_url', ''),
-            followers_count=final_data.get('followers_count', 0),
-            following_count=final_data.get('following_count', 0),
-            posts_count=final_data.get('posts_count', 0),
-            is_verified=final_data.get('is_verified', False)
-        )
+        # 3. Create the account (falls back to the username in the URL if the fetch failed)
+        account, error = SocialAccountService.connect(request.user, platform, profile_url, profile_data)
+        if account is None:
+            return Response(
+                {'success': False, 'error': error},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         return Response({
             'success': True,
@@ -1507,8 +1403,17 @@ class SocialSyncView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Fetch fresh data
-        result = SocialPlatformService.fetch_profile(account.platform, account.profile_url)
+        # Fetch fresh data (queued if the platform was fetched too recently).
+        # A stale cached profile is applied right away and refreshed by `job`.
+        try:
+            result, job = SocialPlatformService.request(
+                account.platform, account.profile_url, purpose='sync', user=request.user, account=account,
+                allow_stale=True, client_ip=client_ip(request)
+            )
+        except SocialFetchLimitError as e:
+            return fetch_limit_response(e)
+        if result is None:
+            return queued_fetch_response(request, job)
         
         if not result.get('success'):
             return Response(
@@ -1516,29 +1421,24 @@ class SocialSyncView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        profile_data = result['data']
+        SocialAccountService.apply_profile(account, result['data'])
         
-        # Update account data
-        account.platform_user_id = profile_data.get('platform_user_id', account.platform_user_id)
-        account.username = profile_data.get('username', account.username)
-        account.profile_picture_url = profile_data.get('profile_picture_url', account.profile_picture_url)
-        account.followers_count = profile_data.get('followers_count', account.followers_count)
-        account.following_count = profile_data.get('following_count', account.following_count)
-        account.posts_count = profile_data.get('posts_count', account.posts_count)
-        account.is_verified = profile_data.get('is_verified', account.is_verified)
-        account.save()
-        
-        return Response({
+        data = {
             'success': True,
             'message': 'Account data synced successfully',
             'account': SocialPlatformAccountSerializer(account).data
-        })
+        }
+        if job:
+            data['stale'] = True
+            data['job'] = SocialFetchJobSerializer(job, context={'request': request}).data
+        return Response(data)
 
 
 class ImageProxyView(APIView):
     """
     Proxy an image URL to bypass hotlinking protection or Referer checks.
-    Does not store anything on the server.
+    Images are kept in a bounded on-disk cache (ImageProxyCache) and sent
+    with long-lived Cache-Control, so browsers and the CDN re-use them.
     """
     permission_classes = [permissions.AllowAny] # Allow anyone to view profile images
     
@@ -1559,23 +1459,31 @@ class ImageProxyView(APIView):
         if is_local:
             return HttpResponseRedirect(url)
 
+        cache_control = f"public, max-age={getattr(settings, 'IMAGE_PROXY_MAX_AGE', 7 * 24 * 60 * 60)}"
         try:
-            # Mask the Referer to bypass protection
-            resp = requests.get(url, stream=True, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0'
-            })
-            
-            if resp.status_code != 200:
-                logger.error(f"[ImageProxy] Failed to fetch {url}: {resp.status_code}")
-                return Response({'error': f'Failed to fetch image: {resp.status_code}'}, status=resp.status_code)
-                
-            # Stream the response back to the client
-            content_type = resp.headers.get('Content-Type', 'image/jpeg')
-            return StreamingHttpResponse(resp.iter_content(chunk_size=8192), content_type=content_type)
-            
+            image = ImageProxyCache.get(url)
+            if etag_matches(request, image.etag):
+                return not_modified(image.etag, cache_control)
+            try:
+                body = open(image.path, 'rb')
+            except FileNotFoundError:
+                # Evicted between lookup and open
+                image = ImageProxyCache.get(url)
+                body = open(image.path, 'rb')
+        except ImageProxyError as e:
+            logger.error(f"[ImageProxy] Failed to fetch {url}: {e}")
+            return Response({'error': str(e)}, status=e.status)
         except Exception as e:
              logger.error(f"[ImageProxy] Error fetching {url}: {e}")
-             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+             return Response({'error': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+        response = FileResponse(body, content_type=image.content_type)
+        response['Content-Length'] = image.size
+        response['X-Content-Type-Options'] = 'nosniff'
+        response['X-Image-Cache'] = image.outcome.upper()
+        response['ETag'] = image.etag
+        response['Cache-Control'] = cache_control
+        return response
 
 
 class InfluencerApprovalListView(ListAPIView):
@@ -1585,12 +1493,13 @@ class InfluencerApprovalListView(ListAPIView):
     """
     permission_classes = [permissions.IsAdminUser]
     serializer_class = InfluencerApprovalSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         status_filter = self.request.query_params.get('status', 'PENDING')
         if status_filter == 'ALL':
-            return User.objects.exclude(status='NEW').order_by('-created_at')
-        return User.objects.filter(status=status_filter).order_by('-created_at')
+            return User.objects.exclude(status='NEW').order_by('-created_at', 'id')
+        return User.objects.filter(status=status_filter).order_by('-created_at', 'id')
 
 
 class BulkInfluencerActionView(APIView):
@@ -1649,91 +1558,55 @@ class AdminCampaignListView(ListAPIView):
     """
     permission_classes = [permissions.IsAdminUser]
     serializer_class = CampaignListSerializer # Reuse or create specific one
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
-        return Campaign.objects.all().order_by('-created_at')
+        return Campaign.objects.all().order_by('-created_at', 'id')
 
 
-class AdminCampaignDetailView(APIView):
+class AdminCampaignParticipantsMixin:
+    """Campaign lookup (UUID or id) and the participant queryset shared by the admin campaign views."""
+    
+    def get_campaign(self, uuid):
+        """Campaign by UUID, falling back to id. Raises Campaign.DoesNotExist."""
+        import uuid as uuid_lib
+        try:
+            uuid_lib.UUID(str(uuid))
+            return Campaign.objects.get(uuid=uuid)
+        except (ValueError, Campaign.DoesNotExist):
+            try:
+                return Campaign.objects.get(id=uuid)
+            except ValueError:
+                raise Campaign.DoesNotExist
+    
+    def get_participants(self, campaign):
+        # Everything CampaignParticipantSerializer touches, in a fixed number of queries
+        return (
+            CampaignApplication.objects.filter(campaign=campaign)
+            .select_related('user', 'user__profile', 'insight_metric')
+            .prefetch_related('user__profile__interests', 'user__social_accounts')
+        )
+
+
+class AdminCampaignDetailView(AdminCampaignParticipantsMixin, APIView):
     """
     Get campaign detail with all participants for admin management.
+    Pass ?participants=0 to leave the participants out (the admin page loads
+    them from AdminCampaignParticipantsView).
     """
     permission_classes = [permissions.IsAdminUser]
     
     def get(self, request, uuid):
         try:
-            # Try UUID first
-            import uuid as uuid_lib
-            try:
-                uuid_obj = uuid_lib.UUID(str(uuid))
-                campaign = Campaign.objects.get(uuid=uuid)
-            except (ValueError, Campaign.DoesNotExist):
-                # Fallback to ID
-                campaign = Campaign.objects.get(id=uuid)
+            campaign = self.get_campaign(uuid)
         except Campaign.DoesNotExist:
             return Response({'error': 'not_found'}, status=404)
             
-        # Get all applications
-        # Added insight_metric select_related to query
-        applications = CampaignApplication.objects.filter(campaign=campaign).select_related('user', 'user__profile', 'insight_metric').prefetch_related('user__profile__interests')
-        
-        # Group by status/stage
-        participants = []
-        for app in applications:
-            profile = app.user.profile if hasattr(app.user, 'profile') else None
-            participants.append({
-                'id': app.id,
-                'user_id': app.user.id,
-                'display_name': app.user.display_name,
-                'picture_url': app.user.picture_url,
-                'status': app.status,
-                'current_stage': app.current_stage,
-                'applied_at': app.applied_at,
-                'updated_at': app.updated_at,
-                'submissions': app.submission_data,
-                # Insight data (simplified)
-                'insight_files': app.insight_files,
-                'insight_image': app.insight_image,
-                'insight_data': app.insight_data,
-                'insight_submitted_at': app.insight_submitted_at.isoformat() if app.insight_submitted_at else None,
-                'insight_feedback': app.insight_feedback,
-                'insight_note': app.insight_note,
-                'payment_slip': app.payment_slip.url if app.payment_slip else None,
-                # New Metrics from dedicated table
-                'metrics': {
-                    'total_views': getattr(app.insight_metric, 'total_views', 0) if hasattr(app, 'insight_metric') else 0,
-                    'total_likes': getattr(app.insight_metric, 'total_likes', 0) if hasattr(app, 'insight_metric') else 0,
-                    'total_comments': getattr(app.insight_metric, 'total_comments', 0) if hasattr(app, 'insight_metric') else 0,
-                    'total_shares': getattr(app.insight_metric, 'total_shares', 0) if hasattr(app, 'insight_metric') else 0,
-                    'engagement_rate': getattr(app.insight_metric, 'engagement_rate', 0.0) if hasattr(app, 'insight_metric') else 0.0,
-                    'cost_per_view': getattr(app.insight_metric, 'cost_per_view', 0.0) if hasattr(app, 'insight_metric') else 0.0,
-                },
-                'profile': {
-                     'phone': profile.phone if profile else '',
-                     'fullname': profile.full_name_th if profile else '',
-                     'email': profile.email if profile else '',
-                     'interests': [
-                         {'id': i.id, 'name': i.name_th, 'icon': i.icon} 
-                         for i in profile.interests.all()
-                     ] if profile else [],
-                     'line_id': app.user.line_user_id
-                },
-                'social_accounts': [
-                    {
-                        'platform': acc.platform,
-                        'username': acc.username,
-                        'profile_url': acc.profile_url,
-                        'followers_count': acc.followers_count,
-                        'followers_formatted': acc.followers_formatted
-                    } for acc in app.user.social_accounts.all()
-                ]
-            })
-            
         # Use serializer for full details to ensure consistency
         serializer = CampaignUpdateSerializer(campaign, context={'request': request})
         campaign_full = serializer.data
 
-        return Response({
+        data = {
             'campaign': {
                 'id': campaign.id,
                 'title': campaign.title,
@@ -1743,8 +1616,12 @@ class AdminCampaignDetailView(APIView):
                 'show_slip_to_client': campaign.show_slip_to_client,
             },
             'campaign_full': campaign_full,
-            'participants': participants
-        })
+        }
+        if request.query_params.get('participants') != '0':
+            data['participants'] = CampaignParticipantSerializer(
+                self.get_participants(campaign), many=True, fields='full'
+            ).data
+        return Response(data)
 
     def patch(self, request, uuid):
         try:
@@ -1860,13 +1737,39 @@ class AdminWorkReviewView(APIView):
             return Response({'error': 'Not found'}, status=404)
 
 
+class _CSVEcho:
+    """Pseudo-buffer for csv.writer: writerow() returns the formatted line."""
+
+    def write(self, value):
+        return value
+
+
 class AdminExportParticipantsView(APIView):
     """
     Export campaign participants to CSV (Excel compatible).
     Matches user requested format: No, TikTok Name, Link, Follower, etc.
+
+    Streamed: applications are read in chunks with their TikTok account
+    prefetched, so memory and query count don't grow with the campaign.
     """
     permission_classes = [permissions.IsAdminUser]
-    
+
+    # Columns matching user request + Application ID for system
+    HEADERS = [
+        'Application ID', 'No',
+        'TikTok Name', 'Link TikTok', 'Follower',
+        'Brand Approved',
+        'Rate Card', 'Condition',
+        'Action (APPROVE/REJECT)', 'Note'
+    ]
+    APPROVED_STATUSES = frozenset([
+        'APPROVED', 'WORK_IN_PROGRESS', 'SCRIPT_APPROVED',
+        'DRAFT_APPROVED', 'FINAL_APPROVED', 'COMPLETED',
+        'PAYMENT_TRANSFERRED'
+    ])
+    CHUNK_SIZE = 1000  # applications per query (and per TikTok prefetch)
+    ROWS_PER_WRITE = 500  # CSV rows joined into one response chunk
+
     def clean_text(self, text):
         if not text:
             return ""
@@ -1876,77 +1779,77 @@ class AdminExportParticipantsView(APIView):
         # Remove single question marks at start or end
         text = text.strip('?')
         return text.strip()
-    
-    def get(self, request, uuid):
-        import csv
-        from django.http import HttpResponse
+
+    @staticmethod
+    def get_queryset(uuid):
+        from django.db.models import Prefetch
         from apps.influencers.models import SocialPlatformAccount
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="campaign_{uuid}_participants.csv"'
-        response.write(u'\ufeff'.encode('utf8')) # BOM for Excel
-        
-        writer = csv.writer(response)
-        # Columns matching user request + Application ID for system
-        headers = [
-            'Application ID', 'No', 
-            'TikTok Name', 'Link TikTok', 'Follower', 
-            'Brand Approved', 
-            'Rate Card', 'Condition', 
-            'Action (APPROVE/REJECT)', 'Note'
-        ]
-        writer.writerow(headers)
-        
+
         import uuid as uuid_lib
         try:
             # Try UUID first
-            uuid_obj = uuid_lib.UUID(str(uuid))
+            uuid_lib.UUID(str(uuid))
             queryset = CampaignApplication.objects.filter(campaign__uuid=uuid)
-        except (ValueError):
-             # Fallback to ID
+        except ValueError:
+            # Fallback to ID
             queryset = CampaignApplication.objects.filter(campaign_id=uuid)
-            
-        apps = queryset.select_related('user', 'user__profile')
-        
-        count = 1
-        for app in apps:
-            # Get TikTok data
-            tiktok = SocialPlatformAccount.objects.filter(user=app.user, platform='tiktok').first()
-            
-            tiktok_name = self.clean_text(tiktok.username if tiktok else (app.user.display_name or '-'))
-            tiktok_link = tiktok.profile_url if tiktok else '-'
-            follower = tiktok.followers_count if tiktok else 0
-            
-            # Brand Approved Logic (If user is approved or working)
-            is_approved = app.status in ['APPROVED', 'WORK_IN_PROGRESS', 'SCRIPT_APPROVED', 
-                                       'DRAFT_APPROVED', 'FINAL_APPROVED', 'COMPLETED', 
-                                       'PAYMENT_TRANSFERRED']
-            brand_approved = 'Yes' if is_approved else ''
-            
-            # Rate Card info (if visible in profile)
-            rate_info = []
-            if hasattr(app.user, 'profile'):
-                p = app.user.profile
-                if p.allow_boost and p.boost_price:
-                    rate_info.append(f"Boost: {p.boost_price}")
-                if p.allow_original_file and p.original_file_price:
-                    rate_info.append(f"Original: {p.original_file_price}")
-            rate_str = ", ".join(rate_info)
-            
-            writer.writerow([
-                app.id,
-                count,
-                tiktok_name,
-                tiktok_link,
-                follower,
-                brand_approved,
-                rate_str, # Rate Card
-                '', # Condition
-                '', # Action
-                ''  # Note
-            ])
-            count += 1
-            
+
+        return queryset.select_related('user', 'user__profile').prefetch_related(
+            Prefetch(
+                'user__social_accounts',
+                queryset=SocialPlatformAccount.objects.filter(platform='tiktok'),
+                to_attr='tiktok_accounts',
+            )
+        ).order_by('-applied_at', 'id')
+
+    def build_row(self, app, number):
+        user = app.user
+        tiktok = user.tiktok_accounts[0] if user.tiktok_accounts else None
+
+        # Rate Card info (if visible in profile)
+        rate_info = []
+        if hasattr(user, 'profile'):
+            p = user.profile
+            if p.allow_boost and p.boost_price:
+                rate_info.append(f"Boost: {p.boost_price}")
+            if p.allow_original_file and p.original_file_price:
+                rate_info.append(f"Original: {p.original_file_price}")
+
+        return [
+            app.id,
+            number,
+            self.clean_text(tiktok.username if tiktok else (user.display_name or '-')),
+            tiktok.profile_url if tiktok else '-',
+            tiktok.followers_count if tiktok else 0,
+            # Brand Approved (user is approved or working)
+            'Yes' if app.status in self.APPROVED_STATUSES else '',
+            ", ".join(rate_info),  # Rate Card
+            '',  # Condition
+            '',  # Action
+            ''   # Note
+        ]
+
+    def export_rows(self, queryset):
+        """Yield the CSV (BOM first, for Excel) in chunks of ROWS_PER_WRITE rows."""
+        import csv
+
+        writer = csv.writer(_CSVEcho())
+        lines = ['\ufeff', writer.writerow(self.HEADERS)]
+        for number, app in enumerate(queryset.iterator(chunk_size=self.CHUNK_SIZE), start=1):
+            lines.append(writer.writerow(self.build_row(app, number)))
+            if len(lines) >= self.ROWS_PER_WRITE:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+    def get(self, request, uuid):
+        from django.http import StreamingHttpResponse
+
+        response = StreamingHttpResponse(
+            self.export_rows(self.get_queryset(uuid)), content_type='text/csv; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'attachment; filename="campaign_{uuid}_participants.csv"'
         return response
 
 
@@ -2017,6 +1920,67 @@ class AdminImportParticipantsView(APIView):
             return Response({'error': str(e)}, status=400)
 
 
+class AdminCampaignParticipantsView(AdminCampaignParticipantsMixin, ListAPIView):
+    """
+    Participants of a campaign, newest applications first, keyset paginated.
+    
+    Query params:
+    - status: one or more statuses, comma-separated
+    - stage: timeline stage (brief, script, draft, final, insight, payment)
+    - search: display name or Thai full name contains
+    - fields: 'summary' (default, no submission/insight JSON), 'full', or a
+      comma-separated list of field names
+    The heavy JSON of one participant is at .../participants/<id>/.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = CampaignParticipantSerializer
+    pagination_class = ParticipantPagination
+    
+    def list(self, request, *args, **kwargs):
+        try:
+            self.campaign = self.get_campaign(kwargs['uuid'])
+        except Campaign.DoesNotExist:
+            return Response({'error': 'not_found'}, status=404)
+        return super().list(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        queryset = self.get_participants(self.campaign)
+        params = self.request.query_params
+        
+        statuses = [value.strip() for value in params.get('status', '').split(',') if value.strip()]
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+        stage = params.get('stage')
+        if stage:
+            queryset = queryset.filter(status__in=CampaignApplication.statuses_for_stage(stage))
+        search = params.get('search', '').strip()
+        if search:
+            queryset = queryset.filter(
+                Q(user__display_name__icontains=search) | Q(user__profile__full_name_th__icontains=search)
+            )
+        return queryset.order_by('-applied_at', 'id')
+    
+    def get_serializer(self, *args, **kwargs):
+        kwargs['fields'] = self.request.query_params.get('fields', 'summary')
+        return super().get_serializer(*args, **kwargs)
+
+
+class AdminCampaignParticipantDetailView(AdminCampaignParticipantsMixin, APIView):
+    """One participant with everything, including submissions and insight JSON."""
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request, uuid, pk):
+        try:
+            campaign = self.get_campaign(uuid)
+        except Campaign.DoesNotExist:
+            return Response({'error': 'not_found'}, status=404)
+        application = self.get_participants(campaign).filter(pk=pk).first()
+        if application is None:
+            return Response({'error': 'not_found'}, status=404)
+        fields = request.query_params.get('fields', 'full')
+        return Response(CampaignParticipantSerializer(application, fields=fields).data)
+
+
 class AdminCampaignShareLinkView(APIView):
     """
     Generate or retrieve a shareable link for clients (brands).
@@ -2054,6 +2018,68 @@ class AdminCampaignShareLinkView(APIView):
             return Response({'error': 'not_found'}, status=404)
 
 
+class AdminCampaignDriveLinksView(AdminCampaignParticipantsMixin, APIView):
+    """
+    Re-check the latest script/draft/final link of every application in a
+    campaign and report which ones are no longer publicly accessible.
+    Links are checked concurrently; pass ?refresh=1 to skip cached results.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    
+    STAGES = ('script', 'draft', 'final')
+    
+    def get(self, request, uuid):
+        try:
+            campaign = self.get_campaign(uuid)
+        except Campaign.DoesNotExist:
+            return Response({'error': 'not_found'}, status=404)
+        
+        applications = (
+            CampaignApplication.objects.filter(campaign=campaign)
+            .select_related('user')
+            .only('id', 'status', 'submission_data', 'user__id', 'user__display_name')
+            .order_by('id')
+        )
+        rows = []
+        for app in applications:
+            submission_data = app.submission_data or {}
+            for stage in self.STAGES:
+                data = submission_data.get(stage)
+                if not data:
+                    continue
+                link = (data[-1].get('link') if isinstance(data, list) else data.get('link')) or ''
+                if link:
+                    rows.append({
+                        'application_id': app.id,
+                        'user_id': app.user.id,
+                        'display_name': app.user.display_name,
+                        'status': app.status,
+                        'stage': stage,
+                        'link': link,
+                    })
+        
+        started = time.monotonic()
+        results = GoogleDriveValidator.validate_many(
+            [row['link'] for row in rows], use_cache=request.query_params.get('refresh') != '1'
+        )
+        for row, result in zip(rows, results):
+            row.update({
+                'is_google_drive': result.get('is_google_drive'),
+                'accessible': result.get('accessible'),
+                'message': result.get('message'),
+                'cached': result.get('cached', False),
+            })
+        
+        return Response({
+            'campaign_id': campaign.id,
+            'checked': len(rows),
+            'inaccessible': sum(1 for row in rows if row['accessible'] is False),
+            'unknown': sum(1 for row in rows if row['accessible'] is None),
+            'elapsed_ms': round((time.monotonic() - started) * 1000),
+            'links': rows,
+        })
+
+
 class SharedCampaignView(APIView):
     """
     Public endpoint for clients/brands to view campaign progress.
@@ -2061,12 +2087,35 @@ class SharedCampaignView(APIView):
     """
     permission_classes = [AllowAny]
     
+    # Brands keep the link open and refresh constantly; always revalidate,
+    # and keep participant data out of shared caches
+    CACHE_CONTROL = 'private, no-cache'
+    
+    def get_etag(self, request, campaign):
+        """Fingerprint of everything the page renders, from one aggregate query."""
+        tiktok = Q(user__social_accounts__platform='tiktok')
+        version = CampaignApplication.objects.filter(campaign=campaign).aggregate(
+            count=Count('id', distinct=True),
+            applications=Max('updated_at'),
+            users=Max('user__updated_at'),
+            tiktok_count=Count('user__social_accounts', filter=tiktok, distinct=True),
+            tiktok_synced=Max('user__social_accounts__last_synced_at', filter=tiktok),
+        )
+        return make_etag(
+            'shared-campaign', campaign.pk, campaign.updated_at, sorted(version.items()),
+            request.query_params.get('slips', '0'), request.get_host()
+        )
+    
     def get(self, request, token):
         try:
             campaign = Campaign.objects.get(share_token=token)
         except Campaign.DoesNotExist:
             return Response({'error': 'not_found', 'message': 'Campaign not found or link expired'}, status=404)
         
+        etag = self.get_etag(request, campaign)
+        if etag_matches(request, etag):
+            return not_modified(etag, self.CACHE_CONTROL)
+        
         # Get all applications with user info
         applications = CampaignApplication.objects.filter(campaign=campaign).select_related('user', 'user__profile')
         
@@ -2124,7 +2173,7 @@ class SharedCampaignView(APIView):
             participants.append({
                 'id': app.id,
                 'display_name': display_name,
-                'picture_url': app.user.picture_url,
+                'picture_url': app.user.avatar_url('small'),
                 'status': app.status,
                 'current_stage': app.current_stage,
                 'tiktok': {
@@ -2156,7 +2205,7 @@ class SharedCampaignView(APIView):
             'waiting': len([p for p in participants if p['status'] == 'WAITING']),
         }
         
-        return Response({
+        response = Response({
             'campaign': {
                 'id': campaign.id,
                 'title': campaign.title,
@@ -2170,12 +2219,14 @@ class SharedCampaignView(APIView):
             'stats': stats,
             'participants': participants
         })
+        return with_cache_headers(response, etag, self.CACHE_CONTROL)
 
 
 class SharedCampaignExportView(APIView):
     """
     Excel export endpoint for public shared campaign.
-    Same data as SharedCampaignView.
+    Same data as SharedCampaignView. The finished file is cached per campaign
+    until the campaign or one of its applications changes (SharedCampaignReport).
     """
     permission_classes = [AllowAny]
 
@@ -2185,132 +2236,12 @@ class SharedCampaignExportView(APIView):
         except Campaign.DoesNotExist:
             return Response({'error': 'not_found', 'message': 'Campaign not found'}, status=404)
 
-        import openpyxl
-        from openpyxl.styles import Font, Alignment, PatternFill
         from django.http import HttpResponse
 
-        # Create Workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Campaign Report"
-
-        # Headers
-        headers = [
-            'ID', 'Influencer', 'TikTok', 'Followers', 
-            'Status' if not campaign.show_slip_to_client else 'Payment Slip', 
-            'Script Link', 'Draft Link', 'Final Link', 
-            'Last Update'
-        ]
-
-        # Style Headers
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.value = header
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="8B5CF6", end_color="8B5CF6", fill_type="solid") # Purple
-            cell.alignment = Alignment(horizontal="center")
-            
-            # Adjust column width
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = 20
-
-        ws.column_dimensions['B'].width = 30 # Name
-        ws.column_dimensions['F'].width = 40 # Script
-        ws.column_dimensions['G'].width = 40 # Draft
-        ws.column_dimensions['H'].width = 40 # Final
-
-        # Data Rows
-        applications = CampaignApplication.objects.filter(campaign=campaign).select_related('user')
-        
-        for row_num, app in enumerate(applications, 2):
-            tiktok = app.user.social_accounts.filter(platform='tiktok').first()
-            display_name = app.user.display_name or ''
-            import re
-            display_name = re.sub(r'\?{2,}', '', display_name).strip('?').strip()
-
-            # Links
-            submission_data = app.submission_data or {}
-            script_link = ''
-            if 'script' in submission_data and submission_data['script']:
-                data = submission_data['script']
-                script_link = (data[-1].get('link') if isinstance(data, list) else data.get('link')) or ''
-
-            draft_link = ''
-            if 'draft' in submission_data and submission_data['draft']:
-                data = submission_data['draft']
-                draft_link = (data[-1].get('link') if isinstance(data, list) else data.get('link')) or ''
-
-            final_link = ''
-            if 'final' in submission_data and submission_data['final']:
-                data = submission_data['final']
-                final_link = (data[-1].get('link') if isinstance(data, list) else data.get('link')) or ''
-
-            # Status or Slip
-            status_col_value = app.status
-            if campaign.show_slip_to_client:
-                 # Logic for Slip: Content is empty (placeholder), Image is added separately
-                 status_col_value = ''
-
-            # Base Row
-            row = [
-                app.id,
-                display_name,
-                tiktok.username if tiktok else '-',
-                tiktok.followers_count if tiktok else 0,
-                status_col_value,
-                script_link,
-                draft_link,
-                final_link,
-                app.updated_at.strftime('%Y-%m-%d %H:%M')
-            ]
-
-            # Write Row
-            for col_num, value in enumerate(row, 1):
-                cell = ws.cell(row=row_num, column=col_num)
-                cell.value = value
-                cell.alignment = Alignment(vertical="center")
-
-            # Handle Image Embedding for Column 5 (Payment Slip)
-            if campaign.show_slip_to_client and app.payment_slip:
-                try:
-                    from openpyxl.drawing.image import Image as XLImage
-                    from io import BytesIO
-                    import requests
-
-                    # Get image URL and download
-                    img_url = request.build_absolute_uri(app.payment_slip.url)
-                    res = requests.get(img_url, timeout=5)
-                    
-                    if res.status_code == 200:
-                        img_data = BytesIO(res.content)
-                        img = XLImage(img_data)
-                        
-                        # Resize image (Height 80px approx ~ 60pt)
-                        # Keep aspect ratio
-                        ratio = img.width / img.height
-                        new_height = 80
-                        new_width = int(new_height * ratio)
-                        
-                        img.height = new_height
-                        img.width = new_width
-                        
-                        # Anchor to cell (Column 5 is 'E')
-                        img.anchor = f'E{row_num}'
-                        ws.add_image(img)
-                        
-                        # Adjust row height to fit image
-                        ws.row_dimensions[row_num].height = 65 
-                except Exception as e:
-                    print(f"Error embedding image for app {app.id}: {e}")
-                    # Fallback to URL if image fails? Or just ignore as per 'blank' rule
-                    # ws.cell(row=row_num, column=5).value = "Error loading image"
-                    pass
-
-        # Response
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        content, cached = SharedCampaignReport.get(campaign)
+        response = HttpResponse(content, content_type=SharedCampaignReport.CONTENT_TYPE)
         response['Content-Disposition'] = f'attachment; filename=Campaign_Report_{campaign.id}.xlsx'
-        
-        # Save invalidates the file pointer if we use BytesIO directly usually, but here we write to response
-        wb.save(response)
+        response['X-Report-Cache'] = 'hit' if cached else 'miss'
         return response
 
 
@@ -2398,6 +2329,10 @@ class BulkApplicationActionView(APIView):
 class GenerateFollowUpView(APIView):
     """
     Generate bulk follow-up messages using Gemini.
+    Expects: { "users": [{"id", "name", "status", "due_date"}], "campaign_title", "campaign_id"?, "regenerate"? }
+    
+    All users are written in a few batched prompts; results are cached per
+    (campaign, status, deadline, name) unless `regenerate` is true.
     """
     permission_classes = [permissions.IsAdminUser]
 
@@ -2407,28 +2342,27 @@ class GenerateFollowUpView(APIView):
             
             users = request.data.get('users', [])
             campaign_title = request.data.get('campaign_title')
+            regenerate = str(request.data.get('regenerate', '')).lower() in ('1', 'true')
             
-            results = []
-            for user_data in users:
-                uid = user_data.get('id')
-                name = user_data.get('name')
-                status = user_data.get('status')
-                due_date = user_data.get('due_date')
-                
-                message = GeminiService.generate_follow_up_message(
-                    influencer_name=name,
-                    campaign_title=campaign_title,
-                    status=status,
-                    deadline=due_date
-                )
-                
-                results.append({
-                    'id': uid,
-                    'name': name,
-                    'status': status,
+            messages = GeminiService.generate_follow_up_messages(
+                campaign_title,
+                [
+                    {'name': user_data.get('name'), 'status': user_data.get('status'), 'deadline': user_data.get('due_date')}
+                    for user_data in users
+                ],
+                campaign_key=request.data.get('campaign_id') or campaign_title,
+                use_cache=not regenerate,
+            )
+            
+            results = [
+                {
+                    'id': user_data.get('id'),
+                    'name': user_data.get('name'),
+                    'status': user_data.get('status'),
                     'message': message
-                })
-                
+                }
+                for user_data, message in zip(users, messages)
+            ]
             return Response({'results': results})
         except Exception as e:
             return Response({'error': str(e), 'traceback': 'Error in GenerateFollowUpView'}, status=500)
@@ -2437,55 +2371,59 @@ class GenerateFollowUpView(APIView):
 class BulkSendMessageView(APIView):
     """
     Send bulk messages via LINE.
+    Expects: { "messages": [{"id": <application id or user id>, "name": "...", "message": "..."}] }
+    
+    Recipients are resolved in one query. Identical texts go out as
+    multicast calls and the rest as concurrent pushes (LineBulkDeliveryService).
     """
     permission_classes = [permissions.IsAdminUser]
 
     def post(self, request):
-        from apps.users.services import LineMessagingService
-        from apps.users.models import User
+        from apps.users.services import LineBulkDeliveryService
         
         messages_data = request.data.get('messages', [])
-        results = []
-        sent_count = 0
-        failed_count = 0
-        
         for item in messages_data:
-            passed_id = item.get('id')
-            message = item.get('message')
-            user_name = item.get('name', 'Unknown')
-            
             try:
-                # The ID passed from AdminCampaignProject list is the CampaignApplication.id
-                # Attempt to get user via application first
-                app = CampaignApplication.objects.filter(id=passed_id).select_related('user').first()
-                if app:
-                    user = app.user
-                else:
-                    # Fallback to direct User ID if application not found
-                    user = User.objects.get(id=passed_id)
-
-                if user.line_user_id:
-                    res = LineMessagingService.send_text_message(user.line_user_id, message)
-                    if res.get('success'):
-                        sent_count += 1
-                        results.append({'id': user_id, 'name': user_name, 'status': 'sent'})
-                    else:
-                        failed_count += 1
-                        results.append({'id': user_id, 'name': user_name, 'status': 'failed', 'error': res.get('error', 'LINE API Error')})
-                else:
-                    failed_count += 1
-                    results.append({'id': user_id, 'name': user_name, 'status': 'failed', 'error': 'No LINE ID'})
-            except User.DoesNotExist:
-                failed_count += 1
-                results.append({'id': user_id, 'name': user_name, 'status': 'failed', 'error': 'User not found'})
-            except Exception as e:
-                failed_count += 1
-                results.append({'id': user_id, 'name': user_name, 'status': 'failed', 'error': str(e)})
-                
+                item['id'] = int(item.get('id'))
+            except (TypeError, ValueError):
+                item['id'] = None
+        
+        # The ID passed from AdminCampaignProject list is the CampaignApplication.id;
+        # fall back to a direct User ID when no application matches
+        passed_ids = {item['id'] for item in messages_data if item['id'] is not None}
+        line_ids = dict(
+            CampaignApplication.objects.filter(id__in=passed_ids).values_list('id', 'user__line_user_id')
+        )
+        missing = passed_ids - set(line_ids)
+        if missing:
+            user_line_ids = dict(User.objects.filter(id__in=missing).values_list('id', 'line_user_id'))
+            line_ids.update(user_line_ids)
+        
+        results = []
+        recipients = []
+        for index, item in enumerate(messages_data):
+            passed_id = item['id']
+            entry = {'id': passed_id, 'name': item.get('name', 'Unknown')}
+            results.append(entry)
+            
+            if passed_id not in line_ids:
+                entry.update(status='failed', error='User not found')
+            elif not line_ids[passed_id]:
+                entry.update(status='failed', error='No LINE ID')
+            elif not item.get('message'):
+                entry.update(status='failed', error='Empty message')
+            else:
+                recipients.append((index, line_ids[passed_id], [{'type': 'text', 'text': item['message']}]))
+        
+        delivered = LineBulkDeliveryService.deliver(recipients)
+        for index, outcome in delivered.items():
+            results[index].update(outcome)
+        
+        sent_count = sum(1 for entry in results if entry['status'] == 'sent')
         return Response({
             'success': True,
             'sent': sent_count,
-            'failed': failed_count,
+            'failed': len(results) - sent_count,
             'details': results
         })
 
@@ -2550,8 +2488,10 @@ class SocialInfoFetchView(APIView):
     """
     Helper endpoint to fetch social media profile info (e.g. YouTube channel)
     without saving it to the database. Used during registration.
+    Open to anonymous callers, so throttled per client IP and per user.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SocialFetchIPThrottle, SocialFetchUserThrottle]
 
     def get(self, request):
         platform = request.query_params.get('platform')
@@ -2564,8 +2504,10 @@ class SocialInfoFetchView(APIView):
             )
 
         try:
-            # 1. Fetch Profile Data
-            result = SocialPlatformService.fetch_profile(platform, url)
+            # 1. Fetch Profile Data (queued if the platform was fetched too recently)
+            result, job = SocialPlatformService.request(platform, url, client_ip=client_ip(request))
+            if job:
+                return queued_fetch_response(request, job)
             
             if result.get('success'):
                 return Response(result)
@@ -2575,9 +2517,42 @@ class SocialInfoFetchView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
+        except SocialFetchLimitError as e:
+            return fetch_limit_response(e)
         except Exception as e:
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+
+
+class AdminMetricsView(APIView):
+    """
+    Runtime counters for the admin dashboard.
+    Pass ?reset=1 to clear the cache, Gemini, HTTP, image proxy and report counters after reading.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        from apps.users.services import LineOutboxService
+        from apps.core.tasks import TaskQueue
+        
+        data = {
+            'feed_cache': FeedCache.stats(),
+            'line_outbox': LineOutboxService.stats(),
+            'task_queue': TaskQueue.stats(),
+            'gemini': GeminiService.stats(),
+            'social_profile_cache': SocialProfileCache.stats(),
+            'http': http.stats(),
+            'image_proxy': ImageProxyCache.stats(),
+            'shared_report': SharedCampaignReport.stats(),
+        }
+        if request.query_params.get('reset') == '1':
+            FeedCache.reset_stats()
+            GeminiService.reset_stats()
+            SocialProfileCache.reset_stats()
+            http.reset_stats()
+            ImageProxyCache.reset_stats()
+            SharedCampaignReport.reset_stats()
+        return Response(data)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_logs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adminlog',
+            index=models.Index(fields=['-created_at', 'id'], name='adminlog_created_keyset_idx'),
+        ),
+    ]
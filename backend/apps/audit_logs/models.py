@@ -38,6 +38,10 @@ class AdminLog(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the activity log
+            models.Index(fields=['-created_at', 'id'], name='adminlog_created_keyset_idx'),
+        ]
         verbose_name = _('Admin Activity Log')
         verbose_name_plural = _('Admin Activity Logs')
 
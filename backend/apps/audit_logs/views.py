@@ -1,6 +1,7 @@
 from rest_framework import viewsets, permissions, filters
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.api.pagination import KeysetPagination
 from .models import AdminLog
 from .serializers import AdminLogSerializer
 
@@ -9,6 +10,11 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+class AdminLogPagination(KeysetPagination):
+    """Keyset over (-created_at, id); `?page=` requests fall back to page numbers."""
+    page_size = 20
+    fallback_class = StandardResultsSetPagination
+
 class IsSuperUser(permissions.BasePermission):
     """
     Allows access only to superusers.
@@ -21,10 +27,10 @@ class AdminLogViewSet(viewsets.ReadOnlyModelViewSet):
     Read-only viewset for Admin Activity Logs.
     Only accessible by superadmins.
     """
-    queryset = AdminLog.objects.all()
+    queryset = AdminLog.objects.select_related('actor').order_by('-created_at', 'id')
     serializer_class = AdminLogSerializer
     permission_classes = [IsSuperUser]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = AdminLogPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
     filterset_fields = ['action_type', 'target_model']
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Campaign, CampaignApplication, CampaignInsightMetric
+from .models import Campaign, CampaignApplication, CampaignInsightMetric, InsightAnalysisJob
+from .services import InsightAnalysisService
 
 
 @admin.register(Campaign)
@@ -14,7 +15,7 @@ class CampaignAdmin(admin.ModelAdmin):
     list_filter = ['status', 'created_at', 'application_deadline']
     search_fields = ['title', 'brand_name', 'description']
     list_editable = ['status']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at', 'next_transition_at']
     date_hierarchy = 'application_deadline'
     
     fieldsets = (
@@ -29,6 +30,7 @@ class CampaignAdmin(admin.ModelAdmin):
         }),
         ('กำหนดการ', {
             'fields': (
+                'publish_at',
                 'application_deadline', 
                 'script_deadline', 
                 'draft_deadline', 
@@ -42,7 +44,7 @@ class CampaignAdmin(admin.ModelAdmin):
             # 'classes': ('collapse',)  <-- Removed to make it visible by default
         }),
         ('เวลาที่บันทึก', {
-            'fields': ('created_at', 'updated_at'),
+            'fields': ('created_at', 'updated_at', 'next_transition_at'),
             'classes': ('collapse',)
         }),
     )
@@ -62,7 +64,7 @@ class CampaignApplicationAdmin(admin.ModelAdmin):
         'campaign__title', 'campaign__brand_name'
     ]
     list_editable = ['status']
-    readonly_fields = ['applied_at', 'updated_at', 'formatted_insight_data', 'submission_data_readonly', 'formatted_insight_files_preview']
+    readonly_fields = ['applied_at', 'updated_at', 'formatted_insight_data', 'submission_data_readonly', 'formatted_insight_files_preview', 'payment_slip_thumbnail']
     exclude = ['submission_data', 'insight_data']
     raw_id_fields = ['user', 'campaign']
     
@@ -124,7 +126,7 @@ class CampaignApplicationAdmin(admin.ModelAdmin):
             'fields': ('user', 'campaign', 'status', 'application_note')
         }),
         ('การชำระเงิน', {
-            'fields': ('payment_slip',),
+            'fields': ('payment_slip', 'payment_slip_thumbnail'),
             'description': 'อัปโหลดสลิปหลังจากโอนเงินให้ Influencer แล้ว'
         }),
         ('งานที่ส่ง', {
@@ -199,143 +201,115 @@ class CampaignApplicationAdmin(admin.ModelAdmin):
     
     @admin.action(description='อนุมัติใบสมัครที่เลือก')
     def approve_applications(self, request, queryset):
-        from apps.users.services import LineMessagingService
-        
         applications = queryset.filter(status='WAITING')
         success_count = 0
         notify_count = 0
         
         for app in applications:
-            old_status = app.status
             app.status = 'APPROVED'
             app.save()
             success_count += 1
-            
-            result = LineMessagingService.send_campaign_status_notification(app, old_status, 'APPROVED')
-            if result.get('success'):
+            # save() queues the LINE notification in the outbox
+            if app.notification_queued:
                 notify_count += 1
         
-        self.message_user(request, f'✅ อนุมัติ {success_count} ใบสมัคร และส่งแจ้งเตือน LINE {notify_count} รายการ')
+        self.message_user(request, f'✅ อนุมัติ {success_count} ใบสมัคร และเข้าคิวแจ้งเตือน LINE {notify_count} รายการ')
     
     @admin.action(description='ปฏิเสธใบสมัครที่เลือก')
     def reject_applications(self, request, queryset):
-        from apps.users.services import LineMessagingService
-        
         applications = queryset.filter(status='WAITING')
         success_count = 0
         notify_count = 0
         
         for app in applications:
-            old_status = app.status
             app.status = 'REJECTED'
             app.save()
             success_count += 1
-            
-            result = LineMessagingService.send_campaign_status_notification(app, old_status, 'REJECTED')
-            if result.get('success'):
+            # save() queues the LINE notification in the outbox
+            if app.notification_queued:
                 notify_count += 1
         
-        self.message_user(request, f'❌ ปฏิเสธ {success_count} ใบสมัคร และส่งแจ้งเตือน LINE {notify_count} รายการ')
+        self.message_user(request, f'❌ ปฏิเสธ {success_count} ใบสมัคร และเข้าคิวแจ้งเตือน LINE {notify_count} รายการ')
     
     @admin.action(description='อนุมัติสคริปต์ที่เลือก')
     def approve_script(self, request, queryset):
-        from apps.users.services import LineMessagingService
-        
         applications = queryset.filter(status='SUBMITTED_SCRIPT')
         success_count = 0
         notify_count = 0
         
         for app in applications:
-            old_status = app.status
             app.status = 'SCRIPT_APPROVED'
             app.save()
             success_count += 1
-            
-            result = LineMessagingService.send_campaign_status_notification(app, old_status, 'SCRIPT_APPROVED')
-            if result.get('success'):
+            # save() queues the LINE notification in the outbox
+            if app.notification_queued:
                 notify_count += 1
         
-        self.message_user(request, f'✅ อนุมัติสคริปต์ {success_count} รายการ และส่งแจ้งเตือน LINE {notify_count} รายการ')
+        self.message_user(request, f'✅ อนุมัติสคริปต์ {success_count} รายการ และเข้าคิวแจ้งเตือน LINE {notify_count} รายการ')
     
     @admin.action(description='อนุมัติดราฟท์ที่เลือก')
     def approve_draft(self, request, queryset):
-        from apps.users.services import LineMessagingService
-        
         applications = queryset.filter(status='SUBMITTED_DRAFT')
         success_count = 0
         notify_count = 0
         
         for app in applications:
-            old_status = app.status
             app.status = 'DRAFT_APPROVED'
             app.save()
             success_count += 1
-            
-            result = LineMessagingService.send_campaign_status_notification(app, old_status, 'DRAFT_APPROVED')
-            if result.get('success'):
+            # save() queues the LINE notification in the outbox
+            if app.notification_queued:
                 notify_count += 1
         
-        self.message_user(request, f'✅ อนุมัติดราฟท์ {success_count} รายการ และส่งแจ้งเตือน LINE {notify_count} รายการ')
+        self.message_user(request, f'✅ อนุมัติดราฟท์ {success_count} รายการ และเข้าคิวแจ้งเตือน LINE {notify_count} รายการ')
 
     @admin.action(description='อนุมัติวิดีโอ (รอ Insight)')
     def approve_final_video(self, request, queryset):
-        from apps.users.services import LineMessagingService
-        
         applications = queryset.filter(status='SUBMITTED_FINAL')
         success_count = 0
         notify_count = 0
         
         for app in applications:
-            old_status = app.status
             app.status = 'FINAL_APPROVED'
             app.save()
             success_count += 1
-            
-            result = LineMessagingService.send_campaign_status_notification(app, old_status, 'FINAL_APPROVED')
-            if result.get('success'):
+            # save() queues the LINE notification in the outbox
+            if app.notification_queued:
                 notify_count += 1
         
         self.message_user(request, f'✅ อนุมัติวิดีโอ {success_count} รายการ (รอ Insight)')
     
     @admin.action(description='✓ อนุมัติ Insight (งานเสร็จสมบูรณ์)')
     def approve_insight(self, request, queryset):
-        from apps.users.services import LineMessagingService
-        
         applications = queryset.filter(status='SUBMITTED_INSIGHT')
         success_count = 0
         notify_count = 0
         
         for app in applications:
-            old_status = app.status
             app.status = 'COMPLETED'
             app.save()
             success_count += 1
-            
-            result = LineMessagingService.send_campaign_status_notification(app, old_status, 'COMPLETED')
-            if result.get('success'):
+            # save() queues the LINE notification in the outbox
+            if app.notification_queued:
                 notify_count += 1
         
         self.message_user(request, f'🎊 อนุมัติ Insight {success_count} รายการ (รอจ่ายเงิน)')
     
     @admin.action(description='💰 โอนเงินแล้ว')
     def mark_payment_transferred(self, request, queryset):
-        from apps.users.services import LineMessagingService
-        
         applications = queryset.filter(status='COMPLETED')
         success_count = 0
         notify_count = 0
         
         for app in applications:
-            old_status = app.status
             app.status = 'PAYMENT_TRANSFERRED'
             app.save()
             success_count += 1
-            
-            result = LineMessagingService.send_campaign_status_notification(app, old_status, 'PAYMENT_TRANSFERRED')
-            if result.get('success'):
+            # save() queues the LINE notification in the outbox
+            if app.notification_queued:
                 notify_count += 1
         
-        self.message_user(request, f'💰 โอนเงิน {success_count} รายการ และส่งแจ้งเตือน LINE {notify_count} รายการ')
+        self.message_user(request, f'💰 โอนเงิน {success_count} รายการ และเข้าคิวแจ้งเตือน LINE {notify_count} รายการ')
 
 
 @admin.register(CampaignInsightMetric)
@@ -369,3 +343,25 @@ class CampaignInsightMetricAdmin(admin.ModelAdmin):
             'fields': ('updated_at',)
         })
     )
+
+
+@admin.register(InsightAnalysisJob)
+class InsightAnalysisJobAdmin(admin.ModelAdmin):
+    """Background AI analysis of insight submissions."""
+    list_display = ['id', 'application', 'status', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['application__user__display_name', 'application__campaign__title']
+    readonly_fields = [
+        'application', 'status', 'image_paths', 'attempts',
+        'error', 'created_at', 'started_at', 'finished_at'
+    ]
+    list_select_related = ['application__user', 'application__campaign']
+    actions = ['retry_jobs']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.action(description='วิเคราะห์อีกครั้ง')
+    def retry_jobs(self, request, queryset):
+        count = InsightAnalysisService.retry(queryset)
+        self.message_user(request, f'เข้าคิววิเคราะห์ใหม่ {count} รายการ (run_tasks)')
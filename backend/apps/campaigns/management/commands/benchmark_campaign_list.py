@@ -0,0 +1,137 @@
+import contextlib
+import io
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.api.services.feed_cache import FeedCache
+from apps.campaigns.models import Campaign, CampaignApplication
+from apps.users.models import User
+
+
+class _Rollback(Exception):
+    """Raised to discard the benchmark data."""
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the query count of GET /api/v1/campaigns/. '
+        'Compares the legacy read path (status sweep on every request) with the current one '
+        '(feed cache cold and warm) and fails if the current endpoint exceeds its query budget at any page size. '
+        'All benchmark data is rolled back.'
+    )
+
+    # Keyset pagination: one page query, no COUNT. Must not grow with page size,
+    # page depth or user history.
+    QUERY_BUDGET = 1
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campaigns', type=int, default=50, help='Campaigns to create (default: 50)')
+        parser.add_argument('--applications', type=int, default=20, help='Campaigns the user has applied to (default: 20)')
+        parser.add_argument('--overdue', type=int, default=5, help='OPEN campaigns already past their deadline (default: 5)')
+        parser.add_argument('--page-sizes', default='5,10,50,100', help='Comma-separated page sizes to check (default: 5,10,50,100)')
+        parser.add_argument('--max-queries', type=int, default=self.QUERY_BUDGET, help=f'Query budget per request (default: {self.QUERY_BUDGET})')
+
+    def handle(self, *args, **options):
+        page_sizes = [int(size) for size in options['page_sizes'].split(',') if size.strip()]
+        rows = []
+        try:
+            with transaction.atomic():
+                user = self.seed(options['campaigns'], options['applications'], options['overdue'])
+                self.user = user
+                client = APIClient()
+                client.force_authenticate(user)
+
+                rows.append(('legacy: first request (sweep writes)', None, self.measure(client, legacy=True)))
+                rows.append(('legacy: steady state', None, self.measure(client, legacy=True)))
+                for page_size in page_sizes:
+                    rows.append(('current', page_size, self.measure(client, legacy=False, page_size=page_size)))
+                    rows.append(('current: cached', page_size, self.measure(client, legacy=False, page_size=page_size, cold=False)))
+                    rows.append(('current: last page', page_size, self.measure_last_page(client, page_size)))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(f"\n{'Read path':<40}{'Page size':>10}{'Queries':>10}{'Writes':>10}")
+        for label, page_size, (queries, writes) in rows:
+            self.stdout.write(f"{label:<40}{page_size or '-':>10}{queries:>10}{writes:>10}")
+
+        over_budget = [
+            (page_size, queries) for label, page_size, (queries, _) in rows
+            if label.startswith('current') and queries > options['max_queries']
+        ]
+        if over_budget:
+            details = ', '.join(f'page_size={size}: {queries}' for size, queries in over_budget)
+            raise CommandError(f"Campaign list exceeded its query budget of {options['max_queries']} ({details})")
+        self.stdout.write(self.style.SUCCESS(f"Within query budget ({options['max_queries']} per request)"))
+
+    def seed(self, campaign_count, application_count, overdue_count):
+        today = timezone.localdate()
+        user = User.objects.create_user(line_user_id='U_BENCH_CAMPAIGN_LIST', display_name='Bench', status='APPROVED')
+
+        campaigns = []
+        for i in range(campaign_count):
+            overdue = i < overdue_count
+            campaigns.append(Campaign(
+                title=f'Benchmark Campaign {i}',
+                description='Benchmark',
+                brand_name='Bench Brand',
+                budget=1000,
+                status='OPEN',
+                share_token=f'bench-campaign-list-{i}',
+                application_deadline=today - timedelta(days=2) if overdue else today + timedelta(days=7 + i),
+                content_deadline=today + timedelta(days=30),
+            ))
+        campaigns = Campaign.objects.bulk_create(campaigns)
+
+        statuses = ['WAITING', 'APPROVED', 'SUBMITTED_SCRIPT', 'COMPLETED', 'PAYMENT_TRANSFERRED', 'REJECTED']
+        CampaignApplication.objects.bulk_create([
+            CampaignApplication(campaign=campaign, user=user, status=statuses[i % len(statuses)])
+            for i, campaign in enumerate(campaigns[:application_count])
+        ])
+        return user
+
+    def measure(self, client, legacy, page_size=None, cold=True):
+        """Return (total queries, write queries) for one campaign-list request."""
+        params = {'page_size': page_size} if page_size else {}
+        if cold:
+            FeedCache.invalidate_user(self.user.pk)
+        with CaptureQueriesContext(connection) as ctx, contextlib.redirect_stdout(io.StringIO()):
+            if legacy:
+                self.legacy_status_sweep()
+            response = client.get('/api/v1/campaigns/', params)
+        assert response.status_code == 200, response.status_code
+
+        writes = sum(1 for q in ctx.captured_queries if q['sql'].lstrip().upper().startswith(('UPDATE', 'INSERT', 'DELETE')))
+        return len(ctx.captured_queries), writes
+
+    def measure_last_page(self, client, page_size):
+        """Follow `next` cursors to the last page and measure that request."""
+        response = client.get('/api/v1/campaigns/', {'page_size': page_size})
+        url = None
+        while response.data.get('next'):
+            url = response.data['next']
+            response = client.get(url)
+        if url is None:
+            return self.measure(client, legacy=False, page_size=page_size)
+
+        FeedCache.invalidate_user(self.user.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        assert response.status_code == 200, response.status_code
+        return len(ctx.captured_queries), 0
+
+    @staticmethod
+    def legacy_status_sweep():
+        """The sweep CampaignListView used to run before every list request."""
+        today = timezone.localdate()
+        to_in_progress = Campaign.objects.filter(status='OPEN', application_deadline__lt=today)
+        if to_in_progress.count() > 0:
+            to_in_progress.update(status='IN_PROGRESS', updated_at=timezone.now())
+        to_closed = Campaign.objects.filter(status='IN_PROGRESS', content_deadline__lt=today)
+        if to_closed.count() > 0:
+            to_closed.update(status='CLOSED', updated_at=timezone.now())
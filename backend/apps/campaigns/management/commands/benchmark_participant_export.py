@@ -0,0 +1,154 @@
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+
+from apps.api.views import AdminExportParticipantsView
+from apps.campaigns.models import Campaign, CampaignApplication
+from apps.influencers.models import InfluencerProfile, SocialPlatformAccount
+from apps.users.models import User
+
+
+class _Rollback(Exception):
+    """Raised to discard the benchmark data."""
+
+
+class _QueryCounter:
+    """connection.execute_wrapper that only counts (CaptureQueriesContext would keep every query)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark GET /api/v1/admin/campaigns/<uuid>/export/: time, queries and peak '
+        'Python memory of the legacy export (in-memory HttpResponse, one TikTok query per row) vs the '
+        'streamed one, per campaign size. All benchmark data is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', default='10000,100000', help='Comma-separated participant counts (default: 10000,100000)')
+        parser.add_argument('--skip-legacy', action='store_true', help='Only measure the streamed export')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['rows'].split(',') if size.strip())
+        view = AdminExportParticipantsView()
+        results = []
+        try:
+            with transaction.atomic():
+                campaign, seeded = None, 0
+                for size in sizes:
+                    self.stdout.write(f"Seeding {size} participants...")
+                    campaign = campaign or self.create_campaign()
+                    self.seed(campaign, seeded, size)
+                    seeded = size
+
+                    variants = [('streamed', lambda: self.consume(view.export_rows(view.get_queryset(campaign.uuid))))]
+                    if not options['skip_legacy']:
+                        variants.insert(0, ('legacy', lambda: len(self.legacy_export(view, campaign.uuid).content)))
+                    for label, run in variants:
+                        results.append((size, label, *self.measure(run)))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(f"\n{'Rows':>8}  {'Export':<10}{'Seconds':>10}{'Queries':>10}{'Peak MB':>10}{'CSV MB':>10}")
+        for size, label, elapsed, queries, peak, size_bytes in results:
+            self.stdout.write(
+                f"{size:>8}  {label:<10}{elapsed:>10.2f}{queries:>10}{peak / 1024 / 1024:>10.1f}{size_bytes / 1024 / 1024:>10.1f}"
+            )
+
+    @staticmethod
+    def consume(chunks):
+        """Read a streamed body the way the WSGI server would, keeping nothing."""
+        return sum(len(chunk.encode('utf-8')) for chunk in chunks)
+
+    @staticmethod
+    def measure(run):
+        """(seconds, queries, peak traced bytes, body bytes). Timed without tracemalloc, which slows allocation."""
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            size_bytes = run()
+            elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return elapsed, counter.count, peak, size_bytes
+
+    @staticmethod
+    def legacy_export(view, uuid):
+        """What AdminExportParticipantsView.get used to do."""
+        import csv
+
+        response = HttpResponse(content_type='text/csv')
+        response.write(u'\ufeff'.encode('utf8'))
+        writer = csv.writer(response)
+        writer.writerow(view.HEADERS)
+        apps = CampaignApplication.objects.filter(campaign__uuid=uuid).select_related('user', 'user__profile')
+        for count, app in enumerate(apps, start=1):
+            tiktok = SocialPlatformAccount.objects.filter(user=app.user, platform='tiktok').first()
+            app.user.tiktok_accounts = [tiktok] if tiktok else []
+            writer.writerow(view.build_row(app, count))
+        return response
+
+    @staticmethod
+    def create_campaign():
+        today = timezone.localdate()
+        return Campaign.objects.create(
+            title='Benchmark Export Campaign',
+            description='Benchmark',
+            brand_name='Bench Brand',
+            budget=1000,
+            status='OPEN',
+            share_token='bench-participant-export',
+            application_deadline=today + timedelta(days=7),
+            content_deadline=today + timedelta(days=30),
+        )
+
+    @staticmethod
+    def seed(campaign, start, stop, batch_size=5000):
+        """Participants start..stop-1: user, profile, TikTok (4 in 5) and Instagram accounts, application."""
+        statuses = ['WAITING', 'APPROVED', 'SUBMITTED_SCRIPT', 'COMPLETED', 'REJECTED']
+        for offset in range(start, stop, batch_size):
+            numbers = range(offset, min(offset + batch_size, stop))
+            users = User.objects.bulk_create([
+                User(username=f'U_BENCH_EXPORT_{i}', line_user_id=f'U_BENCH_EXPORT_{i}', display_name=f'Bench {i}')
+                for i in numbers
+            ])
+            InfluencerProfile.objects.bulk_create([
+                InfluencerProfile(
+                    user=user, full_name_th=f'Bench {i}', phone='0800000000', date_of_birth=date(1995, 1, 1),
+                    allow_boost=i % 3 == 0, boost_price=500 if i % 3 == 0 else None,
+                )
+                for i, user in zip(numbers, users)
+            ])
+            accounts = []
+            for i, user in zip(numbers, users):
+                if i % 5:
+                    accounts.append(SocialPlatformAccount(
+                        user=user, platform='tiktok', username=f'bench_tiktok_{i}',
+                        profile_url=f'https://www.tiktok.com/@bench_tiktok_{i}', followers_count=i * 10,
+                    ))
+                accounts.append(SocialPlatformAccount(
+                    user=user, platform='instagram', username=f'bench_ig_{i}',
+                    profile_url=f'https://www.instagram.com/bench_ig_{i}/',
+                ))
+            SocialPlatformAccount.objects.bulk_create(accounts)
+            CampaignApplication.objects.bulk_create([
+                CampaignApplication(campaign=campaign, user=user, status=statuses[i % len(statuses)])
+                for i, user in zip(numbers, users)
+            ])
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.campaigns.models import CampaignApplication
+from apps.core.tasks import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        'Queue thumbnail rendering for payment slips that have no thumbnail yet '
+        '(slips uploaded before thumbnails existed); `run_tasks` does the work.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=0,
+            help='Queue at most this many slips (default: all)'
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit'] or None
+
+        applications = (
+            CampaignApplication.objects.exclude(Q(payment_slip='') | Q(payment_slip__isnull=True))
+            .filter(Q(payment_slip_thumbnail='') | Q(payment_slip_thumbnail__isnull=True))
+            .values_list('id', flat=True)[:limit]
+        )
+
+        count = 0
+        for application_id in applications:
+            enqueue('campaigns.render_slip_thumbnail', application_id=application_id)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Queued {count} payment slip thumbnails"))
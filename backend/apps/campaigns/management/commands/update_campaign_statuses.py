@@ -1,11 +1,48 @@
+import time
+
 from django.core.management.base import BaseCommand
-from apps.campaigns.models import Campaign
+from django.db import close_old_connections
 from django.utils import timezone
 
+from apps.campaigns.services import CampaignStatusService
+
+
 class Command(BaseCommand):
-    help = 'Automatically update campaign statuses based on deadlines'
+    help = 'Automatically update campaign statuses based on deadlines and scheduled publishing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and apply transitions as they come due'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=60,
+            help='Maximum seconds to sleep between checks in loop mode (default: 60)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=CampaignStatusService.BATCH_SIZE,
+            help='Campaigns to transition per transaction'
+        )
 
     def handle(self, *args, **options):
+        if not options['loop']:
+            self.run_once(options['batch_size'])
+            return
+
+        self.stdout.write(f"[{timezone.now().isoformat()}] Campaign status worker started (interval {options['interval']}s)")
+        try:
+            while True:
+                close_old_connections()
+                self.run_once(options['batch_size'])
+
+                # Wake up exactly when the next transition is due (capped by --interval)
+                wait = CampaignStatusService.seconds_until_next_transition()
+                sleep_for = options['interval'] if wait is None else min(max(wait, 1), options['interval'])
+                time.sleep(sleep_for)
+        except KeyboardInterrupt:
+            self.stdout.write("Campaign status worker stopped")
+
+    def run_once(self, batch_size):
         self.stdout.write(f"[{timezone.now().isoformat()}] Starting campaign status update...")
-        count = Campaign.update_all_statuses()
+        count = CampaignStatusService.apply_due_transitions(batch_size=batch_size)
         self.stdout.write(self.style.SUCCESS(f"Successfully updated {count} campaign(s)"))
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:32
+
+from datetime import datetime, time, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_next_transition_at(apps, schema_editor):
+    """Schedule the next status transition for existing campaigns."""
+    Campaign = apps.get_model('campaigns', 'Campaign')
+
+    def start_of_day_after(day):
+        return timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+    for campaign in Campaign.objects.filter(status__in=['OPEN', 'IN_PROGRESS']).iterator():
+        deadline = campaign.application_deadline if campaign.status == 'OPEN' else campaign.content_deadline
+        Campaign.objects.filter(pk=campaign.pk).update(next_transition_at=start_of_day_after(deadline))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0022_campaignapplication_insight_note'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='next_transition_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, help_text='When the status engine should next re-evaluate this campaign', null=True, verbose_name='เปลี่ยนสถานะครั้งถัดไป'),
+        ),
+        migrations.AddField(
+            model_name='campaign',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, help_text='Scheduled time to publish a DRAFT campaign (DRAFT -> OPEN)', null=True, verbose_name='ตั้งเวลาเผยแพร่'),
+        ),
+        migrations.RunPython(backfill_next_transition_at, migrations.RunPython.noop),
+    ]
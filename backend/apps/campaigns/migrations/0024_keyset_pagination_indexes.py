@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0023_campaign_publish_at_next_transition_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['-created_at', 'id'], name='campaign_created_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaignapplication',
+            index=models.Index(fields=['user', '-applied_at', 'id'], name='application_user_keyset_idx'),
+        ),
+    ]
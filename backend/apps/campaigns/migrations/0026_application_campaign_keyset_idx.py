@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0025_insightanalysisjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaignapplication',
+            index=models.Index(fields=['campaign', '-applied_at', 'id'], name='application_campaign_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0026_application_campaign_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaignapplication',
+            name='payment_slip_thumbnail',
+            field=models.ImageField(blank=True, editable=False, help_text='Small JPEG of the payment slip, rendered in the background (embedded in reports)', null=True, upload_to='', verbose_name='ภาพย่อสลิป'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0027_payment_slip_thumbnail'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='insightanalysisjob',
+            name='insightjob_due_idx',
+        ),
+        migrations.RemoveField(
+            model_name='insightanalysisjob',
+            name='next_attempt_at',
+        ),
+    ]
@@ -7,6 +7,8 @@ from django.conf import settings
 from django.core.validators import MinValueValidator
 import uuid
 
+from apps.core.models import ChangeTrackingMixin
+
 
 def brand_logo_upload_path(instance, filename):
     """Generate upload path for brand logos."""
@@ -23,29 +25,7 @@ def payment_slip_upload_path(instance, filename):
     return f'campaigns/{instance.campaign.id}/applications/{instance.id}/payment/{filename}'
 
 
-def delete_old_file(instance, field_name):
-    """Helper to delete old file from storage when it is replaced."""
-    try:
-        if not instance.pk:
-            return
-
-        old_instance = instance.__class__.objects.filter(pk=instance.pk).first()
-        if not old_instance:
-            return
-
-        old_file = getattr(old_instance, field_name)
-        new_file = getattr(instance, field_name)
-        
-        # Check if old_file exists and is different from new_file
-        # We compare names to be safe with GCS/FileSystem variations
-        if old_file and old_file.name and old_file.name != getattr(new_file, 'name', new_file):
-            print(f"[Cleanup] Deleting old file: {old_file.name}")
-            old_file.storage.delete(old_file.name)
-    except Exception as e:
-        print(f"Error deleting old file: {e}")
-
-
-class Campaign(models.Model):
+class Campaign(ChangeTrackingMixin, models.Model):
     """
     Marketing campaign that influencers can apply to.
     """
@@ -167,6 +147,20 @@ class Campaign(models.Model):
         db_index=True,
         verbose_name="สถานะ"
     )
+    publish_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Scheduled time to publish a DRAFT campaign (DRAFT -> OPEN)",
+        verbose_name="ตั้งเวลาเผยแพร่"
+    )
+    next_transition_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="When the status engine should next re-evaluate this campaign",
+        verbose_name="เปลี่ยนสถานะครั้งถัดไป"
+    )
     
     # Requirements (Text)
     requirements = models.TextField(
@@ -195,19 +189,32 @@ class Campaign(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="สร้างเมื่อ")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="แก้ไขเมื่อ")
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the admin campaign list
+            models.Index(fields=['-created_at', 'id'], name='campaign_created_keyset_idx'),
+        ]
+
+    # Fields that affect when the next automatic status transition is due
+    TRANSITION_FIELDS = ('status', 'publish_at', 'application_deadline', 'content_deadline')
+
+    # Replaced images are removed from storage after save (ChangeTrackingMixin)
+    cleanup_file_fields = ('brand_logo', 'cover_image')
+
     def save(self, *args, **kwargs):
         # 1. Generate share token if missing
         if not self.share_token:
             import uuid as uuid_lib
             self.share_token = str(uuid_lib.uuid4())
+
+        # Keep the transition schedule in sync with status/deadlines
+        self.next_transition_at = self.compute_next_transition_at()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.TRANSITION_FIELDS):
+            kwargs['update_fields'] = list(set(update_fields) | {'next_transition_at'})
             
-        # 2. Cleanup old files on update (only if images are provided/changed)
-        if self.pk:
-            # We check if the field has been updated by comparing with DB
-            # This is handled within delete_old_file
-            delete_old_file(self, 'brand_logo')
-            delete_old_file(self, 'cover_image')
-            
+        # 2. Replaced brand_logo / cover_image files are cleaned up by
+        # ChangeTrackingMixin.save() against the loaded values (no extra SELECT)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -220,59 +227,71 @@ class Campaign(models.Model):
         """Check if campaign is accepting applications."""
         return self.status == 'OPEN'
 
-    def update_status_by_deadline(self):
+    @staticmethod
+    def _start_of_day_after(day):
+        """Aware datetime for local midnight of the day after `day`."""
+        from datetime import datetime, time, timedelta
+        from django.utils import timezone
+        return timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+    def compute_next_transition_at(self):
         """
-        Update status based on current date and deadlines.
-        Logic:
-        1. If status is OPEN and application_deadline has passed -> IN_PROGRESS
-        2. If status is IN_PROGRESS and content_deadline has passed -> CLOSED
+        Return when this campaign's status is next due to change, or None.
+        - DRAFT with publish_at -> publish_at (DRAFT -> OPEN)
+        - OPEN -> day after application_deadline (OPEN -> IN_PROGRESS)
+        - IN_PROGRESS -> day after content_deadline (IN_PROGRESS -> CLOSED)
+        """
+        if self.status == 'DRAFT':
+            return self.publish_at
+        if self.status == 'OPEN' and self.application_deadline:
+            return self._start_of_day_after(self.application_deadline)
+        if self.status == 'IN_PROGRESS' and self.content_deadline:
+            return self._start_of_day_after(self.content_deadline)
+        return None
+
+    def resolve_status(self, now=None):
+        """
+        Return the status this campaign should have at `now`.
+        Transitions chain, so an overdue OPEN campaign can go straight to CLOSED.
         """
         from django.utils import timezone
-        today = timezone.localdate()
-        
-        changed = False
-        
+        now = now or timezone.now()
+        today = timezone.localdate(now)
+        status = self.status
+
+        # ⚪ DRAFT -> OPEN (scheduled publishing)
+        if status == 'DRAFT' and self.publish_at and self.publish_at <= now:
+            status = 'OPEN'
+
         # 🟢 OPEN -> IN_PROGRESS
         # If today is AFTER application_deadline, it's now IN_PROGRESS
-        if self.status == 'OPEN' and self.application_deadline < today:
-            self.status = 'IN_PROGRESS'
-            changed = True
-            
+        if status == 'OPEN' and self.application_deadline < today:
+            status = 'IN_PROGRESS'
+
         # 🟡 IN_PROGRESS -> CLOSED
         # If today is AFTER content_deadline, it's CLOSED
-        if self.status == 'IN_PROGRESS' and self.content_deadline < today:
-            self.status = 'CLOSED'
-            changed = True
-            
-        if changed:
-            self.save(update_fields=['status', 'updated_at'])
-        
-        return changed
+        if status == 'IN_PROGRESS' and self.content_deadline < today:
+            status = 'CLOSED'
+
+        return status
+
+    def update_status_by_deadline(self):
+        """Apply any due status transition to this campaign. Returns True if changed."""
+        new_status = self.resolve_status()
+        if new_status == self.status:
+            return False
+        self.status = new_status
+        self.save(update_fields=['status', 'updated_at'])
+        return True
 
     @classmethod
     def update_all_statuses(cls):
-        """Batch update all campaigns that need transition."""
-        from django.utils import timezone
-        today = timezone.localdate()
-        
-        # 1. OPEN -> IN_PROGRESS (passed application deadline)
-        to_in_progress = cls.objects.filter(status='OPEN', application_deadline__lt=today)
-        in_progress_count = to_in_progress.count()
-        if in_progress_count > 0:
-            print(f"[CampaignAutomation] Moving {in_progress_count} campaigns from OPEN to IN_PROGRESS")
-            to_in_progress.update(status='IN_PROGRESS', updated_at=timezone.now())
-        
-        # 2. IN_PROGRESS -> CLOSED (passed content deadline)
-        to_closed = cls.objects.filter(status='IN_PROGRESS', content_deadline__lt=today)
-        closed_count = to_closed.count()
-        if closed_count > 0:
-            print(f"[CampaignAutomation] Moving {closed_count} campaigns from IN_PROGRESS to CLOSED")
-            to_closed.update(status='CLOSED', updated_at=timezone.now())
-        
-        return in_progress_count + closed_count
+        """Apply all due transitions (see CampaignStatusService)."""
+        from .services import CampaignStatusService
+        return CampaignStatusService.apply_due_transitions()
 
 
-class CampaignApplication(models.Model):
+class CampaignApplication(ChangeTrackingMixin, models.Model):
     """
     Application/participation record for a campaign.
     
@@ -354,6 +373,13 @@ class CampaignApplication(models.Model):
         help_text="Payment slip image uploaded by admin",
         verbose_name="สลิปการโอนเงิน"
     )
+    payment_slip_thumbnail = models.ImageField(
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Small JPEG of the payment slip, rendered in the background (embedded in reports)",
+        verbose_name="ภาพย่อสลิป"
+    )
     
     # Admin notes
     admin_notes = models.TextField(
@@ -412,43 +438,59 @@ class CampaignApplication(models.Model):
     applied_at = models.DateTimeField(auto_now_add=True, verbose_name="สมัครเมื่อ")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="อัปเดตเมื่อ")
 
-    def save(self, *args, **kwargs):
-        if self.pk:
-            delete_old_file(self, 'payment_slip')
-        super().save(*args, **kwargs)
+    # save() compares status with the loaded value; replaced payment slips (and
+    # their thumbnails) are removed from storage after save (ChangeTrackingMixin)
+    tracked_fields = ('status',)
+    cleanup_file_fields = ('payment_slip', 'payment_slip_thumbnail')
     
     class Meta:
         verbose_name = 'ใบสมัครแคมเปญ'
         verbose_name_plural = 'รายการใบสมัคร'
         ordering = ['-applied_at']
         unique_together = ['campaign', 'user']
+        indexes = [
+            # Keyset pagination of a user's applications
+            models.Index(fields=['user', '-applied_at', 'id'], name='application_user_keyset_idx'),
+            # Keyset pagination of a campaign's participants
+            models.Index(fields=['campaign', '-applied_at', 'id'], name='application_campaign_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.display_name} - {self.campaign.title} ({self.status})"
     
+    # Timeline stage of each status
+    STAGE_BY_STATUS = {
+        'WAITING': 'brief',
+        'APPROVED': 'brief',
+        'WORK_IN_PROGRESS': 'brief',
+        'SUBMITTED_SCRIPT': 'script',
+        'SCRIPT_APPROVED': 'script',
+        'REVISE_SCRIPT': 'script',
+        'SUBMITTED_DRAFT': 'draft',
+        'DRAFT_APPROVED': 'draft',
+        'REVISE_DRAFT': 'draft',
+        'SUBMITTED_FINAL': 'final',
+        'FINAL_APPROVED': 'insight',
+        'REVISE_FINAL': 'final',
+        'SUBMITTED_INSIGHT': 'insight',
+        'REVISE_INSIGHT': 'insight',
+        'INSIGHT_APPROVED': 'insight',
+        'COMPLETED': 'payment',
+        'PAYMENT_TRANSFERRED': 'payment',
+    }
+    
     @property
     def current_stage(self):
         """Get current timeline stage based on status."""
-        status_to_stage = {
-            'WAITING': 'brief',
-            'APPROVED': 'brief',
-            'WORK_IN_PROGRESS': 'brief',
-            'SUBMITTED_SCRIPT': 'script',
-            'SCRIPT_APPROVED': 'script',
-            'REVISE_SCRIPT': 'script',
-            'SUBMITTED_DRAFT': 'draft',
-            'DRAFT_APPROVED': 'draft',
-            'REVISE_DRAFT': 'draft',
-            'SUBMITTED_FINAL': 'final',
-            'FINAL_APPROVED': 'insight',
-            'REVISE_FINAL': 'final',
-            'SUBMITTED_INSIGHT': 'insight',
-            'REVISE_INSIGHT': 'insight',
-            'INSIGHT_APPROVED': 'insight',
-            'COMPLETED': 'payment',
-            'PAYMENT_TRANSFERRED': 'payment',
-        }
-        return status_to_stage.get(self.status, 'brief')
+        return self.STAGE_BY_STATUS.get(self.status, 'brief')
+    
+    @classmethod
+    def statuses_for_stage(cls, stage):
+        """Statuses whose current_stage is `stage` (unknown statuses count as 'brief')."""
+        statuses = [status for status, status_stage in cls.STAGE_BY_STATUS.items() if status_stage == stage]
+        if stage == 'brief':
+            statuses += [code for code, _ in cls.STATUS_CHOICES if code not in cls.STAGE_BY_STATUS]
+        return statuses
     
     @property
     def is_working(self):
@@ -476,14 +518,8 @@ class CampaignApplication(models.Model):
         from django.utils import timezone
         from apps.users.services import LineMessagingService
         
-        # 1. Detect if status changed
-        old_status = None
-        if self.pk:
-            try:
-                old_instance = CampaignApplication.objects.get(pk=self.pk)
-                old_status = old_instance.status
-            except CampaignApplication.DoesNotExist:
-                pass
+        # 1. Detect if status changed (compared with the loaded row, no extra SELECT)
+        old_status = self.initial_value('status')
         
         # 2. Auto-approve submission when status is changed to APPROVED status
         approval_mapping = {
@@ -516,16 +552,31 @@ class CampaignApplication(models.Model):
                         self.submission_data[stage]['status'] = 'approved'
                         self.submission_data[stage]['reviewed_at'] = timezone.now().isoformat()
         
-        # 3. Save the model
+        # 3. A new slip makes the thumbnail stale: drop it and render a new one
+        update_fields = kwargs.get('update_fields')
+        slip_changed = (update_fields is None or 'payment_slip' in update_fields) and self.has_changed('payment_slip')
+        if slip_changed and self.payment_slip_thumbnail:
+            self.payment_slip_thumbnail = None
+            if update_fields is not None:
+                kwargs['update_fields'] = list(set(update_fields) | {'payment_slip_thumbnail'})
+        
+        # 4. Save the model
         super().save(*args, **kwargs)
         
-        # 4. Convert status change for notifications
-        # Only send if status actually changed
+        if slip_changed and self.payment_slip:
+            from apps.core.tasks import enqueue
+            enqueue('campaigns.render_slip_thumbnail', application_id=self.pk)
+        
+        # 5. Convert status change for notifications
+        # Only send if status actually changed. The message is written to the
+        # LINE outbox in this transaction and delivered after commit.
+        self.notification_queued = False
         if old_status and old_status != self.status:
             try:
-                # We catch errors here so notification failure doesn't rollback transaction
-                LineMessagingService.send_campaign_status_notification(self, old_status, self.status)
-                print(f"✅ Notification sent: {self.user.display_name} ({old_status} -> {self.status})")
+                result = LineMessagingService.send_campaign_status_notification(self, old_status, self.status)
+                self.notification_queued = bool(result.get('success'))
+                if self.notification_queued:
+                    print(f"✅ Notification queued: {self.user.display_name} ({old_status} -> {self.status})")
             except Exception as e:
                 print(f"⚠️ Notification failed: {str(e)}")
     
@@ -679,3 +730,41 @@ class CampaignInsightMetric(models.Model):
     
     def __str__(self):
         return f"Metrics for App #{self.application.id}"
+
+
+class InsightAnalysisJob(models.Model):
+    """
+    Background AI analysis of one insight submission.
+
+    Created by SubmitWorkView once the screenshots are stored and run by the
+    `campaigns.analyze_insights` task, which reads them back from storage.
+    Holds the status the LIFF app polls; the task queue owns scheduling and
+    retries. Writes `insight_data` and `CampaignInsightMetric` on success.
+    """
+
+    STATUS_CHOICES = [
+        ('PENDING', 'รอวิเคราะห์'),
+        ('RUNNING', 'กำลังวิเคราะห์'),
+        ('SUCCEEDED', 'สำเร็จ'),
+        ('FAILED', 'ไม่สำเร็จ'),
+    ]
+
+    application = models.ForeignKey(
+        CampaignApplication,
+        on_delete=models.CASCADE,
+        related_name='insight_jobs'
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    image_paths = models.JSONField(default=list, help_text="Storage names of the screenshots to analyze")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Insight analysis #{self.id} for App #{self.application_id} ({self.status})"
@@ -0,0 +1,353 @@
+"""
+Campaign Services.
+
+- CampaignStatusService: deadline-driven status transition engine. Every
+  campaign stores `next_transition_at`, the moment its status is next due to
+  change (scheduled publish, application deadline, content deadline). The
+  engine only touches campaigns whose transition is due, in small batches,
+  so the read path (campaign lists) never has to write.
+- InsightAnalysisService: AI analysis of insight screenshots, run on the
+  task queue outside the submit request.
+- PaymentSlipService: payment slip thumbnails, rendered in the background and
+  read straight from storage by reports.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction, connection
+from django.utils import timezone
+
+from apps.core.images import ImageIngestService, Rendition
+from apps.core.tasks import enqueue
+
+from .models import Campaign, CampaignApplication, CampaignInsightMetric, InsightAnalysisJob
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignStatusService:
+    """
+    Applies due DRAFT -> OPEN -> IN_PROGRESS -> CLOSED transitions.
+    Run by `manage.py update_campaign_statuses` (once, or with --loop).
+    """
+
+    BATCH_SIZE = 200
+
+    @classmethod
+    def due_queryset(cls, now=None):
+        """Campaigns whose next transition time has passed."""
+        now = now or timezone.now()
+        return Campaign.objects.filter(
+            next_transition_at__isnull=False,
+            next_transition_at__lte=now,
+        ).order_by('next_transition_at', 'id')
+
+    @classmethod
+    def apply_due_transitions(cls, now=None, batch_size=None):
+        """
+        Apply all due transitions in batches.
+        Returns the number of campaigns whose status changed.
+        """
+        now = now or timezone.now()
+        batch_size = batch_size or cls.BATCH_SIZE
+        changed_total = 0
+
+        while True:
+            changed, processed = cls._apply_batch(now, batch_size)
+            changed_total += changed
+            if processed < batch_size:
+                break
+
+        if changed_total:
+            logger.info(f"[CampaignAutomation] Applied {changed_total} status transition(s)")
+            # bulk_update() sends no post_save, so drop cached feeds explicitly
+            from apps.api.services.feed_cache import FeedCache
+            FeedCache.invalidate_all()
+        return changed_total
+
+    @classmethod
+    def _apply_batch(cls, now, batch_size):
+        """Lock one batch of due campaigns and move them forward. Returns (changed, processed)."""
+        with transaction.atomic():
+            queryset = cls.due_queryset(now)
+            if connection.features.has_select_for_update_skip_locked:
+                # Several workers can run side by side without blocking each other
+                queryset = queryset.select_for_update(skip_locked=True)
+            batch = list(queryset[:batch_size])
+
+            changed = 0
+            for campaign in batch:
+                new_status = campaign.resolve_status(now)
+                if new_status != campaign.status:
+                    logger.info(
+                        f"[CampaignAutomation] Campaign #{campaign.id}: {campaign.status} -> {new_status}"
+                    )
+                    campaign.status = new_status
+                    campaign.updated_at = now
+                    changed += 1
+                campaign.next_transition_at = campaign.compute_next_transition_at()
+
+            if batch:
+                Campaign.objects.bulk_update(batch, ['status', 'next_transition_at', 'updated_at'])
+
+        return changed, len(batch)
+
+    @classmethod
+    def seconds_until_next_transition(cls, now=None):
+        """Seconds until the earliest pending transition, or None if nothing is scheduled."""
+        now = now or timezone.now()
+        next_at = (
+            Campaign.objects.filter(next_transition_at__isnull=False)
+            .order_by('next_transition_at')
+            .values_list('next_transition_at', flat=True)
+            .first()
+        )
+        if next_at is None:
+            return None
+        return max((next_at - now).total_seconds(), 0)
+
+
+class InsightAnalysisError(Exception):
+    """An analysis attempt failed and should be retried."""
+
+
+class InsightAnalysisService:
+    """
+    AI analysis of insight screenshots, run as the `campaigns.analyze_insights`
+    task on `manage.py run_tasks`.
+
+    - submit() records an InsightAnalysisJob for the stored screenshots and
+      queues the task in the same transaction.
+    - run() is the task body. It raises InsightAnalysisError while attempts
+      are left, so the task queue retries it with backoff, and marks the job
+      FAILED on the last one.
+
+    The job row only carries status, errors and attempts for the LIFF app and
+    Django admin; claiming, leases and retries belong to the task queue.
+    """
+
+    MAX_ATTEMPTS = 3
+
+    @classmethod
+    def submit(cls, application, image_paths):
+        """Create a job for `image_paths` (storage names) and queue its analysis."""
+        with transaction.atomic():
+            job = InsightAnalysisJob.objects.create(application=application, image_paths=list(image_paths))
+            enqueue('campaigns.analyze_insights', job_id=job.pk)
+        return job
+
+    @classmethod
+    def retry(cls, queryset):
+        """Queue finished jobs again (admin action). Returns the number queued."""
+        with transaction.atomic():
+            job_ids = list(
+                queryset.exclude(status__in=['PENDING', 'RUNNING'])
+                .select_for_update()
+                .values_list('id', flat=True)
+            )
+            InsightAnalysisJob.objects.filter(pk__in=job_ids).update(
+                status='PENDING', attempts=0, error='', started_at=None, finished_at=None
+            )
+            for job_id in job_ids:
+                enqueue('campaigns.analyze_insights', job_id=job_id)
+        return len(job_ids)
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def run(cls, job_id):
+        """Analyze one job. Raises InsightAnalysisError when the attempt should be retried."""
+        from apps.api.services.gemini import GeminiService
+
+        job = InsightAnalysisJob.objects.filter(pk=job_id).first()
+        if job is None or job.status in ('SUCCEEDED', 'FAILED'):
+            return
+
+        job.status = 'RUNNING'
+        job.attempts += 1
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'attempts', 'started_at'])
+
+        images = [data for data in map(cls._read_from_storage, job.image_paths) if data is not None]
+        if not images:
+            cls._finish(job, 'FAILED', 'No readable images')
+            logger.warning(f"[InsightAnalysis] Job #{job.id} failed: no readable images")
+            return
+
+        try:
+            result = GeminiService.analyze_insight_image_data(images)
+            error = '' if result else 'AI analysis returned no result'
+        except Exception as e:
+            result, error = None, str(e)
+
+        if result:
+            cls._apply_result(job, result)
+            cls._finish(job, 'SUCCEEDED')
+            logger.info(f"[InsightAnalysis] Job #{job.id} for App #{job.application_id} succeeded")
+            return
+
+        if job.attempts < cls.MAX_ATTEMPTS:
+            job.status = 'PENDING'
+            job.error = error
+            job.save(update_fields=['status', 'error'])
+            raise InsightAnalysisError(error)
+
+        cls._finish(job, 'FAILED', error)
+        logger.warning(f"[InsightAnalysis] Job #{job.id} failed after {job.attempts} attempts: {error}")
+
+    @staticmethod
+    def _read_from_storage(path):
+        try:
+            with default_storage.open(path, 'rb') as f:
+                return f.read()
+        except Exception as e:
+            logger.warning(f"[InsightAnalysis] Could not read {path}: {e}")
+            return None
+
+    @staticmethod
+    def _finish(job, status, error=''):
+        job.status = status
+        job.error = error
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _apply_result(cls, job, result):
+        """Store the analysis on the application, unless a newer submission superseded this job."""
+        superseded = InsightAnalysisJob.objects.filter(
+            application_id=job.application_id, created_at__gt=job.created_at
+        ).exists()
+        if superseded:
+            logger.info(f"[InsightAnalysis] Job #{job.id} superseded by a newer submission; result discarded")
+            return
+
+        result['analyzed_at'] = result.get('analyzed_at') or timezone.now().isoformat()
+        application = CampaignApplication.objects.select_related('campaign').get(pk=job.application_id)
+        application.insight_data = result
+        application.save(update_fields=['insight_data', 'updated_at'])
+        cls.save_metrics(application, result)
+
+    @staticmethod
+    def _clean_num(val):
+        """Numbers from the model may be abbreviated (10.5K, 1.2M) or strings."""
+        if val is None:
+            return 0
+        if isinstance(val, (int, float)):
+            return int(val)
+        s = str(val).lower().replace(',', '').strip()
+        if not s:
+            return 0
+        try:
+            if 'k' in s:
+                return int(float(s.replace('k', '')) * 1000)
+            if 'm' in s:
+                return int(float(s.replace('m', '')) * 1000000)
+            return int(float(s))
+        except ValueError:
+            return 0
+
+    @classmethod
+    def save_metrics(cls, application, insight_data):
+        """Write the CampaignInsightMetric row used for reporting."""
+        metrics = insight_data.get('metrics') or {}
+        views = cls._clean_num(metrics.get('views'))
+        likes = cls._clean_num(metrics.get('likes'))
+        comments = cls._clean_num(metrics.get('comments'))
+        shares = cls._clean_num(metrics.get('shares'))
+
+        eng_rate = ((likes + comments + shares) / views) * 100 if views > 0 else 0.0
+        try:
+            budget = float(application.campaign.budget)
+        except (TypeError, ValueError):
+            budget = 0.0
+        cpv = budget / views if views > 0 and budget > 0 else 0.0
+
+        CampaignInsightMetric.objects.update_or_create(
+            application=application,
+            defaults={
+                'total_views': views,
+                'total_likes': likes,
+                'total_comments': comments,
+                'total_shares': shares,
+                'engagement_rate': round(eng_rate, 2),
+                'cost_per_view': round(cpv, 4),
+            }
+        )
+        logger.info(f"[Metrics] Saved Metrics for App #{application.id}: Views={views}, ER={eng_rate:.2f}%, CPV={cpv:.4f}")
+
+
+class PaymentSlipService:
+    """
+    Payment slips are stored as uploaded; reports embed a small JPEG of each
+    (THUMBNAIL, about twice the size it is shown at). The thumbnail is
+    rendered by the `campaigns.render_slip_thumbnail` task whenever a slip is
+    saved and lives next to it in storage (`..._thumb.jpg`).
+
+    Readers never go through HTTP: `read_thumbnails()` opens the files in
+    storage directly, several at a time (SLIP_READ_CONCURRENCY).
+    """
+
+    THUMBNAIL = Rendition('thumbnail', 320, 160, 70)
+
+    @staticmethod
+    def thumbnail_name(slip_name):
+        return f"{os.path.splitext(slip_name)[0]}_thumb.jpg"
+
+    @classmethod
+    def render_thumbnail(cls, slip_name, storage=None):
+        """Thumbnail JPEG bytes of a stored slip. Raises ImageIngestError or the storage's error."""
+        storage = storage or default_storage
+        with storage.open(slip_name, 'rb') as f:
+            data = f.read()
+        return ImageIngestService.process(data, [cls.THUMBNAIL])[cls.THUMBNAIL.name].content
+
+    @classmethod
+    def store_thumbnail(cls, slip_name, storage=None):
+        """Render and store the thumbnail of `slip_name`. Returns the stored name."""
+        storage = storage or default_storage
+        content = cls.render_thumbnail(slip_name, storage)
+        return storage.save(cls.thumbnail_name(slip_name), ContentFile(content))
+
+    @classmethod
+    def read_thumbnail(cls, application, storage=None):
+        """
+        Thumbnail bytes for the application's slip: the stored thumbnail, or
+        one rendered now if the task hasn't made it yet. None if the slip
+        can't be read.
+        """
+        storage = storage or default_storage
+        if application.payment_slip_thumbnail:
+            try:
+                with storage.open(application.payment_slip_thumbnail.name, 'rb') as f:
+                    return f.read()
+            except Exception as e:
+                logger.warning(f"[PaymentSlip] App #{application.id}: thumbnail unreadable, rendering from the slip: {e}")
+        try:
+            return cls.render_thumbnail(application.payment_slip.name, storage)
+        except Exception as e:
+            logger.warning(f"[PaymentSlip] App #{application.id}: slip unreadable: {e}")
+            return None
+
+    @classmethod
+    def read_thumbnails(cls, applications, max_workers=None):
+        """{application id: thumbnail bytes or None} for the applications that have a slip."""
+        with_slip = [application for application in applications if application.payment_slip]
+        if not with_slip:
+            return {}
+        max_workers = max_workers or getattr(settings, 'SLIP_READ_CONCURRENCY', 8)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(with_slip)), thread_name_prefix='slip-read') as pool:
+            return dict(zip(
+                (application.id for application in with_slip),
+                pool.map(cls.read_thumbnail, with_slip),
+            ))
@@ -0,0 +1,55 @@
+"""
+Background tasks for campaigns (run by `manage.py run_tasks`).
+"""
+
+import logging
+
+from django.core.files.storage import default_storage
+
+from apps.core.images import ImageIngestError
+from apps.core.tasks import task
+
+from .models import CampaignApplication
+from .services import InsightAnalysisService, PaymentSlipService
+
+logger = logging.getLogger(__name__)
+
+
+@task('campaigns.render_slip_thumbnail', max_concurrency=2, max_attempts=3, base_backoff=60)
+def render_slip_thumbnail(application_id):
+    """
+    Store the thumbnail of an application's payment slip. Queued by
+    CampaignApplication.save() when the slip changes. Storage errors raise
+    and are retried; an unreadable image is skipped (reports leave it out).
+    """
+    application = CampaignApplication.objects.filter(pk=application_id).only(
+        'id', 'payment_slip', 'payment_slip_thumbnail'
+    ).first()
+    if application is None or not application.payment_slip or application.payment_slip_thumbnail:
+        return
+
+    slip_name = application.payment_slip.name
+    try:
+        thumbnail_name = PaymentSlipService.store_thumbnail(slip_name)
+    except ImageIngestError as e:
+        logger.warning(f"[PaymentSlip] App #{application_id}: no thumbnail for {slip_name}: {e}")
+        return
+
+    # Only if the slip didn't change again meanwhile. update() skips the
+    # report-cache signals, which is fine: the embedded image is the same.
+    updated = CampaignApplication.objects.filter(pk=application_id, payment_slip=slip_name).update(
+        payment_slip_thumbnail=thumbnail_name
+    )
+    if not updated:
+        default_storage.delete(thumbnail_name)
+
+
+@task('campaigns.analyze_insights', max_concurrency=2,
+      max_attempts=InsightAnalysisService.MAX_ATTEMPTS, base_backoff=60)
+def analyze_insights(job_id):
+    """
+    Run the AI analysis of an insight submission. Queued by
+    InsightAnalysisService.submit() and by the admin retry action; raises
+    while attempts are left, the job row records the final outcome.
+    """
+    InsightAnalysisService.run(job_id)
@@ -0,0 +1 @@
+# Core app - shared building blocks for the other apps
@@ -0,0 +1,34 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import BackgroundTask
+from .tasks import TaskQueue
+
+
+@admin.register(BackgroundTask)
+class BackgroundTaskAdmin(admin.ModelAdmin):
+    """Background task queue: queue depth per type, failures and retries."""
+    
+    list_display = ['id', 'task_type', 'status', 'attempts', 'next_attempt_at', 'locked_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'task_type', 'created_at']
+    search_fields = ['task_type', 'last_error']
+    readonly_fields = [
+        'task_type', 'payload', 'status', 'attempts', 'next_attempt_at', 'slot',
+        'locked_by', 'last_error', 'created_at', 'started_at', 'finished_at'
+    ]
+    actions = ['retry_tasks']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context['queue_stats'] = sorted(TaskQueue.stats().items())
+        return super().changelist_view(request, extra_context=extra_context)
+    
+    @admin.action(description='รันงานที่เลือกอีกครั้ง')
+    def retry_tasks(self, request, queryset):
+        count = queryset.exclude(status='RUNNING').update(
+            status='PENDING', attempts=0, slot=None, next_attempt_at=timezone.now(), last_error=''
+        )
+        self.message_user(request, f'เข้าคิวใหม่ {count} งาน (run_tasks)')
@@ -0,0 +1,84 @@
+"""
+Avatar mirroring.
+
+LINE pictures and social profile pictures are hotlinked from the platforms'
+CDNs: the URLs expire, some CDNs refuse other sites' Referers, and they are
+full size. `mirror_avatar()` downloads one once and stores small and medium
+JPEG thumbnails in our storage, under names derived from the image content:
+re-mirroring an unchanged picture (TikTok signs a new URL on every fetch)
+re-uses the stored files instead of uploading new ones.
+
+Runs from background tasks (users.mirror_line_picture,
+influencers.mirror_social_avatar), never in a request: nothing is mirrored
+unless a `run_tasks` worker is running (the deployed worker service runs
+one). Until then responses fall back to the platform URLs.
+"""
+
+import hashlib
+import logging
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from . import http
+from .images import ImageIngestError, ImageIngestService, Rendition
+from .storage import upload_files
+
+logger = logging.getLogger(__name__)
+
+
+AVATAR_MEDIUM = Rendition('medium', 320, 320, 80)
+AVATAR_SMALL = Rendition('small', 96, 96, 75)
+
+MirroredAvatar = namedtuple('MirroredAvatar', ['small_url', 'medium_url'])
+
+
+class AvatarMirrorError(Exception):
+    """The avatar could not be downloaded or is not a usable image."""
+
+
+def _download(url):
+    max_bytes = getattr(settings, 'AVATAR_MAX_BYTES', 5 * 1024 * 1024)
+    response = http.get(url, stream=True, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
+    try:
+        if response.status_code != 200:
+            raise AvatarMirrorError(f"Download failed: HTTP {response.status_code}")
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and not content_type.startswith('image/'):
+            raise AvatarMirrorError(f"Not an image: {content_type}")
+        data = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            data.extend(chunk)
+            if len(data) > max_bytes:
+                raise AvatarMirrorError(f"Avatar larger than {max_bytes} bytes")
+        return bytes(data)
+    finally:
+        response.close()
+
+
+def mirror_avatar(source_url, folder, storage=None):
+    """
+    Store thumbnails of the image at `source_url` under avatars/<folder>/.
+    Returns MirroredAvatar(small_url, medium_url). Raises AvatarMirrorError,
+    or the download's requests exception.
+    """
+    storage = storage or default_storage
+    data = _download(source_url)
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    try:
+        images = ImageIngestService.process(data, [AVATAR_MEDIUM, AVATAR_SMALL])
+    except ImageIngestError as e:
+        raise AvatarMirrorError(str(e)) from e
+
+    names = {
+        rendition.name: f"avatars/{folder}/{digest}_{rendition.name}.jpg"
+        for rendition in (AVATAR_SMALL, AVATAR_MEDIUM)
+    }
+    missing = [(path, images[name].content) for name, path in names.items() if not storage.exists(path)]
+    # Another mirror may store the same file concurrently; the storage then
+    # keeps ours under a suffixed name, which works just as well
+    stored = {path: url for (path, _), (_, url) in zip(missing, upload_files(missing, storage=storage))}
+    urls = {name: stored.get(path) or storage.url(path) for name, path in names.items()}
+    logger.info(f"[Avatars] Mirrored {source_url[:80]} as {digest} ({len(missing)} new files)")
+    return MirroredAvatar(urls['small'], urls['medium'])
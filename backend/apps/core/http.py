@@ -0,0 +1,212 @@
+"""
+Shared outbound HTTP client.
+
+Every external call (LINE, Google Drive, YouTube, RapidAPI, Apify, image
+downloads...) goes through here instead of bare `requests.get/post`, so:
+
+- Connections are reused: one keep-alive session per host, with a
+  connection pool sized for concurrent callers (HTTP_POOL_SIZE). At most
+  HTTP_MAX_SESSIONS hosts keep a session (the image proxy can be pointed at
+  any host); the least recently used one is closed to make room.
+- Timeouts are never missing: (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+  unless the caller passes its own.
+- Retries are consistent: connection failures are retried for every
+  method (nothing was sent yet), 502/503/504 only for idempotent methods.
+- Latency and errors are counted per host (this process only) for
+  `GET /api/v1/admin/metrics/`.
+
+Usage mirrors requests:
+
+    from apps.core import http
+    response = http.get(url, params={...})
+    session = http.session_for(url)   # for code that wants a Session
+
+Streamed responses must be closed (or read to the end) to give their
+connection back to the pool.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    from django.conf import settings
+
+    return getattr(settings, name, default)
+
+
+def host_of(url):
+    """'scheme://host[:port]' of a URL (or a bare host)."""
+    parts = urlsplit(url if '://' in url else f'https://{url}')
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+class _HostMetrics:
+    """
+    Per-host request counts, status classes and latency (this process only).
+    Keeps the HTTP_MAX_SESSIONS most recently used hosts.
+    """
+
+    SAMPLES = 200  # recent latencies kept per host for percentiles
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def record(self, host, latency, status=None, error=None):
+        with self._lock:
+            entry = self._data.get(host)
+            if entry is None:
+                entry = self._data[host] = {
+                    'requests': 0, 'errors': 0, 'statuses': {}, 'total_latency': 0.0,
+                    'max_latency': 0.0, 'recent': deque(maxlen=self.SAMPLES), 'last_error': '',
+                }
+                while len(self._data) > _setting('HTTP_MAX_SESSIONS', 64):
+                    self._data.popitem(last=False)
+            else:
+                self._data.move_to_end(host)
+            entry['requests'] += 1
+            entry['total_latency'] += latency
+            entry['max_latency'] = max(entry['max_latency'], latency)
+            entry['recent'].append(latency)
+            if error:
+                entry['errors'] += 1
+                entry['last_error'] = error
+            else:
+                bucket = f"{status // 100}xx"
+                entry['statuses'][bucket] = entry['statuses'].get(bucket, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for host, entry in self._data.items():
+                recent = sorted(entry['recent'])
+                result[host] = {
+                    'requests': entry['requests'],
+                    'errors': entry['errors'],
+                    'statuses': dict(entry['statuses']),
+                    'avg_latency_ms': round(entry['total_latency'] / entry['requests'] * 1000),
+                    'p95_latency_ms': round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000),
+                    'max_latency_ms': round(entry['max_latency'] * 1000),
+                    'last_error': entry['last_error'],
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+
+_metrics = _HostMetrics()
+
+
+class PooledSession(requests.Session):
+    """requests.Session for one host: pooled adapter, default timeout, metrics."""
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+    def __init__(self, host, pool_size, retries, timeout):
+        super().__init__()
+        self.host = host
+        self.default_timeout = timeout
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,  # a read failure may mean the server already acted on the request
+            status=retries,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=self.IDEMPOTENT_METHODS,
+            backoff_factor=0.3,
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.default_timeout
+        started = time.monotonic()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException as e:
+            _metrics.record(self.host, time.monotonic() - started, error=type(e).__name__)
+            raise
+        # Time to response headers (the body may still be streaming)
+        _metrics.record(self.host, time.monotonic() - started, status=response.status_code)
+        return response
+
+
+_sessions = OrderedDict()  # host -> PooledSession, least recently used first
+_sessions_lock = threading.Lock()
+
+
+def session_for(url, pool_size=None):
+    """
+    The shared session for `url`'s host. `pool_size` only applies when the
+    session is first created (e.g. LINE sizes its pool for bulk sends).
+    """
+    host = host_of(url)
+    evicted = []
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is not None:
+            _sessions.move_to_end(host)
+            return session
+        session = PooledSession(
+            host,
+            pool_size=pool_size or _setting('HTTP_POOL_SIZE', 10),
+            retries=_setting('HTTP_RETRIES', 2),
+            timeout=(_setting('HTTP_CONNECT_TIMEOUT', 5), _setting('HTTP_READ_TIMEOUT', 15)),
+        )
+        _sessions[host] = session
+        while len(_sessions) > _setting('HTTP_MAX_SESSIONS', 64):
+            evicted.append(_sessions.popitem(last=False)[1])
+
+    # Requests already running on an evicted session finish normally; its
+    # idle connections are dropped
+    for old in evicted:
+        old.close()
+    return session
+
+
+def request(method, url, **kwargs):
+    return session_for(url).request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def head(url, **kwargs):
+    return request('HEAD', url, **kwargs)
+
+
+def stats():
+    return _metrics.snapshot()
+
+
+def reset_stats():
+    _metrics.reset()
+
+
+def close_all():
+    """Drop every pooled session (tests, or after changing HTTP_* settings)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,207 @@
+"""
+Image ingest: one place to turn uploaded photos into stored JPEG renditions.
+
+- Downscales while decoding: JPEG `draft()` lets libjpeg decode at 1/2, 1/4
+  or 1/8 scale, other formats use `reduce()`. The full-resolution bitmap is
+  never built for large photos.
+- Rejects images above IMAGE_MAX_PIXELS before decoding (decompression bombs).
+- Applies EXIF orientation, so phone photos are stored upright.
+- Emits every requested rendition (full, preview, thumbnail...) from one
+  decode, each resized from the previous one.
+- Runs the CPU-heavy part in a small process pool (IMAGE_INGEST_PROCESSES,
+  0 = in the calling thread), so request threads only wait on it.
+"""
+
+import io
+import logging
+import multiprocessing
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+
+# max_width / max_height of None means unbounded in that direction
+Rendition = namedtuple('Rendition', ['name', 'max_width', 'max_height', 'quality'])
+RenderedImage = namedtuple('RenderedImage', ['content', 'width', 'height'])
+
+FULL = Rendition('full', 1920, 1920, 70)
+PREVIEW = Rendition('preview', 800, 800, 70)
+THUMBNAIL = Rendition('thumbnail', 256, 256, 65)
+
+
+class ImageIngestError(ValueError):
+    """The upload is not a readable image, or is too large to decode safely."""
+
+
+def _target_size(size, rendition):
+    """Largest size within the rendition's box (never upscales)."""
+    width, height = size
+    scale = 1.0
+    if rendition.max_width:
+        scale = min(scale, rendition.max_width / width)
+    if rendition.max_height:
+        scale = min(scale, rendition.max_height / height)
+    return max(int(width * scale), 1), max(int(height * scale), 1)
+
+
+def _oriented_size(image):
+    """(width, height) after EXIF orientation is applied."""
+    try:
+        orientation = image.getexif().get(0x0112, 1)
+    except Exception:
+        orientation = 1
+    width, height = image.size
+    return (height, width) if orientation in (5, 6, 7, 8) else (width, height)
+
+
+def render(data, renditions, max_pixels):
+    """
+    Decode `data` once and encode each rendition as JPEG.
+    Returns {name: RenderedImage}. Module-level so process pools can run it.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        width, height = image.size
+    except Exception as e:
+        raise ImageIngestError(f"Unreadable image: {e}")
+    if width * height > max_pixels:
+        raise ImageIngestError(f"Image too large: {width}x{height} exceeds {max_pixels} pixels")
+
+    oriented = _oriented_size(image)
+
+    def area(rendition):
+        target_width, target_height = _target_size(oriented, rendition)
+        return target_width * target_height
+
+    # Largest rendition first; the rest are derived from it
+    renditions = sorted(renditions, key=area, reverse=True)
+    largest = _target_size(oriented, renditions[0])
+    swapped = oriented != (width, height)
+    decode_box = (largest[1], largest[0]) if swapped else largest
+
+    try:
+        if image.format == 'JPEG':
+            # libjpeg scales by 1/2, 1/4 or 1/8 while decoding (never below the box)
+            image.draft('RGB', decode_box)
+        else:
+            factor = min(width // max(decode_box[0], 1), height // max(decode_box[1], 1))
+            if factor >= 2:
+                image = image.reduce(factor)
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            else:
+                image = image.convert('RGB')
+
+        results = {}
+        for rendition in renditions:
+            size = _target_size(image.size, rendition)
+            if size != image.size:
+                image = image.resize(size, Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format='JPEG', quality=rendition.quality, optimize=True)
+            results[rendition.name] = RenderedImage(output.getvalue(), image.width, image.height)
+        return results
+    except ImageIngestError:
+        raise
+    except Exception as e:
+        raise ImageIngestError(f"Could not process image: {e}")
+
+
+class ImageIngestService:
+    """
+    Usage:
+        images = ImageIngestService.ingest(request.FILES['photo'], [FULL, THUMBNAIL])
+        images['full'].content  # JPEG bytes
+    """
+
+    DEFAULT_MAX_PIXELS = 40_000_000
+    TIMEOUT = 60
+
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    @staticmethod
+    def _settings():
+        from django.conf import settings
+        return (
+            getattr(settings, 'IMAGE_INGEST_PROCESSES', 2),
+            getattr(settings, 'IMAGE_MAX_PIXELS', ImageIngestService.DEFAULT_MAX_PIXELS),
+        )
+
+    @classmethod
+    def _get_pool(cls, processes):
+        with cls._pool_lock:
+            if cls._pool is None:
+                # spawn: forking a threaded web worker is not safe
+                cls._pool = ProcessPoolExecutor(
+                    max_workers=processes, mp_context=multiprocessing.get_context('spawn')
+                )
+            return cls._pool
+
+    @classmethod
+    def _retire_pool(cls, pool, stuck=False):
+        """
+        Stop handing out `pool` (the next caller starts a new one) without
+        cancelling renders other callers are waiting on. With `stuck`, its
+        workers are terminated once those callers are done (or have given
+        up, after TIMEOUT), so a render that never ends stops using a process.
+        """
+        with cls._pool_lock:
+            if cls._pool is not pool:
+                return  # already replaced by another caller
+            cls._pool = None
+
+        if not stuck:
+            pool.shutdown(wait=False)
+            return
+
+        # Grab the workers now, shutdown() forgets them
+        workers = list((getattr(pool, '_processes', None) or {}).values())
+
+        def reap():
+            time.sleep(cls.TIMEOUT)
+            pool.shutdown(wait=False, cancel_futures=True)
+            for worker in workers:
+                worker.terminate()
+
+        threading.Thread(target=reap, name='image-ingest-reaper', daemon=True).start()
+
+    @classmethod
+    def process(cls, data, renditions=(FULL,)):
+        """Render `data` (bytes). Raises ImageIngestError for bad or oversized images."""
+        processes, max_pixels = cls._settings()
+        renditions = list(renditions)
+        if processes <= 0:
+            return render(data, renditions, max_pixels)
+        pool = cls._get_pool(processes)
+        try:
+            return pool.submit(render, data, renditions, max_pixels).result(timeout=cls.TIMEOUT)
+        except (BrokenProcessPool, CancelledError):
+            # The pool died (or was shut down) under us: nothing of ours ran there
+            logger.warning("[ImageIngest] Process pool unavailable, rendering in-thread")
+            cls._retire_pool(pool)
+            return render(data, renditions, max_pixels)
+        except FutureTimeoutError:
+            # The worker is still busy with it: route new work to a fresh pool
+            # rather than let it keep a process (and the next caller) tied up
+            logger.warning(f"[ImageIngest] Rendering took over {cls.TIMEOUT}s, replacing the process pool")
+            cls._retire_pool(pool, stuck=True)
+            raise ImageIngestError(f"Image took too long to process (over {cls.TIMEOUT}s)")
+
+    @classmethod
+    def ingest(cls, uploaded_file, renditions=(FULL,)):
+        """Render an uploaded file (anything with read())."""
+        if hasattr(uploaded_file, 'seek'):
+            uploaded_file.seek(0)
+        return cls.process(uploaded_file.read(), renditions)
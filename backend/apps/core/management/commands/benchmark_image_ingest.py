@@ -0,0 +1,118 @@
+import io
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.images import FULL, PREVIEW, THUMBNAIL, Rendition, render
+
+
+def _peak_rss_mb():
+    # VmHWM is per process image; ru_maxrss on Linux survives exec() and would
+    # report the parent's peak
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _legacy(data):
+    """What RegistrationSubmitView.compress_uploaded_image used to do."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    if image.mode in ('RGBA', 'P'):
+        image = image.convert('RGB')
+    max_size = 1600
+    if max(image.size) > max_size:
+        ratio = max_size / float(max(image.size))
+        image = image.resize((int(image.size[0] * ratio), int(image.size[1] * ratio)), Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=70, optimize=True)
+    return {'full': output.getvalue()}
+
+
+def _run_variant(variant, data, iterations, max_pixels):
+    """Runs in a fresh process so peak RSS belongs to this variant alone."""
+    renditions = {
+        'ingest': [Rendition('full', 1600, 1600, 70)],
+        'ingest_all': [FULL, PREVIEW, THUMBNAIL],
+    }
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        if variant == 'legacy':
+            _legacy(data)
+        else:
+            render(data, renditions[variant], max_pixels)
+    elapsed = time.perf_counter() - started
+    return elapsed / iterations, baseline, _peak_rss_mb()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark image ingest: the old full-decode + LANCZOS path vs ImageIngestService '
+        '(draft-mode decode), reporting ms per megapixel and peak RSS of a fresh process per variant.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--width', type=int, default=4032, help='Source width (default: 4032, a 12MP phone photo)')
+        parser.add_argument('--height', type=int, default=3024, help='Source height (default: 3024)')
+        parser.add_argument('--iterations', type=int, default=5, help='Runs per variant (default: 5)')
+        parser.add_argument('--format', choices=['JPEG', 'PNG'], default='JPEG', help='Source format (default: JPEG)')
+
+    def handle(self, *args, **options):
+        data = self.make_source(options['width'], options['height'], options['format'])
+        megapixels = options['width'] * options['height'] / 1_000_000
+        max_pixels = getattr(settings, 'IMAGE_MAX_PIXELS', 40_000_000)
+        self.stdout.write(
+            f"Source: {options['width']}x{options['height']} {options['format']} "
+            f"({megapixels:.1f} MP, {len(data) / 1024:.0f} KiB), {options['iterations']} iterations\n"
+        )
+
+        rows = []
+        for variant, label in (
+            ('legacy', 'legacy: full decode, 1600px'),
+            ('ingest', 'ingest: 1600px'),
+            ('ingest_all', 'ingest: full+preview+thumbnail'),
+        ):
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                seconds, baseline, peak = pool.submit(
+                    _run_variant, variant, data, options['iterations'], max_pixels
+                ).result()
+            rows.append((label, seconds, baseline, peak))
+
+        self.stdout.write(f"{'Path':<34}{'ms/image':>10}{'ms/MP':>9}{'Peak RSS':>11}{'Δ RSS':>9}")
+        for label, seconds, baseline, peak in rows:
+            self.stdout.write(
+                f"{label:<34}{seconds * 1000:>10.0f}{seconds * 1000 / megapixels:>9.1f}"
+                f"{peak:>9.0f}MB{peak - baseline:>7.0f}MB"
+            )
+
+    @staticmethod
+    def make_source(width, height, image_format):
+        """Noisy gradient photo with EXIF orientation 6 (rotated phone shot)."""
+        from PIL import Image
+
+        noise = Image.effect_noise((width, height), 40)
+        gradient = Image.linear_gradient('L').resize((width, height))
+        image = Image.merge('RGB', (noise, gradient, Image.blend(noise, gradient, 0.5)))
+        output = io.BytesIO()
+        if image_format == 'JPEG':
+            exif = Image.Exif()
+            exif[0x0112] = 6
+            image.save(output, format='JPEG', quality=90, exif=exif)
+        else:
+            image.save(output, format='PNG')
+        return output.getvalue()
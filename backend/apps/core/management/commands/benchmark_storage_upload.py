@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.storage import StorageUploadError, upload_files
+
+
+class LatencyStorage(FileSystemStorage):
+    """Local storage that sleeps like a remote bucket (one round trip per call)."""
+
+    def __init__(self, latency, fail_on=None, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.fail_on = fail_on
+
+    def _save(self, name, content):
+        time.sleep(self.latency)
+        if self.fail_on and self.fail_on in name:
+            raise OSError('injected failure')
+        return super()._save(name, content)
+
+    def delete(self, name):
+        time.sleep(self.latency)
+        super().delete(name)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark multi-file uploads against a local storage with injected latency: '
+        'one save() after another (old behaviour) vs apps.core.storage.upload_files(). '
+        'Also checks that a failed batch leaves no files behind.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--files', type=int, default=5, help='Files per batch (default: 5)')
+        parser.add_argument('--size-kb', type=int, default=300, help='Size of each file in KiB (default: 300)')
+        parser.add_argument('--latency', type=float, default=0.15, help='Seconds per storage call (default: 0.15)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Upload threads (default: 8)')
+
+    def handle(self, *args, **options):
+        root = tempfile.mkdtemp(prefix='storage-bench-')
+        try:
+            storage = LatencyStorage(options['latency'], location=root, base_url='/media/')
+            payload = os.urandom(options['size_kb'] * 1024)
+            items = [(f'bench/file_{i}.jpg', payload) for i in range(options['files'])]
+
+            started = time.perf_counter()
+            for path, content in items:
+                upload_files([(path, content)], storage=storage)
+            sequential = time.perf_counter() - started
+
+            started = time.perf_counter()
+            results = upload_files(items, storage=storage, max_workers=options['concurrency'])
+            concurrent = time.perf_counter() - started
+            if [url for _, url in results] != [storage.url(name) for name, _ in results]:
+                raise CommandError('URLs are not in input order')
+
+            before = self.count_files(root)
+            failing = LatencyStorage(options['latency'], fail_on='file_last', location=root, base_url='/media/')
+            batch = items[:-1] + [('bench/file_last.jpg', payload)]
+            try:
+                upload_files(batch, storage=failing, max_workers=options['concurrency'])
+                raise CommandError('Injected failure was not reported')
+            except StorageUploadError:
+                pass
+            leftovers = self.count_files(root) - before
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+        self.stdout.write(
+            f"\n{options['files']} files x {options['size_kb']} KiB, {options['latency'] * 1000:.0f} ms per storage call"
+        )
+        self.stdout.write(f"{'sequential save()':<24}{sequential:>8.2f}s")
+        self.stdout.write(f"{'upload_files()':<24}{concurrent:>8.2f}s  ({sequential / concurrent:.1f}x)")
+        if leftovers:
+            raise CommandError(f'Failed batch left {leftovers} file(s) behind')
+        self.stdout.write(self.style.SUCCESS('Failed batch cleaned up (0 files left)'))
+
+    @staticmethod
+    def count_files(root):
+        return sum(len(files) for _, _, files in os.walk(root))
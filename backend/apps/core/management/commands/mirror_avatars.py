@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from apps.core.tasks import enqueue
+from apps.influencers.models import SocialPlatformAccount
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Queue thumbnail mirroring for LINE pictures and social profile pictures '
+        'that have no thumbnails yet (or changed since); `run_tasks` does the work.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=0,
+            help='Queue at most this many of each kind (default: all)'
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit'] or None
+
+        users = (
+            User.objects.exclude(picture_url='')
+            .exclude(picture_url=F('picture_mirrored_from'))
+            .values_list('id', flat=True)[:limit]
+        )
+        accounts = (
+            SocialPlatformAccount.objects.exclude(profile_picture_url='')
+            .exclude(profile_picture_url=F('profile_picture_mirrored_from'))
+            .values_list('id', flat=True)[:limit]
+        )
+
+        user_count = 0
+        for user_id in users:
+            enqueue('users.mirror_line_picture', user_id=user_id)
+            user_count += 1
+        account_count = 0
+        for account_id in accounts:
+            enqueue('influencers.mirror_social_avatar', account_id=account_id)
+            account_count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Queued {user_count} LINE pictures and {account_count} social profile pictures"
+        ))
@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from apps.core.tasks import TaskQueue, registered_task_types
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued background tasks (OCR, ...). Start as many workers as needed: '
+        'per-type concurrency limits hold across all of them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and pick up tasks as they become due'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=5,
+            help='Maximum seconds to sleep between checks in loop mode (default: 5)'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Tasks this worker runs at once (default: 4)'
+        )
+        parser.add_argument(
+            '--types', default='',
+            help='Comma-separated task types to run (default: all registered)'
+        )
+
+    def handle(self, *args, **options):
+        registered = registered_task_types()
+        types = [name.strip() for name in options['types'].split(',') if name.strip()] or sorted(registered)
+        unknown = [name for name in types if name not in registered]
+        if unknown:
+            raise CommandError(f"Unknown task types: {', '.join(unknown)} (registered: {', '.join(sorted(registered))})")
+
+        concurrency = max(options['concurrency'], 1)
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='task-worker')
+
+        if not options['loop']:
+            futures = [pool.submit(self.run_task, item) for item in TaskQueue.claim(limit=concurrency, types=types)]
+            outcomes = [future.result() for future in futures]
+            self.report(outcomes)
+            pool.shutdown()
+            return
+
+        self.stdout.write(
+            f"[{timezone.now().isoformat()}] Task worker started: {', '.join(types)} "
+            f"(concurrency {concurrency}, interval {options['interval']}s)"
+        )
+        in_flight = set()
+        try:
+            while True:
+                close_old_connections()
+                free = concurrency - len(in_flight)
+                claimed = TaskQueue.claim(limit=free, types=types) if free else []
+                for item in claimed:
+                    in_flight.add(pool.submit(self.run_task, item))
+
+                if claimed and len(in_flight) < concurrency:
+                    continue  # More may be due right away
+
+                due_in = TaskQueue.seconds_until_next_due(types)
+                sleep_for = options['interval'] if due_in is None else min(max(due_in, 0.5), options['interval'])
+                if in_flight:
+                    # Wake up early when a slot frees
+                    done, in_flight = wait(in_flight, timeout=sleep_for, return_when=FIRST_COMPLETED)
+                    self.report([future.result() for future in done], quiet=True)
+                else:
+                    time.sleep(sleep_for)
+        except KeyboardInterrupt:
+            self.stdout.write("Task worker stopping, waiting for running tasks...")
+            pool.shutdown(wait=True)
+            self.stdout.write("Task worker stopped")
+
+    @staticmethod
+    def run_task(item):
+        try:
+            close_old_connections()
+            return TaskQueue.run(item)
+        finally:
+            connection.close()
+
+    def report(self, outcomes, quiet=False):
+        if quiet and not outcomes:
+            return
+        self.stdout.write(
+            f"[{timezone.now().isoformat()}] Succeeded {outcomes.count('succeeded')}, "
+            f"retrying {outcomes.count('retrying')}, failed {outcomes.count('failed')}"
+        )
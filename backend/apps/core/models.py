@@ -0,0 +1,209 @@
+"""
+Core model building blocks.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.db import models
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeTrackingMixin:
+    """
+    Remembers the loaded values of the fields save() needs to compare, so it
+    can tell what changed without re-reading the row.
+
+    - Only `tracked_fields` and `cleanup_file_fields` are snapshotted, in
+      `from_db()` (and again after save and `refresh_from_db()`), so bulk
+      reads pay for a few attribute copies per row, nothing more. Other and
+      deferred fields fall back to a single query when asked about.
+    - JSON values (dict/list) are kept as a fingerprint of their content,
+      not a copy; `initial_value()` returns that fingerprint for them.
+    - `has_changed(field)` / `initial_value(field)` compare against it.
+    - Fields listed in `cleanup_file_fields` have their previous file
+      deleted from storage after a save that replaced or cleared it.
+
+    Must come before `models.Model` in the bases.
+    """
+
+    tracked_fields = ()
+    cleanup_file_fields = ()
+
+    _MISSING = object()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._take_snapshot()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._take_snapshot(fields)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        replaced_files = self._replaced_files(update_fields)
+
+        super().save(*args, **kwargs)
+
+        for storage, name in replaced_files:
+            try:
+                logger.info(f"[Cleanup] Deleting old file: {name}")
+                storage.delete(name)
+            except Exception as e:
+                logger.warning(f"[Cleanup] Error deleting old file {name}: {e}")
+
+        self._take_snapshot(update_fields)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def initial_value(self, field_name):
+        """Value of `field_name` when the instance was loaded (None for new instances)."""
+        field = self._meta.get_field(field_name)
+        if self._state.adding:
+            return None
+        snapshot = self.__dict__.setdefault('_initial_values', {})
+        if field.attname not in snapshot:
+            # Untracked or deferred when loaded: fetch just this column once
+            value = (
+                type(self)._base_manager.using(self._state.db)
+                .filter(pk=self.pk).values_list(field.attname, flat=True).first()
+            )
+            snapshot[field.attname] = self._normalize(field, value)
+        return snapshot[field.attname]
+
+    def has_changed(self, field_name):
+        """True if `field_name` differs from its loaded value (always True for new instances)."""
+        if self._state.adding:
+            return True
+        field = self._meta.get_field(field_name)
+        if field.attname not in self.__dict__:
+            # Still deferred, so it cannot have been assigned
+            return False
+        current = self._normalize(field, self.__dict__[field.attname])
+        return current != self.initial_value(field_name)
+
+    def changed_fields(self):
+        """Names of loaded concrete fields whose value differs from the snapshot."""
+        return [
+            field.name for field in self._meta.concrete_fields
+            if field.attname in self.__dict__ and self.has_changed(field.name)
+        ]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(field, value):
+        """Comparable value, detached from the instance."""
+        if isinstance(field, models.FileField):
+            # FieldFile, File or raw name -> stored name ('' when empty)
+            return getattr(value, 'name', value) or ''
+        if isinstance(value, (dict, list)):
+            # JSON values are mutated in place (submission_data, insight_data...)
+            encoded = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+            return ('json', hashlib.sha1(encoded).hexdigest())
+        return value
+
+    def _take_snapshot(self, fields=None):
+        snapshot = self.__dict__.setdefault('_initial_values', {})
+        names = set(fields) if fields is not None else None
+        # Tracked fields, plus any field fetched on demand since
+        tracked = set(self.tracked_fields) | set(self.cleanup_file_fields) | set(snapshot)
+        for field in self._meta.concrete_fields:
+            if field.name not in tracked and field.attname not in tracked:
+                continue
+            if names is not None and field.name not in names and field.attname not in names:
+                continue
+            if field.attname in self.__dict__:
+                snapshot[field.attname] = self._normalize(field, self.__dict__[field.attname])
+
+    def _replaced_files(self, update_fields=None):
+        """(storage, old name) for cleanup fields whose file is being replaced or cleared."""
+        if self._state.adding:
+            return []
+        replaced = []
+        for field_name in self.cleanup_file_fields:
+            if update_fields is not None and field_name not in update_fields:
+                continue
+            if not self.has_changed(field_name):
+                continue
+            old_name = self.initial_value(field_name)
+            if old_name:
+                field = self._meta.get_field(field_name)
+                replaced.append((field.storage, old_name))
+        return replaced
+
+
+class BackgroundTask(models.Model):
+    """
+    One unit of work in the DB-backed task queue (see apps.core.tasks).
+
+    Rows are written in the caller's transaction and run by
+    `manage.py run_tasks`. While a task is RUNNING it holds one of its type's
+    concurrency slots; the partial unique constraint on (task_type, slot)
+    makes the per-type limit hold across every worker process.
+    """
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('SUCCEEDED', 'Succeeded'),
+        ('FAILED', 'Failed'),
+    ]
+
+    task_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="PENDING: earliest run time. RUNNING: lease expiry."
+    )
+    slot = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Concurrency slot while RUNNING")
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'task_type', 'next_attempt_at'], name='backgroundtask_due_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['task_type', 'slot'],
+                condition=models.Q(status='RUNNING'),
+                name='backgroundtask_running_slot',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task_type} #{self.id} ({self.status})"
+
+
+class RateLimitState(models.Model):
+    """
+    Shared schedule of one rate limit (see apps.core.ratelimit).
+
+    `next_slot_at` is the theoretical time the next request may start; every
+    process reserves slots by advancing it under a row lock.
+    """
+
+    key = models.CharField(max_length=100, unique=True)
+    next_slot_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} (next slot {self.next_slot_at:%H:%M:%S})"
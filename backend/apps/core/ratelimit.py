@@ -0,0 +1,101 @@
+"""
+Cross-process request pacing.
+
+`PacedRateLimiter` spaces calls to an external service `interval` seconds
+apart, plus a random `jitter`, across every web and worker process. The
+schedule lives in one RateLimitState row per key, so it holds no matter
+which gunicorn worker or `run_tasks` process asks.
+
+Callers never sleep while holding anything: `reserve()` books the next free
+slot and returns how long until it starts. Request handlers run right away
+when that is 0 and queue the work for later otherwise; background workers
+may simply wait.
+
+`burst` lets that many calls through back to back after the key has been
+idle (a token bucket of `burst` tokens refilled one per interval).
+"""
+
+import logging
+import random
+import time
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class PacedRateLimiter:
+    """
+    Usage:
+        limiter = PacedRateLimiter('social:tiktok', interval=3, jitter=7)
+        delay = limiter.reserve()
+        if delay == 0:
+            fetch()
+        else:
+            enqueue('...', delay=delay)
+    """
+
+    def __init__(self, key, interval, jitter=0, burst=1):
+        self.key = key
+        self.interval = max(float(interval), 0.0)
+        self.jitter = max(float(jitter), 0.0)
+        self.burst = max(int(burst), 1)
+
+    def reserve(self, max_delay=None):
+        """
+        Book the next free slot. Returns seconds until it starts (0 = now).
+        With `max_delay`, a slot further away than that is not booked and
+        None is returned, so a caller that would give up doesn't push the
+        schedule back for everyone else.
+        """
+        from .models import RateLimitState
+
+        self._ensure_row()
+        queryset = RateLimitState.objects.filter(key=self.key)
+        with transaction.atomic():
+            # Write first: takes the row lock (Postgres) or the write lock
+            # (SQLite, where a read-then-write upgrade would deadlock)
+            queryset.update(updated_at=timezone.now())
+            next_slot_at = queryset.values_list('next_slot_at', flat=True).get()
+
+            now = timezone.now()
+            # Up to `burst` slots may start at once after an idle period
+            tolerance = timedelta(seconds=self.interval * (self.burst - 1))
+            slot = max(now, next_slot_at - tolerance)
+            if max_delay is not None and (slot - now).total_seconds() > max_delay:
+                return None
+            spacing = timedelta(seconds=self.interval + random.uniform(0, self.jitter))
+            queryset.update(next_slot_at=max(next_slot_at, now) + spacing)
+
+        delay = max((slot - now).total_seconds(), 0.0)
+        logger.debug(f"[RateLimit] {self.key}: slot in {delay:.2f}s")
+        return delay
+
+    def wait(self) -> float:
+        """Reserve a slot and sleep until it starts (background workers only)."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def backoff(self, seconds):
+        """Push the whole schedule back, e.g. after the service started blocking us."""
+        from .models import RateLimitState
+
+        self._ensure_row()
+        until = timezone.now() + timedelta(seconds=seconds)
+        RateLimitState.objects.filter(key=self.key, next_slot_at__lt=until).update(
+            next_slot_at=until, updated_at=timezone.now()
+        )
+
+    def _ensure_row(self):
+        from .models import RateLimitState
+
+        if not RateLimitState.objects.filter(key=self.key).exists():
+            try:
+                with transaction.atomic():
+                    RateLimitState.objects.create(key=self.key)
+            except IntegrityError:
+                pass  # created by another process in the meantime
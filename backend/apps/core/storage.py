@@ -0,0 +1,90 @@
+"""
+Storage helpers.
+
+`upload_files()` saves several files to a storage backend concurrently. With
+GCS every save() is a network round trip, so a 5-screenshot submission pays
+one round trip instead of five. Batches are all-or-nothing: if any upload
+fails, the files that did get stored are deleted again.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+
+class StorageUploadError(Exception):
+    """One or more files in a batch could not be stored; none of the batch was kept."""
+
+    def __init__(self, message, failures):
+        super().__init__(message)
+        self.failures = failures  # [(index, path, exception)]
+
+
+def _as_file(content):
+    if isinstance(content, (bytes, bytearray)):
+        return ContentFile(bytes(content))
+    if isinstance(content, File):
+        return content
+    return File(content)
+
+
+def upload_files(items: Sequence[Tuple[str, object]], storage=None, max_workers=None) -> List[Tuple[str, str]]:
+    """
+    Save `items` ([(path, bytes | File)]) concurrently.
+
+    Returns [(saved_name, url)] in input order. The storage may rename a file
+    to avoid collisions, so always keep the returned name. Raises
+    StorageUploadError after removing every file of the batch that was saved.
+    """
+    storage = storage or default_storage
+    items = list(items)
+    if not items:
+        return []
+    max_workers = max_workers or getattr(settings, 'STORAGE_UPLOAD_CONCURRENCY', 8)
+
+    def save(item):
+        path, content = item
+        name = storage.save(path, _as_file(content))
+        return name, storage.url(name)
+
+    if len(items) == 1 or max_workers <= 1:
+        results = []
+        for index, item in enumerate(items):
+            try:
+                results.append(save(item))
+            except Exception as e:
+                _cleanup(storage, [name for name, _ in results])
+                raise StorageUploadError(f"Upload of {item[0]} failed: {e}", [(index, item[0], e)]) from e
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix='storage-upload') as executor:
+        futures = [executor.submit(save, item) for item in items]
+        results, failures = [], []
+        for index, (item, future) in enumerate(zip(items, futures)):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(None)
+                failures.append((index, item[0], e))
+
+    if failures:
+        _cleanup(storage, [result[0] for result in results if result is not None])
+        index, path, error = failures[0]
+        raise StorageUploadError(
+            f"{len(failures)} of {len(items)} uploads failed (first: {path}: {error})", failures
+        ) from error
+    return results
+
+
+def _cleanup(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f"[Storage] Could not remove {name} after a failed batch: {e}")
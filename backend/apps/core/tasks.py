@@ -0,0 +1,252 @@
+"""
+Lightweight DB-backed background task queue.
+
+No broker: tasks are rows in BackgroundTask, written in the caller's
+transaction (so they only exist if the surrounding change commits) and run
+by `manage.py run_tasks`, which can be started in as many processes as
+needed.
+
+Declare a task type in an app's `tasks.py` (discovered at startup):
+
+    @task('influencers.ocr_documents', max_concurrency=2, max_attempts=3)
+    def ocr_documents(profile_id):
+        ...
+
+and enqueue it with `enqueue('influencers.ocr_documents', profile_id=p.id)`.
+Payloads are passed to the function as keyword arguments and must be JSON
+serializable. A task that raises is retried with exponential backoff until
+`max_attempts`, then marked FAILED (re-queue it from Django admin).
+"""
+
+import logging
+import os
+import socket
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Dict, Optional
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TaskType:
+    name: str
+    func: Callable
+    max_concurrency: int = 1
+    max_attempts: int = 5
+    base_backoff: int = 30  # seconds, doubled per failed attempt
+    max_backoff: int = 60 * 60
+    lease_seconds: int = 300
+
+
+_registry: Dict[str, TaskType] = {}
+
+
+def task(name, **options):
+    """Register the decorated function as task type `name`."""
+    def decorator(func):
+        if name in _registry and _registry[name].func is not func:
+            raise ValueError(f"Task type '{name}' is already registered")
+        _registry[name] = TaskType(name=name, func=func, **options)
+        return func
+    return decorator
+
+
+def get_task_type(name) -> Optional[TaskType]:
+    return _registry.get(name)
+
+
+def registered_task_types() -> Dict[str, TaskType]:
+    return dict(_registry)
+
+
+def enqueue(name, delay=0, **payload):
+    """Queue a task. Safe inside transaction.atomic(): the row commits (or not) with the caller."""
+    from .models import BackgroundTask
+
+    if name not in _registry:
+        raise ValueError(f"Unknown task type '{name}'")
+    return BackgroundTask.objects.create(
+        task_type=name,
+        payload=payload,
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+class TaskQueue:
+    """
+    Claims and runs BackgroundTask rows.
+
+    - claim() leases due tasks (SKIP LOCKED where supported) and gives each
+      a free concurrency slot of its type; expired leases are taken over.
+    - run() calls the task function and records the outcome.
+    """
+
+    BATCH_SIZE = 10
+
+    @staticmethod
+    def worker_id():
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+    @classmethod
+    def due_queryset(cls, now=None):
+        from .models import BackgroundTask
+
+        now = now or timezone.now()
+        return BackgroundTask.objects.filter(
+            status__in=['PENDING', 'RUNNING'],
+            next_attempt_at__lte=now,
+        ).order_by('next_attempt_at', 'id')
+
+    @classmethod
+    def claim(cls, limit=None, types=None, worker_id=None):
+        """Lease up to `limit` due tasks, respecting each type's max_concurrency."""
+        limit = limit or cls.BATCH_SIZE
+        worker_id = worker_id or cls.worker_id()
+        names = [name for name in (types or _registry) if name in _registry]
+
+        claimed = []
+        for name in names:
+            if len(claimed) >= limit:
+                break
+            try:
+                claimed.extend(cls._claim_type(_registry[name], limit - len(claimed), worker_id))
+            except IntegrityError:
+                # Another worker took the same slot first; try again next round
+                logger.debug(f"[Tasks] Slot race on {name}, skipping this round")
+        return claimed
+
+    @classmethod
+    def _claim_type(cls, task_type, limit, worker_id):
+        from .models import BackgroundTask
+
+        now = timezone.now()
+        with transaction.atomic():
+            queryset = cls.due_queryset(now).filter(task_type=task_type.name)
+            if connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+            candidates = list(queryset[:min(limit, task_type.max_concurrency)])
+            if not candidates:
+                return []
+
+            used = set(
+                BackgroundTask.objects.filter(task_type=task_type.name, status='RUNNING')
+                .values_list('slot', flat=True)
+            )
+            free = [slot for slot in range(task_type.max_concurrency) if slot not in used]
+
+            claimed = []
+            for item in candidates:
+                if item.status != 'RUNNING':
+                    # Expired leases keep their slot; new work needs a free one
+                    if not free:
+                        continue
+                    item.slot = free.pop(0)
+                item.status = 'RUNNING'
+                item.attempts += 1
+                item.locked_by = worker_id
+                item.started_at = now
+                item.next_attempt_at = now + timedelta(seconds=task_type.lease_seconds)
+                claimed.append(item)
+
+            if claimed:
+                BackgroundTask.objects.bulk_update(
+                    claimed, ['status', 'slot', 'attempts', 'locked_by', 'started_at', 'next_attempt_at']
+                )
+        return claimed
+
+    @classmethod
+    def run(cls, item):
+        """Run one claimed task. Returns 'succeeded', 'retrying' or 'failed'."""
+        task_type = _registry.get(item.task_type)
+        if task_type is None:
+            cls._finish(item, 'FAILED', f"Unknown task type '{item.task_type}'")
+            return 'failed'
+
+        try:
+            task_type.func(**item.payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if item.attempts < task_type.max_attempts:
+                delay = min(task_type.base_backoff * (2 ** (item.attempts - 1)), task_type.max_backoff)
+                item.status = 'PENDING'
+                item.slot = None
+                item.last_error = error
+                item.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+                item.save(update_fields=['status', 'slot', 'last_error', 'next_attempt_at'])
+                logger.warning(f"[Tasks] {item.task_type} #{item.id} attempt {item.attempts} failed, retrying in {delay}s: {error}")
+                return 'retrying'
+            cls._finish(item, 'FAILED', error)
+            logger.error(f"[Tasks] {item.task_type} #{item.id} failed after {item.attempts} attempts: {error}")
+            return 'failed'
+
+        cls._finish(item, 'SUCCEEDED')
+        return 'succeeded'
+
+    @staticmethod
+    def _finish(item, status, error=''):
+        item.status = status
+        item.slot = None
+        item.last_error = error
+        item.finished_at = timezone.now()
+        item.save(update_fields=['status', 'slot', 'last_error', 'finished_at'])
+
+    @classmethod
+    def seconds_until_next_due(cls, types=None):
+        from .models import BackgroundTask
+
+        queryset = BackgroundTask.objects.filter(status__in=['PENDING', 'RUNNING'])
+        if types:
+            queryset = queryset.filter(task_type__in=types)
+        next_at = queryset.order_by('next_attempt_at').values_list('next_attempt_at', flat=True).first()
+        if next_at is None:
+            return None
+        return max((next_at - timezone.now()).total_seconds(), 0)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict]:
+        """Queue depth per task type, for the admin dashboard."""
+        from .models import BackgroundTask
+
+        now = timezone.now()
+        rows = (
+            BackgroundTask.objects.filter(status__in=['PENDING', 'RUNNING', 'FAILED'])
+            .values('task_type')
+            .annotate(
+                pending=Count('id', filter=Q(status='PENDING')),
+                due=Count('id', filter=Q(status='PENDING', next_attempt_at__lte=now)),
+                running=Count('id', filter=Q(status='RUNNING')),
+                failed=Count('id', filter=Q(status='FAILED')),
+                oldest_pending=Min('created_at', filter=Q(status='PENDING')),
+            )
+        )
+        stats = {
+            name: {'pending': 0, 'due': 0, 'running': 0, 'failed': 0,
+                   'oldest_pending_seconds': None, 'max_concurrency': task_type.max_concurrency}
+            for name, task_type in _registry.items()
+        }
+        for row in rows:
+            entry = stats.setdefault(row['task_type'], {'max_concurrency': None})
+            oldest = row['oldest_pending']
+            entry.update({
+                'pending': row['pending'],
+                'due': row['due'],
+                'running': row['running'],
+                'failed': row['failed'],
+                'oldest_pending_seconds': round((now - oldest).total_seconds()) if oldest else None,
+            })
+        return stats
+
+
+def run_due(limit=None, types=None) -> Dict[str, int]:
+    """Claim and run one batch of due tasks in this thread."""
+    counts = {'succeeded': 0, 'retrying': 0, 'failed': 0}
+    for item in TaskQueue.claim(limit=limit, types=types):
+        counts[TaskQueue.run(item)] += 1
+    return counts
+
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from .models import RateLimitState
+from .ratelimit import PacedRateLimiter
+
+
+class PacedRateLimiterTests(TransactionTestCase):
+    # Threads need committed rows, so no TestCase transaction
+
+    def test_concurrent_reservations_are_spaced(self):
+        interval, threads, calls = 1.0, 6, 4
+        slots, errors = [], []
+        lock = threading.Lock()
+        start = threading.Barrier(threads)
+
+        def reserve():
+            limiter = PacedRateLimiter('test:spacing', interval=interval)
+            try:
+                start.wait()
+                for _ in range(calls):
+                    delay = limiter.reserve()
+                    with lock:
+                        slots.append(time.monotonic() + delay)
+            except Exception as e:  # e.g. "database is locked"
+                errors.append(e)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=reserve) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(slots), threads * calls)
+        self.assertEqual(RateLimitState.objects.filter(key='test:spacing').count(), 1)
+
+        # Every booked slot starts at least one interval after the previous one
+        slots.sort()
+        gaps = [later - earlier for earlier, later in zip(slots, slots[1:])]
+        self.assertGreaterEqual(min(gaps), interval - 0.1)
+        # ...and the schedule has no holes (each slot follows right after the last)
+        self.assertLess(max(gaps), interval + 0.5)
+
+    def test_burst_lets_calls_through_after_idle(self):
+        limiter = PacedRateLimiter('test:burst', interval=10, burst=3)
+        delays = [limiter.reserve() for _ in range(4)]
+
+        self.assertEqual(delays[:3], [0.0, 0.0, 0.0])
+        self.assertGreater(delays[3], 0)
+
+    def test_reserve_beyond_max_delay_books_nothing(self):
+        limiter = PacedRateLimiter('test:max-delay', interval=10)
+        self.assertEqual(limiter.reserve(), 0.0)
+        before = RateLimitState.objects.get(key='test:max-delay').next_slot_at
+
+        self.assertIsNone(limiter.reserve(max_delay=5))
+        self.assertEqual(RateLimitState.objects.get(key='test:max-delay').next_slot_at, before)
+
+        self.assertGreater(limiter.reserve(max_delay=15), 5)
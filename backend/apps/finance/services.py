@@ -144,17 +144,8 @@ class PayoutService:
         except Exception:
             pass  # Wallet update is optional
         
-        # ========================================
-        # Send LINE Notification
-        # ========================================
-        try:
-            from apps.users.services import LineMessagingService
-            LineMessagingService.send_campaign_status_notification(
-                job_application, 'COMPLETED', 'PAYMENT_TRANSFERRED'
-            )
-        except Exception as e:
-            # Don't fail the transaction for notification errors
-            print(f"Warning: Failed to send LINE notification: {e}")
+        # LINE notification: queued in the outbox by job_application.save()
+        # above and delivered after this transaction commits.
         
         return {
             'success': True,
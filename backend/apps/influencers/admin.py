@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Interest, InfluencerProfile, SocialPlatformAccount, BlacklistedInfluencer
+from .models import Interest, InfluencerProfile, SocialPlatformAccount, SocialFetchJob, BlacklistedInfluencer
 
 
 @admin.register(Interest)
@@ -74,11 +74,14 @@ class SocialPlatformAccountAdmin(admin.ModelAdmin):
     
     list_display = [
         'user', 'platform', 'username', 
-        'followers_count', 'is_verified', 'last_synced_at'
+        'followers_count', 'is_verified', 'last_synced_at', 'sync_failed_at'
     ]
     list_filter = ['platform', 'is_verified', 'connected_at']
     search_fields = ['username', 'user__display_name', 'platform_user_id']
-    readonly_fields = ['connected_at', 'last_synced_at']
+    readonly_fields = [
+        'connected_at', 'last_synced_at', 'sync_failed_at', 'sync_error',
+        'profile_picture_small_url', 'profile_picture_medium_url', 'profile_picture_mirrored_from',
+    ]
 
 
 @admin.register(BlacklistedInfluencer)
@@ -119,3 +122,19 @@ class BlacklistedInfluencerAdmin(admin.ModelAdmin):
             return obj.reason[:30] + '...'
         return obj.reason or '-'
     reason_short.short_description = 'เหตุผล'
+
+
+@admin.register(SocialFetchJob)
+class SocialFetchJobAdmin(admin.ModelAdmin):
+    """Social profile fetches queued behind a platform's rate limit."""
+    
+    list_display = ['id', 'purpose', 'platform', 'user', 'status', 'scheduled_for', 'created_at', 'finished_at']
+    list_filter = ['status', 'purpose', 'platform']
+    search_fields = ['profile_url', 'profile_key', 'client_ip', 'user__display_name', 'error']
+    readonly_fields = [
+        'token', 'purpose', 'platform', 'profile_url', 'profile_key', 'user', 'client_ip', 'account', 'status',
+        'scheduled_for', 'result', 'error', 'created_at', 'finished_at'
+    ]
+    
+    def has_add_permission(self, request):
+        return False
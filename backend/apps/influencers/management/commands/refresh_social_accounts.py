@@ -0,0 +1,115 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.influencers.services import SocialAccountRefreshService, SocialPlatformService
+
+
+class Command(BaseCommand):
+    help = (
+        'Refresh follower counts of connected social accounts, stalest first. '
+        'One lane per platform with its own concurrency, paced by the shared platform rate limits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=float, default=24,
+            help='Refresh accounts not synced for this many hours (default: 24)'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=500,
+            help='Accounts per pass (default: 500)'
+        )
+        parser.add_argument(
+            '--platforms', default='',
+            help='Comma-separated platforms to refresh (default: all supported)'
+        )
+        parser.add_argument(
+            '--concurrency', default='',
+            help='Lane sizes, e.g. "youtube=4,tiktok=1" (default: SOCIAL_REFRESH_CONCURRENCY)'
+        )
+        parser.add_argument(
+            '--max-wait', type=int, default=SocialAccountRefreshService.MAX_WAIT,
+            help='Seconds a lane waits for a rate-limit slot before pausing the platform '
+                 f'(default: {SocialAccountRefreshService.MAX_WAIT})'
+        )
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help='Always scrape, even if the profile was fetched in the last few minutes'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running passes'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=300,
+            help='Seconds to sleep when a pass found nothing to refresh, in loop mode (default: 300)'
+        )
+
+    def handle(self, *args, **options):
+        platforms = [name.strip() for name in options['platforms'].split(',') if name.strip()]
+        unsupported = [name for name in platforms if not SocialPlatformService.is_supported(name)]
+        if unsupported:
+            raise CommandError(f"Unsupported platforms: {', '.join(unsupported)}")
+        concurrency = self.parse_concurrency(options['concurrency'])
+
+        if not options['loop']:
+            self.run_once(platforms, concurrency, options)
+            return
+
+        self.stdout.write(
+            f"[{timezone.now().isoformat()}] Social account refresher started "
+            f"(older than {options['older_than']}h, {options['limit']} per pass)"
+        )
+        try:
+            while True:
+                close_old_connections()
+                result = self.run_once(platforms, concurrency, options, quiet=True)
+                if not result['processed']:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Social account refresher stopped")
+
+    @staticmethod
+    def parse_concurrency(value):
+        concurrency = {}
+        for item in filter(None, (part.strip() for part in value.split(','))):
+            platform, _, size = item.partition('=')
+            try:
+                concurrency[platform.strip()] = max(int(size), 1)
+            except ValueError:
+                raise CommandError(f"Invalid --concurrency entry '{item}' (expected platform=N)")
+        return concurrency
+
+    def run_once(self, platforms, concurrency, options, quiet=False):
+        accounts = SocialAccountRefreshService.due_accounts(
+            timedelta(hours=options['older_than']), platforms=platforms or None, limit=options['limit']
+        )
+        if not accounts:
+            if not quiet:
+                self.stdout.write("No accounts due for a refresh")
+            return {'processed': 0}
+
+        result = SocialAccountRefreshService.run(
+            accounts, concurrency=concurrency, max_wait=options['max_wait'], use_cache=not options['no_cache']
+        )
+        self.stdout.write(
+            f"[{timezone.now().isoformat()}] Refreshed {result['succeeded']}, failed {result['failed']}, "
+            f"skipped {result['skipped']} of {result['accounts']} in {result['elapsed']:.1f}s "
+            f"({result['per_minute']:.1f} accounts/min)"
+        )
+        for platform, entry in sorted(result['platforms'].items()):
+            processed = entry['succeeded'] + entry['failed']
+            rate = processed / result['elapsed'] * 60 if result['elapsed'] else 0.0
+            line = (
+                f"  {platform:<10} {processed}/{entry['accounts']} "
+                f"(ok {entry['succeeded']}, failed {entry['failed']}) {rate:.1f}/min"
+            )
+            if entry['paused']:
+                self.stdout.write(self.style.WARNING(f"{line} - paused, {entry['skipped']} left for the next pass"))
+            else:
+                self.stdout.write(line)
+        return result
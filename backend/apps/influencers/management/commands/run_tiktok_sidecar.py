@@ -0,0 +1,54 @@
+import asyncio
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.influencers.tiktok_sidecar import TikTokSidecarServer
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the TikTok lookup sidecar: keeps warm TikTokApi browser sessions and answers '
+        'lookups from Django over TIKTOK_SIDECAR_ADDRESS'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--address', default='',
+            help='host:port or unix:/path/to.sock (default: TIKTOK_SIDECAR_ADDRESS)'
+        )
+        parser.add_argument(
+            '--sessions', type=int, default=getattr(settings, 'TIKTOK_SIDECAR_SESSIONS', 2),
+            help='Browser sessions to keep warm; lookups run on them in parallel'
+        )
+        parser.add_argument(
+            '--max-requests', type=int, default=200,
+            help='Recycle a session after this many lookups (default: 200)'
+        )
+        parser.add_argument(
+            '--browser', default='webkit', choices=['webkit', 'chromium', 'firefox'],
+            help='Playwright browser (default: webkit)'
+        )
+
+    def handle(self, *args, **options):
+        address = options['address'] or getattr(settings, 'TIKTOK_SIDECAR_ADDRESS', '')
+        if not address:
+            raise CommandError('No address: pass --address or set TIKTOK_SIDECAR_ADDRESS')
+        try:
+            import TikTokApi  # noqa: F401
+        except ImportError:
+            raise CommandError('TikTokApi is not installed (pip install TikTokApi && python -m playwright install webkit)')
+
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+        server = TikTokSidecarServer(
+            address,
+            sessions=options['sessions'],
+            max_requests=options['max_requests'],
+            browser=options['browser'],
+        )
+        self.stdout.write(f"TikTok sidecar starting {options['sessions']} session(s) on {address}...")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            self.stdout.write("TikTok sidecar stopped")
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('influencers', '0009_influencerprofile_bank_account_number_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SocialFetchJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('purpose', models.CharField(choices=[('lookup', 'ดึงข้อมูล'), ('connect', 'เชื่อมต่อบัญชี'), ('sync', 'ซิงค์บัญชี')], default='lookup', max_length=10)),
+                ('platform', models.CharField(choices=[('youtube', 'YouTube'), ('tiktok', 'TikTok'), ('instagram', 'Instagram'), ('facebook', 'Facebook'), ('lemon8', 'Lemon8')], max_length=20)),
+                ('profile_url', models.URLField(max_length=500)),
+                ('status', models.CharField(choices=[('PENDING', 'รอคิว'), ('SUCCEEDED', 'สำเร็จ'), ('FAILED', 'ไม่สำเร็จ')], default='PENDING', max_length=10)),
+                ('scheduled_for', models.DateTimeField(help_text='Start of the reserved rate-limit slot')),
+                ('result', models.JSONField(blank=True, default=dict, help_text='Raw fetch result')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('account', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='fetch_jobs', to='influencers.socialplatformaccount')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='social_fetch_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
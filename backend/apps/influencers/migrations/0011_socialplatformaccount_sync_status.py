@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('influencers', '0010_socialfetchjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='socialplatformaccount',
+            name='sync_error',
+            field=models.CharField(blank=True, max_length=255, verbose_name='ข้อผิดพลาดการซิงค์'),
+        ),
+        migrations.AddField(
+            model_name='socialplatformaccount',
+            name='sync_failed_at',
+            field=models.DateTimeField(blank=True, help_text='Last refresh attempt that failed (cleared by a successful sync)', null=True, verbose_name='ซิงค์ไม่สำเร็จเมื่อ'),
+        ),
+        migrations.AlterField(
+            model_name='socialplatformaccount',
+            name='last_synced_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='ซิงค์ล่าสุด'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('influencers', '0012_avatar_mirror'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='socialfetchjob',
+            name='client_ip',
+            field=models.CharField(blank=True, help_text='Requesting client, for anonymous lookups', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='socialfetchjob',
+            name='profile_key',
+            field=models.CharField(blank=True, help_text='Normalized handle (SocialProfileCache.normalize); empty if the URL has none', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='socialfetchjob',
+            index=models.Index(fields=['status', 'platform', 'profile_key'], name='socialfetchjob_dedup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialfetchjob',
+            index=models.Index(fields=['status', 'client_ip'], name='socialfetchjob_client_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@
 Influencer Profile and Interest models.
 """
 
+import uuid
+
 from django.db import models
 from django.conf import settings
 from django.core.validators import RegexValidator, MinValueValidator
@@ -291,6 +293,24 @@ class SocialPlatformAccount(models.Model):
         help_text="Profile picture URL",
         verbose_name="รูปโปรไฟล์"
     )
+    profile_picture_small_url = models.URLField(
+        max_length=1000,
+        blank=True,
+        help_text="Small thumbnail of profile_picture_url in our storage",
+        verbose_name="รูปโปรไฟล์ (เล็ก)"
+    )
+    profile_picture_medium_url = models.URLField(
+        max_length=1000,
+        blank=True,
+        help_text="Medium thumbnail of profile_picture_url in our storage",
+        verbose_name="รูปโปรไฟล์ (กลาง)"
+    )
+    profile_picture_mirrored_from = models.URLField(
+        max_length=1000,
+        blank=True,
+        help_text="profile_picture_url the thumbnails were made from",
+        verbose_name="ต้นฉบับรูปโปรไฟล์"
+    )
     followers_count = models.PositiveIntegerField(
         default=0,
         help_text="Number of followers",
@@ -320,8 +340,20 @@ class SocialPlatformAccount(models.Model):
     )
     last_synced_at = models.DateTimeField(
         auto_now=True,
+        db_index=True,
         verbose_name="ซิงค์ล่าสุด"
     )
+    sync_failed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last refresh attempt that failed (cleared by a successful sync)",
+        verbose_name="ซิงค์ไม่สำเร็จเมื่อ"
+    )
+    sync_error = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="ข้อผิดพลาดการซิงค์"
+    )
     
     class Meta:
         verbose_name = 'บัญชี Social Media'
@@ -342,6 +374,81 @@ class SocialPlatformAccount(models.Model):
             return f"{count / 1_000:.1f}K"
         return str(count)
 
+    def avatar_url(self, size='medium'):
+        """Our mirrored thumbnail ('small' or 'medium'), or the platform's URL until it is mirrored."""
+        mirrored = self.profile_picture_small_url if size == 'small' else self.profile_picture_medium_url
+        return mirrored or self.profile_picture_url
+
+    @property
+    def needs_picture_mirror(self):
+        return bool(self.profile_picture_url) and self.profile_picture_url != self.profile_picture_mirrored_from
+
+
+class SocialFetchJob(models.Model):
+    """
+    A social profile fetch that had to wait for its platform's rate-limit slot.
+
+    Created by the social views when the platform was fetched too recently;
+    run by `manage.py run_tasks` once the slot comes up. `token` is the
+    handle the client polls (GET /social/fetch-jobs/<token>/). For connect
+    and sync jobs the fetched data is also written to the account.
+
+    Pending jobs are merged per normalized handle (`profile_key`) and capped
+    per caller (`user`, else `client_ip`); see SocialPlatformService.request.
+    """
+
+    PURPOSE_CHOICES = [
+        ('lookup', 'ดึงข้อมูล'),
+        ('connect', 'เชื่อมต่อบัญชี'),
+        ('sync', 'ซิงค์บัญชี'),
+    ]
+    STATUS_CHOICES = [
+        ('PENDING', 'รอคิว'),
+        ('SUCCEEDED', 'สำเร็จ'),
+        ('FAILED', 'ไม่สำเร็จ'),
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    purpose = models.CharField(max_length=10, choices=PURPOSE_CHOICES, default='lookup')
+    platform = models.CharField(max_length=20, choices=SocialPlatformAccount.PLATFORM_CHOICES)
+    profile_url = models.URLField(max_length=500)
+    profile_key = models.CharField(
+        max_length=255, blank=True,
+        help_text="Normalized handle (SocialProfileCache.normalize); empty if the URL has none"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='social_fetch_jobs'
+    )
+    client_ip = models.CharField(max_length=64, blank=True, help_text="Requesting client, for anonymous lookups")
+    account = models.ForeignKey(
+        SocialPlatformAccount,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='fetch_jobs'
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    scheduled_for = models.DateTimeField(help_text="Start of the reserved rate-limit slot")
+    result = models.JSONField(default=dict, blank=True, help_text="Raw fetch result")
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'platform', 'profile_key'], name='socialfetchjob_dedup_idx'),
+            models.Index(fields=['status', 'client_ip'], name='socialfetchjob_client_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_purpose_display()} {self.platform} #{self.id} ({self.status})"
+
 
 class BlacklistedInfluencer(models.Model):
     """
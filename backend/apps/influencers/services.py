@@ -4,12 +4,25 @@ Social Media Platform Connection Services.
 This module handles fetching profile data from various social media platforms.
 """
 
+import hashlib
+import queue
 import re
 import requests
 import logging
+import threading
 import time
-import random
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core import http
+from apps.core.ratelimit import PacedRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -72,7 +85,7 @@ class YouTubeService:
             else:
                 params['forUsername'] = value
             
-            response = requests.get(
+            response = http.get(
                 f"{cls.API_BASE}/channels",
                 params=params,
                 timeout=10
@@ -162,7 +175,7 @@ class RapidAPISocialService:
             return {'success': False, 'error': 'Invalid TikTok URL format'}
         
         try:
-            response = requests.get(
+            response = http.get(
                 f"https://{cls._get_host('tiktok')}/user/info",
                 params={'unique_id': username},
                 headers={
@@ -210,7 +223,7 @@ class RapidAPISocialService:
             return {'success': False, 'error': 'Invalid Instagram URL format'}
         
         try:
-            response = requests.get(
+            response = http.get(
                 f"https://{cls._get_host('instagram')}/v1/info",
                 params={'username_or_id_or_url': username},
                 headers={
@@ -257,7 +270,7 @@ class RapidAPISocialService:
             return {'success': False, 'error': 'Invalid Facebook URL format'}
         
         try:
-            response = requests.get(
+            response = http.get(
                 f"https://{cls._get_host('facebook')}/page_info",
                 params={'page_id': username},
                 headers={
@@ -307,7 +320,7 @@ class ApifyServiceHelper:
             
         try:
             # 1. Start the actor run
-            response = requests.post(
+            response = http.post(
                 f"{ApifyServiceHelper.API_BASE}/acts/{actor_id}/runs?token={api_token}",
                 json=run_input,
                 timeout=10
@@ -326,7 +339,7 @@ class ApifyServiceHelper:
             
             import time
             for _ in range(timeout // 2):
-                run_status_res = requests.get(
+                run_status_res = http.get(
                      f"{ApifyServiceHelper.API_BASE}/actor-runs/{run_id}?token={api_token}"
                 )
                 status_data = run_status_res.json().get('data', {})
@@ -339,7 +352,7 @@ class ApifyServiceHelper:
                  return {'success': False, 'error': 'Actor run timed out'}
 
             # 3. Fetch results
-            dataset_response = requests.get(
+            dataset_response = http.get(
                 f"{ApifyServiceHelper.API_BASE}/datasets/{dataset_id}/items?token={api_token}",
                 timeout=10
             )
@@ -358,8 +371,12 @@ class ApifyServiceHelper:
 
 class TikTokLocalService:
     """
-    Fetch TikTok profile data using the TikTokApi python library (local execution).
-    Requries Playwright to be installed.
+    Fetch TikTok profile data using the TikTokApi python library.
+
+    Lookups go to the TikTok sidecar (`manage.py run_tiktok_sidecar`), which
+    keeps warm browser sessions, at TIKTOK_SIDECAR_ADDRESS. With no address
+    configured, a browser is started in this process for every lookup
+    (local development only; requires Playwright).
     """
     
     @classmethod
@@ -381,12 +398,32 @@ class TikTokLocalService:
 
     @classmethod
     def fetch_profile(cls, profile_url: str) -> dict:
-        import asyncio
+        from .tiktok_sidecar import TikTokSidecarClient, TikTokSidecarError
         
         username = cls.extract_username(profile_url)
         if not username:
              return {'success': False, 'error': 'Invalid TikTok URL format'}
 
+        client = TikTokSidecarClient.from_settings()
+        if client is None:
+            return cls._fetch_in_process(username, profile_url)
+
+        try:
+            response = client.user_info(username)
+        except TikTokSidecarError as e:
+            response = {'ok': False, 'error': str(e)}
+        
+        if not response.get('ok'):
+            logger.error(f"[TikTokApi] Error: {response.get('error')}")
+            # Fallback to efficient requests scraping if the browser lookup fails
+            logger.info("Falling back to requests scraping...")
+            return cls._fetch_fallback(profile_url)
+        return cls._profile_from_user_info(response['user_info'], username, profile_url)
+
+    @classmethod
+    def _fetch_in_process(cls, username: str, profile_url: str) -> dict:
+        import asyncio
+
         try:
             # Run the async fetch in a new event loop
             # Note: Nesting event loops can be tricky in Django. 
@@ -409,25 +446,7 @@ class TikTokLocalService:
             else:
                  user_info = loop.run_until_complete(cls._fetch_async(username))
             
-            # Extract data structure from TikTokApi response
-            # Note: The structure depends heavily on the library version
-            user = user_info.get('userInfo', {}).get('user', {})
-            stats = user_info.get('userInfo', {}).get('stats', {})
-            
-            return {
-                'success': True,
-                'data': {
-                    'platform': 'tiktok',
-                    'platform_user_id': user.get('id', ''),
-                    'username': f"@{user.get('uniqueId', username)}",
-                    'profile_url': profile_url,
-                    'profile_picture_url': user.get('avatarLarger', '') or user.get('avatarMedium', ''),
-                    'followers_count': stats.get('followerCount', 0),
-                    'following_count': stats.get('followingCount', 0),
-                    'posts_count': stats.get('videoCount', 0),
-                    'is_verified': user.get('verified', False)
-                }
-            }
+            return cls._profile_from_user_info(user_info, username, profile_url)
             
         except Exception as e:
             logger.error(f"[TikTokApi] Error: {e}")
@@ -435,6 +454,28 @@ class TikTokLocalService:
             logger.info("Falling back to requests scraping...")
             return cls._fetch_fallback(profile_url)
 
+    @staticmethod
+    def _profile_from_user_info(user_info: dict, username: str, profile_url: str) -> dict:
+        # Extract data structure from TikTokApi response
+        # Note: The structure depends heavily on the library version
+        user = user_info.get('userInfo', {}).get('user', {})
+        stats = user_info.get('userInfo', {}).get('stats', {})
+        
+        return {
+            'success': True,
+            'data': {
+                'platform': 'tiktok',
+                'platform_user_id': user.get('id', ''),
+                'username': f"@{user.get('uniqueId', username)}",
+                'profile_url': profile_url,
+                'profile_picture_url': user.get('avatarLarger', '') or user.get('avatarMedium', ''),
+                'followers_count': stats.get('followerCount', 0),
+                'following_count': stats.get('followingCount', 0),
+                'posts_count': stats.get('videoCount', 0),
+                'is_verified': user.get('verified', False)
+            }
+        }
+
     @staticmethod
     def _fetch_fallback(url: str) -> dict:
         """
@@ -455,7 +496,7 @@ class TikTokLocalService:
                 return {'success': False, 'error': 'Invalid URL for fallback'}
             username = match.group(1)
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http.get(url, headers=headers, timeout=10)
             if response.status_code != 200:
                 return {'success': False, 'error': f'TikTok Fallback HTTP {response.status_code}'}
                 
@@ -622,7 +663,7 @@ class FacebookLocalService:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http.get(url, headers=headers, timeout=15)
             logger.info(f"[Facebook Fallback] Response Status: {response.status_code}")
             if response.status_code != 200:
                 return {'success': False, 'error': f'Facebook HTTP {response.status_code}'}
@@ -721,40 +762,299 @@ class FacebookLocalService:
              return {'success': False, 'error': f'Fallback error: {str(ex)}'}
 
 
+CachedProfile = namedtuple('CachedProfile', ['result', 'fetched_at', 'fresh'])
+
+
+class SocialProfileCache:
+    """
+    Recent fetch results per (platform, normalized handle).
+
+    Registration fetches the same profile several times within a minute
+    (fetch-info, connect, sync); only the first one scrapes. The handle comes
+    from the platform's extract_username / extract_channel_id_or_handle, so
+    different URLs of one profile share an entry; URLs without a handle are
+    not cached.
+
+    - Successes are fresh for SOCIAL_PROFILE_CACHE_TTL, then kept another
+      SOCIAL_PROFILE_CACHE_STALE_TTL for stale-while-revalidate (sync).
+    - Failures are cached for SOCIAL_PROFILE_CACHE_FAILURE_TTL, security
+      stops only for SOCIAL_PROFILE_CACHE_BLOCKED_TTL.
+    """
+
+    PREFIX = 'socialprofile'
+    STATS_KEY = 'socialprofile:stats:{name}'
+    STATS = ('hit', 'stale', 'miss')
+
+    DEFAULT_TTL = 10 * 60
+    DEFAULT_STALE_TTL = 24 * 60 * 60
+    DEFAULT_FAILURE_TTL = 60
+    DEFAULT_BLOCKED_TTL = 30
+
+    @staticmethod
+    def normalize(platform: str, profile_url: str):
+        """Canonical handle of the profile, or None if the URL has none."""
+        if platform == 'youtube':
+            url_type, value = YouTubeService.extract_channel_id_or_handle(profile_url)
+            if not url_type:
+                return None
+            # Channel ids are case-sensitive, handles and usernames are not
+            return f"{url_type}:{value if url_type == 'id' else value.lower()}"
+        extractors = {
+            'tiktok': TikTokLocalService.extract_username,
+            'instagram': InstaloaderService.extract_username,
+            'facebook': FacebookLocalService.extract_username,
+        }
+        extract = extractors.get(platform)
+        username = extract(profile_url) if extract else None
+        return username.lstrip('@').lower() if username else None
+
+    @classmethod
+    def key(cls, platform: str, profile_url: str):
+        handle = cls.normalize(platform, profile_url)
+        if not handle:
+            return None
+        digest = hashlib.md5(handle.encode('utf-8')).hexdigest()
+        return f"{cls.PREFIX}:{platform}:{digest}"
+
+    @classmethod
+    def get(cls, platform: str, profile_url: str):
+        """CachedProfile (fresh or stale) or None."""
+        key = cls.key(platform, profile_url)
+        if key is None:
+            return None
+        try:
+            entry = cache.get(key)
+        except Exception as e:
+            logger.warning(f"[SocialProfileCache] Read failed: {e}")
+            entry = None
+        if entry is None:
+            cls._count('miss')
+            return None
+        fresh = time.time() < entry['fresh_until']
+        cls._count('hit' if fresh else 'stale')
+        return CachedProfile(entry['result'], entry['fetched_at'], fresh)
+
+    @classmethod
+    def set(cls, platform: str, profile_url: str, result: dict) -> None:
+        key = cls.key(platform, profile_url)
+        if key is None:
+            return
+        if result.get('success'):
+            ttl = getattr(settings, 'SOCIAL_PROFILE_CACHE_TTL', cls.DEFAULT_TTL)
+            keep = ttl + getattr(settings, 'SOCIAL_PROFILE_CACHE_STALE_TTL', cls.DEFAULT_STALE_TTL)
+        elif result.get('security_stop'):
+            ttl = keep = getattr(settings, 'SOCIAL_PROFILE_CACHE_BLOCKED_TTL', cls.DEFAULT_BLOCKED_TTL)
+        else:
+            ttl = keep = getattr(settings, 'SOCIAL_PROFILE_CACHE_FAILURE_TTL', cls.DEFAULT_FAILURE_TTL)
+        if keep <= 0:
+            return
+        now = time.time()
+        try:
+            cache.set(key, {'result': result, 'fetched_at': now, 'fresh_until': now + ttl}, timeout=keep)
+        except Exception as e:
+            logger.warning(f"[SocialProfileCache] Write failed: {e}")
+
+    @classmethod
+    def _count(cls, name: str) -> None:
+        key = cls.STATS_KEY.format(name=name)
+        try:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+        except Exception:
+            pass
+
+    @classmethod
+    def stats(cls) -> dict:
+        counts = {name: cache.get(cls.STATS_KEY.format(name=name)) or 0 for name in cls.STATS}
+        total = sum(counts.values())
+        return {
+            'hits': counts['hit'],
+            'stale_hits': counts['stale'],
+            'misses': counts['miss'],
+            'hit_rate': round((counts['hit'] + counts['stale']) / total, 4) if total else None,
+            'ttl': getattr(settings, 'SOCIAL_PROFILE_CACHE_TTL', cls.DEFAULT_TTL),
+        }
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cache.delete_many([cls.STATS_KEY.format(name=name) for name in cls.STATS])
+
+
+class SocialFetchLimitError(Exception):
+    """The caller already has SOCIAL_FETCH_MAX_PENDING fetches queued."""
+
+
 class SocialPlatformService:
     """
     Unified service for fetching profile data from any supported platform.
+
+    Fetches are paced per platform by a PacedRateLimiter shared by every
+    process (SOCIAL_FETCH_RATE_LIMITS), instead of sleeping before each one:
+    - request(): fetch now if the platform's slot is free, otherwise queue a
+      SocialFetchJob for the reserved slot. Use this from views.
+    - fetch_profile(): wait for a slot, then fetch. Workers and commands only.
+    Fresh SocialProfileCache hits skip both the limiter and the scrape.
     """
-    
-    @classmethod
-    def fetch_profile(cls, platform: str, profile_url: str) -> dict:
-        """Dispatch to the appropriate platform service with safety measures."""
-        
-        # 1. Random Jitter Delay (Anti-Blocking Rule #1 & #2)
-        # 3 to 10 seconds (Human-like behavior)
-        delay = random.uniform(3, 10)
-        logger.info(f"[Safety] Adding random delay of {delay:.2f}s before fetching {platform}...")
-        time.sleep(delay)
-        
-        handlers = {
+
+    DEFAULT_RATE_LIMIT = {'interval': 3, 'jitter': 7, 'burst': 1}
+    BLOCK_BACKOFF = 15 * 60  # seconds a platform is paused after a security stop
+    MAX_PENDING = 3  # queued fetches per caller
+
+    @staticmethod
+    def _handlers():
+        return {
             'youtube': YouTubeService.fetch_channel_data,
             'tiktok': TikTokLocalService.fetch_profile,
             'instagram': InstaloaderService.fetch_profile,
             'facebook': FacebookLocalService.fetch_profile,
         }
-        
-        handler = handlers.get(platform)
+
+    @classmethod
+    def is_supported(cls, platform: str) -> bool:
+        return platform in cls._handlers()
+
+    @classmethod
+    def limiter(cls, platform: str) -> PacedRateLimiter:
+        limits = getattr(settings, 'SOCIAL_FETCH_RATE_LIMITS', {})
+        config = {**cls.DEFAULT_RATE_LIMIT, **limits.get('default', {}), **limits.get(platform, {})}
+        return PacedRateLimiter(f'social:{platform}', **config)
+
+    @classmethod
+    def request(cls, platform: str, profile_url: str, purpose='lookup', user=None, account=None,
+                allow_stale=False, client_ip=''):
+        """
+        Answer from SocialProfileCache, else fetch now if the platform's slot
+        is free, else queue a job for it. Returns (result, job):
+        (result, None) answered now, (None, job) queued. With allow_stale, a
+        stale cached success comes back as (result, job): the job refreshes it.
+
+        A caller (`user`, else `client_ip`) that already has MAX_PENDING jobs
+        waiting gets SocialFetchLimitError instead of a rate-limit slot.
+        """
+        from .models import SocialFetchJob
+
+        if not cls.is_supported(platform):
+            return {'success': False, 'error': f'Unsupported platform: {platform}'}, None
+
+        cached = SocialProfileCache.get(platform, profile_url)
+        if cached and cached.fresh:
+            return cached.result, None
+
+        # The same fetch is already waiting: hand out that handle again
+        profile_key = SocialProfileCache.normalize(platform, profile_url) or ''
+        pending = SocialFetchJob.objects.filter(
+            purpose=purpose, platform=platform, status='PENDING', user=user, account=account,
+            **({'profile_key': profile_key} if profile_key else {'profile_url': profile_url}),
+        ).first()
+
+        if cached and allow_stale and cached.result.get('success'):
+            # Stale-while-revalidate: answer with the old data, refresh in the background
+            if pending is None and not cls._over_pending_limit(user, client_ip):
+                pending = cls._queue(
+                    platform, profile_url, profile_key, purpose, user, account, client_ip,
+                    cls.limiter(platform).reserve()
+                )
+            return cached.result, pending
+
+        if pending:
+            return None, pending
+
+        if cls._over_pending_limit(user, client_ip):
+            raise SocialFetchLimitError('Too many profile fetches are already queued, try again shortly')
+
+        delay = cls.limiter(platform).reserve()
+        if delay <= 0:
+            return cls.fetch_now(platform, profile_url), None
+
+        logger.info(f"[Safety] {platform} slot in {delay:.2f}s, queueing {purpose} of {profile_url}")
+        return None, cls._queue(platform, profile_url, profile_key, purpose, user, account, client_ip, delay)
+
+    @classmethod
+    def _over_pending_limit(cls, user, client_ip):
+        """Whether the caller already has SOCIAL_FETCH_MAX_PENDING jobs waiting. Workers have no caller."""
+        from .models import SocialFetchJob
+
+        if user is not None:
+            jobs = SocialFetchJob.objects.filter(user=user)
+        elif client_ip:
+            jobs = SocialFetchJob.objects.filter(user__isnull=True, client_ip=client_ip)
+        else:
+            return False
+        limit = getattr(settings, 'SOCIAL_FETCH_MAX_PENDING', cls.MAX_PENDING)
+        return jobs.filter(status='PENDING').count() >= limit
+
+    @staticmethod
+    def _queue(platform, profile_url, profile_key, purpose, user, account, client_ip, delay):
+        from apps.core.tasks import enqueue
+        from .models import SocialFetchJob
+
+        with transaction.atomic():
+            job = SocialFetchJob.objects.create(
+                purpose=purpose,
+                platform=platform,
+                profile_url=profile_url,
+                profile_key=profile_key,
+                user=user,
+                client_ip=client_ip,
+                account=account,
+                scheduled_for=timezone.now() + timedelta(seconds=delay),
+            )
+            enqueue('influencers.fetch_social_profile', delay=delay, job_id=job.id)
+        return job
+
+    @classmethod
+    def fetch_profile(cls, platform: str, profile_url: str, use_cache=True, max_wait=None) -> dict:
+        """
+        Wait for the platform's rate-limit slot, then fetch. Blocks: not for
+        request threads. If the slot is more than `max_wait` seconds away
+        (the platform is backing off), returns a `paused` result instead.
+        """
+        if not cls.is_supported(platform):
+            return {'success': False, 'error': f'Unsupported platform: {platform}'}
+        if use_cache:
+            cached = SocialProfileCache.get(platform, profile_url)
+            if cached and cached.fresh:
+                return cached.result
+        delay = cls.limiter(platform).reserve()
+        if max_wait is not None and delay > max_wait:
+            return {
+                'success': False,
+                'paused': True,
+                'retry_after': round(delay),
+                'error': f'{platform} fetches are paused for another {delay:.0f}s',
+            }
+        if delay:
+            logger.info(f"[Safety] Waiting {delay:.2f}s for a {platform} slot")
+            time.sleep(delay)
+        return cls.fetch_now(platform, profile_url)
+
+    @classmethod
+    def fetch_now(cls, platform: str, profile_url: str) -> dict:
+        """
+        Dispatch to the platform service and cache the result.
+        The caller must already hold a rate-limit slot.
+        """
+        handler = cls._handlers().get(platform)
         if not handler:
             return {'success': False, 'error': f'Unsupported platform: {platform}'}
         
+        result = cls._fetch(platform, profile_url, handler)
+        SocialProfileCache.set(platform, profile_url, result)
+        return result
+
+    @classmethod
+    def _fetch(cls, platform, profile_url, handler) -> dict:
         try:
             result = handler(profile_url)
             
-            # 2. Check for Security Stops (Anti-Blocking Rule #3)
-            # If the error message indicates a block, we return a special status
+            # Check for Security Stops (Anti-Blocking Rule #3)
+            # If the error message indicates a block, pause the platform for everyone
             if not result.get('success'):
                 err_msg = str(result.get('error', '')).lower()
                 if '403' in err_msg or 'forbidden' in err_msg or '429' in err_msg or 'too many requests' in err_msg:
+                    backoff = getattr(settings, 'SOCIAL_FETCH_BLOCK_BACKOFF', cls.BLOCK_BACKOFF)
+                    logger.warning(f"[Safety] {platform} is blocking us, pausing fetches for {backoff}s")
+                    cls.limiter(platform).backoff(backoff)
                     return {
                         'success': False, 
                         'security_stop': True,
@@ -765,3 +1065,268 @@ class SocialPlatformService:
         except Exception as e:
             logger.error(f"[SocialPlatformService] Unexpected Error: {e}")
             return {'success': False, 'error': str(e)}
+
+    @classmethod
+    def complete_job(cls, job, result: dict):
+        """Store a queued fetch's result and apply it to the account it was for."""
+        error = '' if result.get('success') else result.get('error', 'Failed to fetch profile data')
+
+        if job.purpose == 'connect':
+            account, error = SocialAccountService.connect(job.user, job.platform, job.profile_url, result)
+            job.account = account
+        elif job.purpose == 'sync' and result.get('success'):
+            if job.account is None:
+                error = 'Account not found'
+            else:
+                SocialAccountService.apply_profile(job.account, result['data'])
+
+        job.status = 'FAILED' if error else 'SUCCEEDED'
+        job.result = result
+        job.error = error
+        job.finished_at = timezone.now()
+        job.save(update_fields=['account', 'status', 'result', 'error', 'finished_at'])
+
+
+class SocialAccountService:
+    """Create and refresh SocialPlatformAccount rows from fetch results."""
+
+    @staticmethod
+    def fallback_profile(platform: str, profile_url: str):
+        """
+        Minimal profile (username only) extracted from the URL, for when the
+        live fetch failed. None if the URL doesn't even contain a username.
+        """
+        fallback_username = None
+        try:
+            if platform == 'tiktok':
+                fallback_username = TikTokLocalService.extract_username(profile_url)
+                if fallback_username: fallback_username = f"@{fallback_username}"
+            elif platform == 'instagram':
+                fallback_username = InstaloaderService.extract_username(profile_url)
+                if fallback_username: fallback_username = f"@{fallback_username}"
+            elif platform == 'facebook':
+                fallback_username = FacebookLocalService.extract_username(profile_url)
+            elif platform == 'youtube':
+                type_, val = YouTubeService.extract_channel_id_or_handle(profile_url)
+                fallback_username = val
+        except Exception as e:
+            print(f"[SocialConnect] Fallback Regex Failed: {e}")
+
+        if not fallback_username:
+            return None
+
+        print(f"[SocialConnect] Fallback successful. Username: {fallback_username}")
+        return {
+            'platform': platform,
+            'username': fallback_username,
+            'profile_url': profile_url,
+            'profile_picture_url': '',
+            'followers_count': 0, # Cannot verify
+            'following_count': 0,
+            'posts_count': 0,
+            'is_verified': False
+        }
+
+    @classmethod
+    def connect(cls, user, platform: str, profile_url: str, result: dict):
+        """
+        Create the user's account for `platform` from a fetch result, falling
+        back to the username in the URL if the fetch failed.
+        Returns (account, '') or (None, error).
+        """
+        from .models import SocialPlatformAccount
+
+        if result.get('success'):
+            data = result['data']
+        else:
+            print(f"[SocialConnect] Fetch Failed: {result.get('error')}. Attempting Fallback...")
+            data = cls.fallback_profile(platform, profile_url)
+            if data is None:
+                # Truly failed
+                return None, result.get('error', 'Failed to fetch profile data and could not verify URL')
+
+        try:
+            with transaction.atomic():
+                account = SocialPlatformAccount.objects.create(
+                    user=user,
+                    platform=data.get('platform', platform),
+                    platform_user_id=data.get('platform_user_id', ''),
+                    username=data.get('username', ''),
+                    profile_url=profile_url,
+                    profile_picture_url=data.get('profile_picture_url', ''),
+                    followers_count=data.get('followers_count', 0),
+                    following_count=data.get('following_count', 0),
+                    posts_count=data.get('posts_count', 0),
+                    is_verified=data.get('is_verified', False)
+                )
+        except IntegrityError:
+            return None, f'{platform.title()} account already connected'
+        cls.queue_avatar_mirror(account)
+        return account, ''
+
+    PROFILE_FIELDS = [
+        'platform_user_id', 'username', 'profile_picture_url', 'followers_count',
+        'following_count', 'posts_count', 'is_verified',
+    ]
+
+    @classmethod
+    def apply_profile(cls, account, data: dict, save=True):
+        """Update an account with freshly fetched profile data."""
+        for field in cls.PROFILE_FIELDS:
+            setattr(account, field, data.get(field, getattr(account, field)))
+        account.sync_failed_at = None
+        account.sync_error = ''
+        if save:
+            account.save()
+            cls.queue_avatar_mirror(account)
+
+    @staticmethod
+    def queue_avatar_mirror(account):
+        """Queue thumbnails of the account's picture if it changed since the last mirror."""
+        from apps.core.tasks import enqueue
+
+        if account.needs_picture_mirror:
+            enqueue('influencers.mirror_social_avatar', account_id=account.id)
+
+
+class SocialAccountRefreshService:
+    """
+    Bulk refresh of connected accounts, stalest first.
+
+    Accounts are split into one lane per platform. Each lane has its own
+    workers (SOCIAL_REFRESH_CONCURRENCY) and is paced by the platform's
+    shared rate limiter, so the refresher and web traffic stay within the
+    same spacing together. A security stop (or a platform that is still
+    backing off) pauses that lane for the rest of the pass; the other lanes
+    keep going. Results are written from the calling thread with
+    bulk_update, in batches.
+    """
+
+    BATCH_SIZE = 50
+    MAX_WAIT = 120  # seconds a lane waits for a slot before treating the platform as paused
+    UPDATE_FIELDS = SocialAccountService.PROFILE_FIELDS + ['last_synced_at', 'sync_failed_at', 'sync_error']
+
+    @classmethod
+    def due_accounts(cls, older_than: timedelta, platforms=None, limit=None):
+        """Accounts not synced within `older_than` (failures back off as long), stalest first."""
+        from .models import SocialPlatformAccount
+
+        cutoff = timezone.now() - older_than
+        supported = [platform for platform in (platforms or SocialPlatformService._handlers())
+                     if SocialPlatformService.is_supported(platform)]
+        queryset = (
+            SocialPlatformAccount.objects
+            .filter(platform__in=supported, last_synced_at__lt=cutoff)
+            .filter(Q(sync_failed_at__isnull=True) | Q(sync_failed_at__lt=cutoff))
+            .exclude(profile_url='')
+            .only('id', 'platform', 'profile_url', *cls.UPDATE_FIELDS)
+            .order_by('last_synced_at', 'id')
+        )
+        return list(queryset[:limit] if limit else queryset)
+
+    @staticmethod
+    def lane_concurrency(platform: str) -> int:
+        config = getattr(settings, 'SOCIAL_REFRESH_CONCURRENCY', {})
+        return max(int(config.get(platform, config.get('default', 1))), 1)
+
+    @classmethod
+    def run(cls, accounts, concurrency=None, max_wait=None, use_cache=True) -> dict:
+        """
+        Refresh `accounts`. `concurrency` overrides lane sizes per platform.
+        Returns counts and throughput, overall and per platform.
+        """
+        from .models import SocialPlatformAccount
+
+        concurrency = concurrency or {}
+        max_wait = cls.MAX_WAIT if max_wait is None else max_wait
+        lanes = {}
+        for account in accounts:
+            lanes.setdefault(account.platform, deque()).append(account)
+        paused = {platform: threading.Event() for platform in lanes}
+        results = queue.Queue()
+        started = time.monotonic()
+
+        def lane_worker(platform):
+            lane = lanes[platform]
+            try:
+                while not paused[platform].is_set():
+                    try:
+                        account = lane.popleft()
+                    except IndexError:
+                        return
+                    result = SocialPlatformService.fetch_profile(
+                        platform, account.profile_url, use_cache=use_cache, max_wait=max_wait
+                    )
+                    if result.get('security_stop') or result.get('paused'):
+                        # Not the account's fault: leave it for the next pass
+                        logger.warning(f"[SocialRefresh] Pausing {platform} lane: {result.get('error')}")
+                        paused[platform].set()
+                        lane.appendleft(account)
+                        return
+                    results.put((account, result))
+            finally:
+                connection.close()
+
+        stats = {
+            platform: {'accounts': len(lane), 'succeeded': 0, 'failed': 0, 'skipped': 0, 'paused': False}
+            for platform, lane in lanes.items()
+        }
+        pending = []
+
+        def flush():
+            if not pending:
+                return
+            now = timezone.now()
+            for account, result in pending:
+                if result.get('success'):
+                    SocialAccountService.apply_profile(account, result['data'], save=False)
+                    account.last_synced_at = now  # bulk_update skips auto_now
+                    stats[account.platform]['succeeded'] += 1
+                else:
+                    account.sync_failed_at = now
+                    account.sync_error = str(result.get('error', 'Unknown error'))[:255]
+                    stats[account.platform]['failed'] += 1
+            SocialPlatformAccount.objects.bulk_update(
+                [account for account, _ in pending], cls.UPDATE_FIELDS, batch_size=cls.BATCH_SIZE
+            )
+            for account, result in pending:
+                if result.get('success'):
+                    SocialAccountService.queue_avatar_mirror(account)
+            pending.clear()
+
+        workers = sum(concurrency.get(platform) or cls.lane_concurrency(platform) for platform in lanes)
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix='social-refresh') as pool:
+            futures = [
+                pool.submit(lane_worker, platform)
+                for platform in lanes
+                for _ in range(concurrency.get(platform) or cls.lane_concurrency(platform))
+            ]
+            while True:
+                try:
+                    pending.append(results.get(timeout=0.5))
+                except queue.Empty:
+                    if all(future.done() for future in futures) and results.empty():
+                        break
+                    continue
+                if len(pending) >= cls.BATCH_SIZE:
+                    flush()
+            flush()
+            for future in futures:
+                future.result()
+
+        for platform, lane in lanes.items():
+            stats[platform]['skipped'] = len(lane)
+            stats[platform]['paused'] = paused[platform].is_set()
+
+        elapsed = time.monotonic() - started
+        processed = sum(entry['succeeded'] + entry['failed'] for entry in stats.values())
+        return {
+            'accounts': len(accounts),
+            'processed': processed,
+            'succeeded': sum(entry['succeeded'] for entry in stats.values()),
+            'failed': sum(entry['failed'] for entry in stats.values()),
+            'skipped': sum(entry['skipped'] for entry in stats.values()),
+            'elapsed': elapsed,
+            'per_minute': processed / elapsed * 60 if elapsed else 0.0,
+            'platforms': stats,
+        }
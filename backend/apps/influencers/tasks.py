@@ -0,0 +1,100 @@
+"""
+Background tasks for influencer profiles (run by `manage.py run_tasks`).
+"""
+
+import logging
+
+from apps.core.avatars import AvatarMirrorError, mirror_avatar
+from apps.core.tasks import task
+
+from .models import InfluencerProfile, SocialFetchJob, SocialPlatformAccount
+
+logger = logging.getLogger(__name__)
+
+
+@task('influencers.ocr_documents', max_concurrency=2, max_attempts=3, base_backoff=60)
+def ocr_documents(profile_id):
+    """
+    Read the ID card number and bank account from the registration documents.
+    Queued by RegistrationSubmitView in the same transaction as the profile,
+    so the profile always exists by the time this runs (unless deleted since).
+    Storage errors and Gemini capacity errors (GeminiBusyError) raise and are
+    retried; unreadable documents are skipped.
+    """
+    from apps.api.services.gemini import GeminiService
+
+    profile = InfluencerProfile.objects.filter(pk=profile_id).first()
+    if profile is None:
+        logger.info(f"[OCR] Profile #{profile_id} no longer exists, skipping")
+        return
+
+    updated = []
+
+    if profile.id_card_front:
+        with profile.id_card_front.open('rb') as f:
+            id_data = GeminiService.extract_document_data(f, 'id_card')
+        if id_data and id_data.get('identification_number'):
+            profile.identification_number = id_data['identification_number']
+            updated.append('identification_number')
+
+    if profile.bank_book:
+        with profile.bank_book.open('rb') as f:
+            bank_data = GeminiService.extract_document_data(f, 'bank_book')
+        if bank_data:
+            if bank_data.get('bank_name'):
+                profile.bank_name = bank_data['bank_name']
+                updated.append('bank_name')
+            if bank_data.get('account_number'):
+                profile.bank_account_number = bank_data['account_number']
+                updated.append('bank_account_number')
+
+    if updated:
+        profile.save(update_fields=updated + ['updated_at'])
+    logger.info(f"[OCR] Profile #{profile_id}: updated {', '.join(updated) or 'nothing'}")
+
+
+@task('influencers.fetch_social_profile', max_concurrency=4, max_attempts=3, base_backoff=60)
+def fetch_social_profile(job_id):
+    """
+    Run a social profile fetch that was queued for its platform's rate-limit
+    slot (see SocialPlatformService.request). The task is enqueued with the
+    slot's delay, so the fetch itself doesn't wait again.
+    """
+    from .services import SocialPlatformService
+
+    job = (
+        SocialFetchJob.objects.select_related('user', 'account')
+        .filter(pk=job_id, status='PENDING').first()
+    )
+    if job is None:
+        logger.info(f"[SocialFetch] Job #{job_id} is gone or already finished, skipping")
+        return
+
+    result = SocialPlatformService.fetch_now(job.platform, job.profile_url)
+    SocialPlatformService.complete_job(job, result)
+    logger.info(f"[SocialFetch] Job #{job.id} ({job.purpose} {job.platform}): {job.status}")
+
+
+@task('influencers.mirror_social_avatar', max_concurrency=2, max_attempts=3, base_backoff=60)
+def mirror_social_avatar(account_id):
+    """
+    Store thumbnails of a social account's profile picture. Queued whenever a
+    fetch brings a new profile_picture_url. Network errors raise and are
+    retried; a picture that is gone or unreadable is skipped.
+    """
+    account = SocialPlatformAccount.objects.filter(pk=account_id).first()
+    if account is None or not account.needs_picture_mirror:
+        return
+
+    source_url = account.profile_picture_url
+    try:
+        avatar = mirror_avatar(source_url, f'social/{account.platform}')
+    except AvatarMirrorError as e:
+        logger.warning(f"[Avatars] Account #{account_id}: profile picture not mirrored: {e}")
+        return
+
+    SocialPlatformAccount.objects.filter(pk=account_id, profile_picture_url=source_url).update(
+        profile_picture_small_url=avatar.small_url,
+        profile_picture_medium_url=avatar.medium_url,
+        profile_picture_mirrored_from=source_url,
+    )
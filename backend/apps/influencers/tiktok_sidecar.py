@@ -0,0 +1,284 @@
+"""
+TikTok lookup sidecar.
+
+Starting a Playwright browser for TikTokApi takes several seconds, so it
+must not happen per lookup inside a web worker. `manage.py run_tiktok_sidecar`
+runs a separate process that keeps a warm pool of TikTokApi sessions and
+answers lookups over a local socket; Django only makes a short RPC
+(`TikTokSidecarClient`).
+
+- Each pool worker owns one TikTokApi instance (one browser session) and
+  serves many usernames with it.
+- A session is recycled (closed and re-created) after an error, and after
+  `max_requests` lookups so a long-lived browser can't degrade forever.
+- Protocol: one JSON object per line, in both directions.
+    {"op": "user_info", "username": "..."}  ->  {"ok": true, "user_info": {...}}
+                                            ->  {"ok": false, "error": "..."}
+    {"op": "ping"}                          ->  {"ok": true, "stats": {...}}
+
+The address is TIKTOK_SIDECAR_ADDRESS: "host:port" or "unix:/path/to.sock".
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TikTokSidecarError(Exception):
+    """The sidecar could not be reached or did not answer in time."""
+
+
+def parse_address(address):
+    """('unix', path) or ('tcp', (host, port))."""
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return 'tcp', (host or '127.0.0.1', int(port))
+
+
+# ----------------------------------------------------------------------
+# Client (Django side)
+# ----------------------------------------------------------------------
+
+class TikTokSidecarClient:
+    """
+    Usage:
+        TikTokSidecarClient.from_settings().user_info('username')
+
+    One short-lived connection per call: on a local socket that costs far
+    less than a lookup and keeps the client safe to use from any thread.
+    """
+
+    DEFAULT_TIMEOUT = 30
+
+    def __init__(self, address, timeout=DEFAULT_TIMEOUT):
+        self.address = address
+        self.timeout = timeout
+
+    @classmethod
+    def from_settings(cls):
+        from django.conf import settings
+
+        address = getattr(settings, 'TIKTOK_SIDECAR_ADDRESS', '')
+        if not address:
+            return None
+        return cls(address, timeout=getattr(settings, 'TIKTOK_SIDECAR_TIMEOUT', cls.DEFAULT_TIMEOUT))
+
+    def call(self, payload):
+        family, target = parse_address(self.address)
+        try:
+            if family == 'unix':
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                sock.connect(target)
+            else:
+                sock = socket.create_connection(target, timeout=self.timeout)
+        except OSError as e:
+            raise TikTokSidecarError(f"TikTok sidecar unreachable at {self.address}: {e}")
+
+        try:
+            with sock, sock.makefile('rwb') as stream:
+                stream.write(json.dumps(payload).encode('utf-8') + b'\n')
+                stream.flush()
+                line = stream.readline()
+        except OSError as e:
+            raise TikTokSidecarError(f"TikTok sidecar request failed: {e}")
+        if not line:
+            raise TikTokSidecarError("TikTok sidecar closed the connection")
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise TikTokSidecarError(f"TikTok sidecar sent an invalid response: {e}")
+
+    def user_info(self, username):
+        """Raw TikTokApi user info dict. Raises TikTokSidecarError or returns {'ok': False, ...}."""
+        return self.call({'op': 'user_info', 'username': username})
+
+    def ping(self):
+        return self.call({'op': 'ping'})
+
+
+# ----------------------------------------------------------------------
+# Server (sidecar process)
+# ----------------------------------------------------------------------
+
+class SessionWorker:
+    """One warm TikTokApi session, serving lookups from the shared queue."""
+
+    def __init__(self, index, pool):
+        self.index = index
+        self.pool = pool
+        self.api = None
+        self.served = 0
+
+    async def create_api(self):
+        from TikTokApi import TikTokApi
+
+        api = TikTokApi()
+        ms_token = os.getenv('TIKTOK_MS_TOKEN')
+        await api.create_sessions(
+            ms_tokens=[ms_token] if ms_token else [],
+            num_sessions=1,
+            sleep_after=3,
+            headless=True,
+            browser=self.pool.browser,
+        )
+        return api
+
+    async def lookup(self, username):
+        return await self.api.user(username).info()
+
+    async def close(self):
+        if self.api is not None:
+            try:
+                await self.api.close_sessions()
+            except Exception as e:
+                logger.debug(f"[TikTokSidecar] Session {self.index}: error while closing: {e}")
+        self.api = None
+        self.served = 0
+
+    async def ensure_session(self):
+        if self.api is None:
+            started = time.monotonic()
+            self.api = await self.create_api()
+            self.pool.stats['sessions_created'] += 1
+            logger.info(f"[TikTokSidecar] Session {self.index} ready in {time.monotonic() - started:.1f}s")
+
+    async def recycle(self):
+        """Replace the session now, so the next lookup finds a warm one."""
+        await self.close()
+        try:
+            await self.ensure_session()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[TikTokSidecar] Session {self.index} failed to restart (retried on next lookup): {e}")
+
+    async def run(self):
+        while True:
+            username, future = await self.pool.queue.get()
+            try:
+                if future.cancelled():
+                    continue
+                try:
+                    await self.ensure_session()
+                    user_info = await self.lookup(username)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.pool.stats['errors'] += 1
+                    logger.warning(f"[TikTokSidecar] Session {self.index}: {username} failed, recycling: {e}")
+                    if not future.done():
+                        future.set_result({'ok': False, 'error': f"{type(e).__name__}: {e}"})
+                    await self.recycle()
+                    continue
+
+                self.served += 1
+                self.pool.stats['served'] += 1
+                if not future.done():
+                    future.set_result({'ok': True, 'user_info': user_info})
+                if self.served >= self.pool.max_requests:
+                    logger.info(f"[TikTokSidecar] Session {self.index} served {self.served} lookups, recycling")
+                    await self.recycle()
+            finally:
+                self.pool.queue.task_done()
+
+
+class TikTokSidecarServer:
+    """Socket front end plus `sessions` SessionWorkers sharing one request queue."""
+
+    REQUEST_TIMEOUT = 25
+    worker_class = SessionWorker
+
+    def __init__(self, address, sessions=2, max_requests=200, browser='webkit', request_timeout=REQUEST_TIMEOUT):
+        self.address = address
+        self.sessions = max(sessions, 1)
+        self.max_requests = max(max_requests, 1)
+        self.browser = browser
+        self.request_timeout = request_timeout
+        self.queue = None
+        self.workers = []
+        self.stats = {'served': 0, 'errors': 0, 'timeouts': 0, 'sessions_created': 0}
+        self.started_at = time.time()
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self.workers = [self.worker_class(index, self) for index in range(self.sessions)]
+        # Warm every session up front (failures are retried on first use)
+        results = await asyncio.gather(*(worker.ensure_session() for worker in self.workers), return_exceptions=True)
+        for worker, result in zip(self.workers, results):
+            if isinstance(result, Exception):
+                logger.warning(f"[TikTokSidecar] Session {worker.index} failed to start: {result}")
+        self.tasks = [asyncio.create_task(worker.run()) for worker in self.workers]
+
+        family, target = parse_address(self.address)
+        if family == 'unix':
+            if os.path.exists(target):
+                os.unlink(target)
+            self.server = await asyncio.start_unix_server(self.handle_connection, path=target)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host=target[0], port=target[1])
+        return self.server
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await asyncio.gather(*(worker.close() for worker in self.workers), return_exceptions=True)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    def snapshot(self):
+        return {
+            **self.stats,
+            'sessions': self.sessions,
+            'warm_sessions': sum(1 for worker in self.workers if worker.api is not None),
+            'queued': self.queue.qsize() if self.queue else 0,
+            'uptime_seconds': round(time.time() - self.started_at),
+        }
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_request(line)
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {'ok': False, 'error': 'Invalid JSON'}
+
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'stats': self.snapshot()}
+        if op != 'user_info' or not request.get('username'):
+            return {'ok': False, 'error': f"Unsupported request: {op}"}
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((request['username'], future))
+        try:
+            return await asyncio.wait_for(future, timeout=self.request_timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            return {'ok': False, 'error': f"Lookup timed out after {self.request_timeout}s"}
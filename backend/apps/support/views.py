@@ -1,9 +1,18 @@
 from rest_framework import generics, status, permissions
+from rest_framework.exceptions import APIException
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from .models import SupportTicket
 from .serializers import SupportTicketSerializer
 from .services import GitHubService
+from apps.core.storage import upload_files, StorageUploadError
+
+
+class AttachmentUploadFailed(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Could not upload attachments, please try again.'
+    default_code = 'upload_failed'
+
 
 class TicketCreateView(generics.CreateAPIView):
     """
@@ -15,22 +24,23 @@ class TicketCreateView(generics.CreateAPIView):
     parser_classes = [MultiPartParser, FormParser]
 
     def perform_create(self, serializer):
-        from django.core.files.storage import default_storage
-        from django.conf import settings
         import os
         import uuid
 
-        # 1. Handle File Uploads
+        # 1. Handle File Uploads (concurrently; all or nothing)
         attachments = []
         files = self.request.FILES.getlist('files')
         
-        for f in files:
-            # Generate unique filename
-            ext = os.path.splitext(f.name)[1]
-            filename = f"support/{uuid.uuid4()}{ext}"
-            path = default_storage.save(filename, f)
-            url = default_storage.url(path)
-            
+        try:
+            # Generate unique filenames
+            uploaded = upload_files([
+                (f"support/{uuid.uuid4()}{os.path.splitext(f.name)[1]}", f) for f in files
+            ])
+        except StorageUploadError as e:
+            print(f"[Support] Attachment upload failed: {e}")
+            raise AttachmentUploadFailed()
+        
+        for _, url in uploaded:
             # Ensure absolute URL for GitHub
             if not url.startswith('http'):
                 request = self.request
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from django.utils import timezone
+from .models import User, LineMessage
 
 
 @admin.register(User)
@@ -14,10 +15,14 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ['status', 'is_staff', 'is_superuser', 'created_at']
     search_fields = ['username', 'display_name', 'line_user_id', 'email']
     ordering = ['-created_at']
+    readonly_fields = ['picture_small_url', 'picture_medium_url', 'picture_mirrored_from']
     
     fieldsets = (
         (None, {'fields': ('username', 'password')}),
-        ('ข้อมูล LINE', {'fields': ('line_user_id', 'display_name', 'picture_url')}),
+        ('ข้อมูล LINE', {'fields': (
+            'line_user_id', 'display_name', 'picture_url',
+            'picture_small_url', 'picture_medium_url', 'picture_mirrored_from',
+        )}),
         ('สถานะ', {'fields': ('status', 'rejection_reason')}),
         ('ข้อมูลส่วนตัว', {'fields': ('first_name', 'last_name', 'email')}),
         ('สิทธิ์การใช้งาน', {'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions')}),
@@ -36,7 +41,7 @@ class UserAdmin(BaseUserAdmin):
     @admin.action(description='อนุมัติผู้ใช้ที่เลือก')
     def approve_users(self, request, queryset):
         # Update status first
-        count = queryset.update(status='APPROVED', rejection_reason='')
+        count = queryset.update(status='APPROVED', rejection_reason='', updated_at=timezone.now())
         
         # Send notifications
         from .services import LineMessagingService
@@ -51,7 +56,7 @@ class UserAdmin(BaseUserAdmin):
     @admin.action(description='ปฏิเสธผู้ใช้ที่เลือก')
     def reject_users(self, request, queryset):
         # Update status first
-        count = queryset.update(status='REJECTED')
+        count = queryset.update(status='REJECTED', updated_at=timezone.now())
         
         # Send notifications
         from .services import LineMessagingService
@@ -65,3 +70,28 @@ class UserAdmin(BaseUserAdmin):
                 success_count += 1
                 
         self.message_user(request, f'ปฏิเสธ {count} ผู้ใช้เรียบร้อย ส่งแจ้งเตือนแล้ว {success_count} รายการ')
+
+
+@admin.register(LineMessage)
+class LineMessageAdmin(admin.ModelAdmin):
+    """LINE outbox: delivery status of queued push messages."""
+    
+    list_display = ['id', 'category', 'user', 'status', 'attempts', 'last_status_code', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'category', 'created_at']
+    search_fields = ['line_user_id', 'user__display_name']
+    readonly_fields = [
+        'user', 'line_user_id', 'messages', 'category', 'status', 'retry_key', 'attempts',
+        'next_attempt_at', 'last_status_code', 'last_error', 'created_at', 'sent_at'
+    ]
+    list_select_related = ['user']
+    actions = ['retry_messages']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.action(description='ส่งข้อความที่เลือกอีกครั้ง')
+    def retry_messages(self, request, queryset):
+        count = queryset.exclude(status='SENT').update(
+            status='PENDING', attempts=0, next_attempt_at=timezone.now(), last_error=''
+        )
+        self.message_user(request, f'เข้าคิวส่งใหม่ {count} ข้อความ')
@@ -0,0 +1,110 @@
+"""
+Local stub of the LINE Messaging API, for delivery throughput benchmarks.
+
+Accepts push and multicast calls, sleeps `latency` seconds per request to
+emulate the round trip, and counts what it receives. Point
+LINE_API_BASE_URL at `server.base_url` to use it.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so pooled sessions are measurable
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+        time.sleep(stub.latency)
+
+        if self.path.endswith('/message/multicast'):
+            kind, recipients = 'multicast', len(body.get('to', []))
+        elif self.path.endswith('/message/push'):
+            kind, recipients = 'push', 1
+        else:
+            self._reply(404, {'message': 'Not found'})
+            return
+
+        if stub.record(kind, recipients):
+            self._reply(429, {'message': 'The API rate limit has been exceeded.'}, {'Retry-After': '1'})
+        else:
+            self._reply(200, {})
+
+    def _reply(self, code, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class LineStubServer:
+    """
+    Usage:
+        with LineStubServer(latency=0.05) as stub:
+            ... settings.LINE_API_BASE_URL = stub.base_url ...
+            stub.stats()
+    `rate_limit_every=N` answers every Nth request with 429 (Retry-After: 1).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.05, rate_limit_every=0):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+        self.reset()
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def reset(self):
+        with self._lock:
+            self._counts = {'requests': 0, 'push': 0, 'multicast': 0, 'recipients': 0, 'rate_limited': 0}
+
+    def record(self, kind, recipients):
+        """Count one request. Returns True if it should be rate limited."""
+        with self._lock:
+            self._counts['requests'] += 1
+            if self.rate_limit_every and self._counts['requests'] % self.rate_limit_every == 0:
+                self._counts['rate_limited'] += 1
+                return True
+            self._counts[kind] += 1
+            self._counts['recipients'] += recipients
+            return False
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='line-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
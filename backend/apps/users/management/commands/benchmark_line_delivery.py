@@ -0,0 +1,68 @@
+import time
+
+import requests
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from apps.users.line_stub import LineStubServer
+from apps.users.services import LineBulkDeliveryService, LineMessagingService
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark bulk LINE delivery against a local stub server. '
+        'Compares one fresh requests.post per recipient (old BulkSendMessageView) '
+        'with LineBulkDeliveryService (multicast grouping + pooled concurrent pushes).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=300, help='Recipients (default: 300)')
+        parser.add_argument('--shared-ratio', type=float, default=0.5,
+                            help='Share of recipients receiving the same broadcast text (default: 0.5)')
+        parser.add_argument('--latency', type=float, default=0.05, help='Stub latency per request in seconds (default: 0.05)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Bulk engine concurrency (default: 8)')
+
+    def handle(self, *args, **options):
+        recipients = self.build_recipients(options['recipients'], options['shared_ratio'])
+
+        with LineStubServer(latency=options['latency']) as stub, \
+                override_settings(LINE_API_BASE_URL=stub.base_url, LINE_CHANNEL_ACCESS_TOKEN='benchmark'):
+            legacy_seconds = self.run_legacy(recipients)
+            legacy_stats = stub.stats()
+
+            stub.reset()
+            started = time.perf_counter()
+            results = LineBulkDeliveryService.deliver(recipients, concurrency=options['concurrency'])
+            bulk_seconds = time.perf_counter() - started
+            bulk_stats = stub.stats()
+
+        sent = sum(1 for result in results.values() if result['status'] == 'sent')
+        self.stdout.write(f"\n{'Path':<28}{'Seconds':>10}{'HTTP calls':>12}{'Msg/s':>10}")
+        for label, seconds, stats in (
+            ('legacy: sequential push', legacy_seconds, legacy_stats),
+            ('bulk engine', bulk_seconds, bulk_stats),
+        ):
+            self.stdout.write(f"{label:<28}{seconds:>10.2f}{stats['requests']:>12}{len(recipients) / seconds:>10.0f}")
+        self.stdout.write(
+            f"\nBulk engine: {bulk_stats['multicast']} multicast + {bulk_stats['push']} push calls, "
+            f"{sent}/{len(recipients)} delivered, {legacy_seconds / bulk_seconds:.1f}x faster"
+        )
+
+    @staticmethod
+    def build_recipients(count, shared_ratio):
+        shared = int(count * shared_ratio)
+        recipients = []
+        for i in range(count):
+            text = 'Campaign update for everyone' if i < shared else f'Hi creator {i}, please send your draft'
+            recipients.append((i, f'U{i:032d}', [{'type': 'text', 'text': text}]))
+        return recipients
+
+    @staticmethod
+    def run_legacy(recipients):
+        """One new connection and one push per recipient, in sequence."""
+        url = LineMessagingService.api_url(LineMessagingService.PUSH_PATH)
+        headers = {'Content-Type': 'application/json', 'Authorization': 'Bearer benchmark'}
+        started = time.perf_counter()
+        for _, line_user_id, messages in recipients:
+            requests.post(url, headers=headers, json={'to': line_user_id, 'messages': messages}, timeout=10)
+        return time.perf_counter() - started
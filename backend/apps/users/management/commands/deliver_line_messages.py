@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.users.services import LineOutboxService
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued LINE messages from the outbox (retries with backoff, honours 429 Retry-After)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and deliver messages as they become due'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=5,
+            help='Maximum seconds to sleep between checks in loop mode (default: 5)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=LineOutboxService.BATCH_SIZE,
+            help='Messages to claim per round'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.LINE_CHANNEL_ACCESS_TOKEN:
+            self.stdout.write(self.style.WARNING("LINE_CHANNEL_ACCESS_TOKEN is not set; messages will stay queued"))
+
+        if not options['loop']:
+            self.run_once(options['batch_size'])
+            return
+
+        self.stdout.write(f"[{timezone.now().isoformat()}] LINE outbox worker started (interval {options['interval']}s)")
+        try:
+            while True:
+                close_old_connections()
+                self.run_once(options['batch_size'], quiet=True)
+
+                wait = LineOutboxService.seconds_until_next_due()
+                sleep_for = options['interval'] if wait is None else min(max(wait, 0.5), options['interval'])
+                time.sleep(sleep_for)
+        except KeyboardInterrupt:
+            self.stdout.write("LINE outbox worker stopped")
+
+    def run_once(self, batch_size, quiet=False):
+        counts = LineOutboxService.deliver_due(batch_size=batch_size)
+        if quiet and not any(counts.values()):
+            return
+        self.stdout.write(
+            f"[{timezone.now().isoformat()}] Sent {counts['sent']}, "
+            f"retrying {counts['retrying']}, failed {counts['failed']}"
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.line_stub import LineStubServer
+
+
+class Command(BaseCommand):
+    help = 'Run a local stub of the LINE Messaging API (set LINE_API_BASE_URL to the printed URL)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8099, help='Port to listen on (default: 8099)')
+        parser.add_argument('--latency', type=float, default=0.05, help='Seconds to wait per request (default: 0.05)')
+        parser.add_argument('--rate-limit-every', type=int, default=0, help='Answer every Nth request with 429')
+
+    def handle(self, *args, **options):
+        server = LineStubServer(port=options['port'], latency=options['latency'], rate_limit_every=options['rate_limit_every'])
+        self.stdout.write(f"LINE stub listening on {server.base_url} (latency {options['latency']}s)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(f"Stopped. {server.stats()}")
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_user_status_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LineMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('line_user_id', models.CharField(max_length=100, verbose_name='LINE User ID')),
+                ('messages', models.JSONField(help_text='LINE message objects', verbose_name='ข้อความ')),
+                ('category', models.CharField(blank=True, help_text='What triggered the message, e.g. campaign_status', max_length=50, verbose_name='ประเภท')),
+                ('status', models.CharField(choices=[('PENDING', 'รอส่ง'), ('SENT', 'ส่งแล้ว'), ('FAILED', 'ส่งไม่สำเร็จ')], default='PENDING', max_length=10, verbose_name='สถานะ')),
+                ('retry_key', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Sent as X-Line-Retry-Key so retries are never delivered twice', verbose_name='Retry Key')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='จำนวนครั้งที่ลอง')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='ลองครั้งถัดไป')),
+                ('last_status_code', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='HTTP Status ล่าสุด')),
+                ('last_error', models.TextField(blank=True, verbose_name='ข้อผิดพลาดล่าสุด')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='สร้างเมื่อ')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='ส่งเมื่อ')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='line_messages', to=settings.AUTH_USER_MODEL, verbose_name='ผู้รับ')),
+            ],
+            options={
+                'verbose_name': 'ข้อความ LINE (Outbox)',
+                'verbose_name_plural': 'ข้อความ LINE (Outbox)',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='linemessage_due_idx')],
+            },
+        ),
+    ]
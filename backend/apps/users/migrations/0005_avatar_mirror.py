@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_linemessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='picture_medium_url',
+            field=models.URLField(blank=True, help_text='Medium thumbnail of picture_url in our storage', max_length=1000, verbose_name='รูปโปรไฟล์ (กลาง)'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='picture_mirrored_from',
+            field=models.URLField(blank=True, help_text='picture_url the thumbnails were made from', max_length=1000, verbose_name='ต้นฉบับรูปโปรไฟล์'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='picture_small_url',
+            field=models.URLField(blank=True, help_text='Small thumbnail of picture_url in our storage', max_length=1000, verbose_name='รูปโปรไฟล์ (เล็ก)'),
+        ),
+    ]
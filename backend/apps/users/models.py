@@ -2,8 +2,11 @@
 Custom User model for LINE LIFF authentication.
 """
 
+import uuid
+
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
@@ -83,6 +86,24 @@ class User(AbstractUser):
         help_text="Profile picture URL from LINE",
         verbose_name="รูปโปรไฟล์"
     )
+    picture_small_url = models.URLField(
+        max_length=1000,
+        blank=True,
+        help_text="Small thumbnail of picture_url in our storage",
+        verbose_name="รูปโปรไฟล์ (เล็ก)"
+    )
+    picture_medium_url = models.URLField(
+        max_length=1000,
+        blank=True,
+        help_text="Medium thumbnail of picture_url in our storage",
+        verbose_name="รูปโปรไฟล์ (กลาง)"
+    )
+    picture_mirrored_from = models.URLField(
+        max_length=1000,
+        blank=True,
+        help_text="picture_url the thumbnails were made from",
+        verbose_name="ต้นฉบับรูปโปรไฟล์"
+    )
     status = models.CharField(
         max_length=20,
         choices=STATUS_CHOICES,
@@ -105,10 +126,23 @@ class User(AbstractUser):
         verbose_name = 'ผู้ใช้งาน'
         verbose_name_plural = 'ผู้ใช้งานทั้งหมด'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the influencer approval list
+            models.Index(fields=['status', '-created_at', 'id'], name='user_status_keyset_idx'),
+        ]
     
     def __str__(self):
         return f"{self.display_name or self.username} ({self.line_user_id})"
     
+    def avatar_url(self, size='medium'):
+        """Our mirrored thumbnail ('small' or 'medium'), or LINE's URL until it is mirrored."""
+        mirrored = self.picture_small_url if size == 'small' else self.picture_medium_url
+        return mirrored or self.picture_url
+
+    @property
+    def needs_picture_mirror(self):
+        return bool(self.picture_url) and self.picture_url != self.picture_mirrored_from
+
     @property
     def is_approved(self):
         """Check if user is approved to access platform features."""
@@ -141,3 +175,66 @@ class User(AbstractUser):
         if self.status == 'NEW':
             self.status = 'PENDING'
             self.save(update_fields=['status', 'updated_at'])
+
+
+class LineMessage(models.Model):
+    """
+    Outbox of LINE push messages.
+
+    Rows are written in the same transaction as the change that caused them
+    and delivered afterwards by `manage.py deliver_line_messages`, so request
+    latency and row locks never depend on the LINE API.
+    """
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'รอส่ง'),
+        ('SENT', 'ส่งแล้ว'),
+        ('FAILED', 'ส่งไม่สำเร็จ'),
+    ]
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='line_messages',
+        verbose_name="ผู้รับ"
+    )
+    line_user_id = models.CharField(max_length=100, verbose_name="LINE User ID")
+    messages = models.JSONField(help_text="LINE message objects", verbose_name="ข้อความ")
+    category = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text="What triggered the message, e.g. campaign_status",
+        verbose_name="ประเภท"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='PENDING',
+        verbose_name="สถานะ"
+    )
+    retry_key = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        help_text="Sent as X-Line-Retry-Key so retries are never delivered twice",
+        verbose_name="Retry Key"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="จำนวนครั้งที่ลอง")
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name="ลองครั้งถัดไป")
+    last_status_code = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="HTTP Status ล่าสุด")
+    last_error = models.TextField(blank=True, verbose_name="ข้อผิดพลาดล่าสุด")
+    
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="สร้างเมื่อ")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="ส่งเมื่อ")
+    
+    class Meta:
+        verbose_name = 'ข้อความ LINE (Outbox)'
+        verbose_name_plural = 'ข้อความ LINE (Outbox)'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='linemessage_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.category or 'message'} -> {self.line_user_id} ({self.status})"
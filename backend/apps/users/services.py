@@ -1,15 +1,44 @@
-import requests
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
 from django.conf import settings
+from django.db import close_old_connections, connection, transaction
 from django.utils import timezone
 
+from apps.core import http
+
+logger = logging.getLogger(__name__)
+
 class LineMessagingService:
     """Service for sending LINE messages."""
     
-    BASE_URL = 'https://api.line.me/v2/bot/message/push'
+    PUSH_PATH = '/v2/bot/message/push'
+    MULTICAST_PATH = '/v2/bot/message/multicast'
+    MULTICAST_LIMIT = 500  # LINE API maximum recipients per multicast
+    TIMEOUT = 10
     
     @classmethod
-    def send_push_message(cls, line_user_id, messages):
-        """Send push message to specific user."""
+    def api_url(cls, path):
+        return f"{settings.LINE_API_BASE_URL.rstrip('/')}{path}"
+    
+    @classmethod
+    def get_session(cls):
+        """Shared keep-alive session for the Messaging API, sized for concurrent bulk sends."""
+        return http.session_for(cls.api_url(''), pool_size=getattr(settings, 'LINE_HTTP_POOL_SIZE', 16))
+    
+    @classmethod
+    def _post(cls, path, data, retry_key=None):
+        """
+        POST to the Messaging API. Returns {'success', 'status_code', 'error'}
+        plus `retry_after` seconds for 429.
+        """
         if not settings.LINE_CHANNEL_ACCESS_TOKEN:
             print("❌ LINE Channel Access Token not found")
             return {'success': False, 'error': 'LINE Channel Access Token not configured'}
@@ -18,23 +47,75 @@ class LineMessagingService:
             'Content-Type': 'application/json',
             'Authorization': f'Bearer {settings.LINE_CHANNEL_ACCESS_TOKEN}'
         }
+        if retry_key:
+            headers['X-Line-Retry-Key'] = str(retry_key)
         
-        data = {
-            'to': line_user_id,
-            'messages': messages
-        }
+        response = cls.get_session().post(cls.api_url(path), headers=headers, json=data, timeout=cls.TIMEOUT)
+        if response.status_code == 200:
+            return {'success': True, 'status_code': 200}
+        elif response.status_code == 409 and retry_key:
+            # Already accepted under this retry key
+            return {'success': True, 'status_code': 409}
+        result = {'success': False, 'status_code': response.status_code, 'error': response.text}
+        if response.status_code == 429:
+            result['retry_after'] = cls._parse_retry_after(response.headers.get('Retry-After'))
+        return result
+    
+    @classmethod
+    def send_push_message(cls, line_user_id, messages, retry_key=None):
+        """
+        Send push message to specific user (synchronous HTTP call).
         
+        Pass `retry_key` (UUID) when the same message may be retried: LINE
+        accepts it only once and answers 409 for repeats.
+        Result includes `status_code` and, for 429, `retry_after` seconds.
+        """
         try:
-            response = requests.post(cls.BASE_URL, headers=headers, json=data, timeout=10)
-            if response.status_code == 200:
-                print(f"✅ LINE message sent to {line_user_id}")
-                return {'success': True}
-            else:
-                print(f"❌ Failed to send LINE message: {response.text}")
-                return {'success': False, 'error': response.text}
+            result = cls._post(cls.PUSH_PATH, {'to': line_user_id, 'messages': messages}, retry_key=retry_key)
         except Exception as e:
             print(f"❌ Error sending LINE message: {e}")
             return {'success': False, 'error': str(e)}
+        
+        if result.get('success'):
+            print(f"✅ LINE message sent to {line_user_id}")
+        elif 'status_code' in result:
+            print(f"❌ Failed to send LINE message: {result['error']}")
+        return result
+    
+    @classmethod
+    def send_multicast_message(cls, line_user_ids, messages, retry_key=None):
+        """Send the same messages to up to MULTICAST_LIMIT users in one call."""
+        if len(line_user_ids) > cls.MULTICAST_LIMIT:
+            raise ValueError(f"Multicast supports at most {cls.MULTICAST_LIMIT} recipients")
+        try:
+            result = cls._post(cls.MULTICAST_PATH, {'to': list(line_user_ids), 'messages': messages}, retry_key=retry_key)
+        except Exception as e:
+            print(f"❌ Error sending LINE multicast: {e}")
+            return {'success': False, 'error': str(e)}
+        
+        if not result.get('success') and 'status_code' in result:
+            print(f"❌ Failed to send LINE multicast: {result['error']}")
+        return result
+    
+    @staticmethod
+    def _parse_retry_after(value):
+        """Retry-After as seconds (delta-seconds or HTTP date), or None."""
+        if not value:
+            return None
+        try:
+            return max(int(value), 0)
+        except ValueError:
+            pass
+        try:
+            from email.utils import parsedate_to_datetime
+            return max((parsedate_to_datetime(value) - timezone.now()).total_seconds(), 0)
+        except (TypeError, ValueError):
+            return None
+    
+    @classmethod
+    def queue_push_message(cls, user, messages, category=''):
+        """Write a push message to the outbox (delivered after commit by the worker)."""
+        return LineOutboxService.enqueue(user, messages, category=category)
     
     @classmethod
     def send_text_message(cls, line_user_id, text):
@@ -54,9 +135,9 @@ class LineMessagingService:
 
     @classmethod
     def send_approval_notification(cls, user):
-        """Send 'Approved' Flex Message to user."""
+        """Queue 'Approved' Flex Message to user (LINE outbox)."""
         if not user.line_user_id:
-            return False
+            return {'success': False, 'error': 'No LINE user ID'}
             
         # Thai Date Formatting Helper
         now = timezone.localtime()
@@ -241,11 +322,11 @@ class LineMessagingService:
             }
         }
         
-        return cls.send_push_message(user.line_user_id, [flex_message])
+        return cls.queue_push_message(user, [flex_message], category='user_approved')
 
     @classmethod
     def send_rejection_notification(cls, user, rejection_reason=''):
-        """Send 'Rejected' Flex Message to user."""
+        """Queue 'Rejected' Flex Message to user (LINE outbox)."""
         if not user.line_user_id:
             return {'success': False, 'error': 'No LINE user ID'}
             
@@ -398,12 +479,13 @@ class LineMessagingService:
             }
         }
         
-        return cls.send_push_message(user.line_user_id, [flex_message])
+        return cls.queue_push_message(user, [flex_message], category='user_rejected')
 
     @classmethod
     def send_campaign_status_notification(cls, application, old_status, new_status):
         """
-        Send notification when campaign application status changes.
+        Queue notification when campaign application status changes.
+        Written to the LINE outbox, so it is safe to call inside a transaction.
         
         Args:
             application: CampaignApplication instance
@@ -636,4 +718,276 @@ class LineMessagingService:
             }
         }
         
-        return cls.send_push_message(user.line_user_id, [flex_message])
+        return cls.queue_push_message(application.user, [flex_message], category='campaign_status')
+
+
+class LineBulkDeliveryService:
+    """
+    Sends many messages at once, as fast as the LINE API allows.
+    
+    Recipients receiving identical messages are grouped into multicast calls
+    (up to 500 each). Everything else is sent as individual pushes. All calls
+    run concurrently over the shared keep-alive session, capped at
+    `concurrency` (LINE_BULK_CONCURRENCY). A call answered with 429 is retried
+    once if Retry-After is short. Every call carries a retry key.
+    """
+    
+    MAX_INLINE_RETRY_AFTER = 5  # seconds
+    
+    @classmethod
+    def deliver(cls, recipients, concurrency=None):
+        """
+        recipients: iterable of (key, line_user_id, messages).
+        Returns {key: {'status': 'sent'|'failed', 'error'?, 'via': 'push'|'multicast'}}.
+        """
+        concurrency = concurrency or getattr(settings, 'LINE_BULK_CONCURRENCY', 8)
+        
+        # Group recipients by identical message payload
+        groups = {}
+        for key, line_user_id, messages in recipients:
+            payload = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+            groups.setdefault(payload, {'messages': messages, 'targets': []})['targets'].append((key, line_user_id))
+        
+        calls = []
+        for group in groups.values():
+            targets = group['targets']
+            if len(targets) == 1:
+                calls.append(('push', group['messages'], targets))
+                continue
+            limit = LineMessagingService.MULTICAST_LIMIT
+            for i in range(0, len(targets), limit):
+                calls.append(('multicast', group['messages'], targets[i:i + limit]))
+        
+        results = {}
+        if not calls:
+            return results
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(calls)), thread_name_prefix='line-bulk') as pool:
+            for (via, _, targets), result in zip(calls, pool.map(cls._send, calls)):
+                for key, _ in targets:
+                    entry = {'status': 'sent' if result.get('success') else 'failed', 'via': via}
+                    if not result.get('success'):
+                        entry['error'] = result.get('error') or 'LINE API Error'
+                    results[key] = entry
+        return results
+    
+    @classmethod
+    def _send(cls, call):
+        via, messages, targets = call
+        retry_key = uuid.uuid4()
+        line_user_ids = [line_user_id for _, line_user_id in targets]
+        
+        for attempt in range(2):
+            if via == 'push':
+                result = LineMessagingService.send_push_message(line_user_ids[0], messages, retry_key=retry_key)
+            else:
+                result = LineMessagingService.send_multicast_message(line_user_ids, messages, retry_key=retry_key)
+            
+            retry_after = result.get('retry_after')
+            if result.get('status_code') != 429 or attempt or retry_after is None or retry_after > cls.MAX_INLINE_RETRY_AFTER:
+                return result
+            time.sleep(retry_after)
+        return result
+
+
+class LineOutboxService:
+    """
+    Delivers the LINE outbox (LineMessage rows).
+    
+    - enqueue() writes a row in the caller's transaction.
+    - claim() leases due rows to one sender (SKIP LOCKED where supported);
+      a sender that dies mid-send releases them when the lease expires.
+    - deliver() sends with the row's retry key and records the outcome:
+      429 waits for Retry-After, 5xx/network errors back off exponentially,
+      other 4xx fail permanently. Every failed send, 429 included, counts
+      towards MAX_ATTEMPTS.
+    
+    Run `manage.py deliver_line_messages --loop` (the deployed worker does). With
+    LINE_OUTBOX_DISPATCH_ON_COMMIT, messages are also handed to an in-process
+    sender right after commit, so they usually go out within a second.
+    """
+    
+    BATCH_SIZE = 50
+    MAX_ATTEMPTS = 8
+    BASE_BACKOFF = 30  # seconds, doubled per failed attempt
+    MAX_BACKOFF = 60 * 60
+    LEASE_SECONDS = 120
+    NOT_CONFIGURED_DELAY = 5 * 60
+    
+    @classmethod
+    def enqueue(cls, user, messages, category=''):
+        """Write one push message to the outbox. Safe inside transaction.atomic()."""
+        from .models import LineMessage
+        
+        if not user.line_user_id:
+            return {'success': False, 'error': 'No LINE user ID'}
+        
+        message = LineMessage.objects.create(
+            user=user,
+            line_user_id=user.line_user_id,
+            messages=messages,
+            category=category,
+        )
+        if getattr(settings, 'LINE_OUTBOX_DISPATCH_ON_COMMIT', True):
+            message_id = message.pk
+            transaction.on_commit(lambda: _dispatcher.submit(message_id))
+        return {'success': True, 'queued': True, 'message_id': message.pk}
+    
+    @classmethod
+    def claim(cls, limit=None, ids=None, now=None):
+        """Lease up to `limit` due messages (optionally only `ids`) and return them."""
+        from .models import LineMessage
+        
+        now = now or timezone.now()
+        with transaction.atomic():
+            queryset = LineMessage.objects.filter(
+                status='PENDING', next_attempt_at__lte=now
+            ).order_by('next_attempt_at', 'id')
+            if ids is not None:
+                queryset = queryset.filter(pk__in=ids)
+            if connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+            batch = list(queryset[:limit or cls.BATCH_SIZE])
+            if batch:
+                lease_until = now + timedelta(seconds=cls.LEASE_SECONDS)
+                LineMessage.objects.filter(pk__in=[m.pk for m in batch]).update(next_attempt_at=lease_until)
+        return batch
+    
+    @classmethod
+    def deliver(cls, message):
+        """Send one claimed message and record the outcome."""
+        if not settings.LINE_CHANNEL_ACCESS_TOKEN:
+            # Nothing is wrong with the message itself; keep it for later
+            message.next_attempt_at = timezone.now() + timedelta(seconds=cls.NOT_CONFIGURED_DELAY)
+            message.last_error = 'LINE Channel Access Token not configured'
+            message.save(update_fields=['next_attempt_at', 'last_error'])
+            return {'success': False, 'error': message.last_error}
+        
+        result = LineMessagingService.send_push_message(
+            message.line_user_id, message.messages, retry_key=message.retry_key
+        )
+        cls._record(message, result)
+        return result
+    
+    @classmethod
+    def deliver_due(cls, batch_size=None):
+        """Deliver everything currently due. Returns counts per outcome."""
+        counts = {'sent': 0, 'retrying': 0, 'failed': 0}
+        while True:
+            batch = cls.claim(limit=batch_size)
+            for message in batch:
+                cls.deliver(message)
+                key = {'SENT': 'sent', 'FAILED': 'failed'}.get(message.status, 'retrying')
+                counts[key] += 1
+            if len(batch) < (batch_size or cls.BATCH_SIZE):
+                return counts
+    
+    @classmethod
+    def backoff(cls, attempts):
+        delay = min(cls.BASE_BACKOFF * (2 ** max(attempts - 1, 0)), cls.MAX_BACKOFF)
+        return delay * random.uniform(0.8, 1.2)
+    
+    @classmethod
+    def _record(cls, message, result):
+        now = timezone.now()
+        status_code = result.get('status_code')
+        message.last_status_code = status_code
+        
+        if result.get('success'):
+            message.status = 'SENT'
+            message.sent_at = now
+            message.last_error = ''
+        elif status_code == 429:
+            # Rate limited: wait as told, but don't retry forever
+            message.attempts += 1
+            message.last_error = str(result.get('error', ''))[:1000]
+            if message.attempts >= cls.MAX_ATTEMPTS:
+                message.status = 'FAILED'
+                logger.warning(f"[LineOutbox] Message #{message.pk} still rate limited after {message.attempts} attempt(s)")
+            else:
+                delay = result.get('retry_after') or cls.backoff(message.attempts)
+                message.next_attempt_at = now + timedelta(seconds=delay)
+        else:
+            message.attempts += 1
+            message.last_error = str(result.get('error', ''))[:1000]
+            permanent = status_code is not None and 400 <= status_code < 500 and status_code not in (408, 409)
+            if permanent or message.attempts >= cls.MAX_ATTEMPTS:
+                message.status = 'FAILED'
+                logger.warning(f"[LineOutbox] Message #{message.pk} failed after {message.attempts} attempt(s): {message.last_error}")
+            else:
+                message.next_attempt_at = now + timedelta(seconds=cls.backoff(message.attempts))
+        
+        message.save(update_fields=[
+            'status', 'sent_at', 'attempts', 'next_attempt_at', 'last_status_code', 'last_error'
+        ])
+    
+    @classmethod
+    def seconds_until_next_due(cls, now=None):
+        """Seconds until the earliest pending message is due, or None if the outbox is empty."""
+        from .models import LineMessage
+        
+        now = now or timezone.now()
+        next_at = (
+            LineMessage.objects.filter(status='PENDING')
+            .order_by('next_attempt_at')
+            .values_list('next_attempt_at', flat=True)
+            .first()
+        )
+        if next_at is None:
+            return None
+        return max((next_at - now).total_seconds(), 0)
+    
+    @classmethod
+    def stats(cls):
+        """Outbox depth for the admin metrics endpoint."""
+        from django.db.models import Count, Min
+        from .models import LineMessage
+        
+        counts = dict(
+            LineMessage.objects.values_list('status').annotate(n=Count('id')).values_list('status', 'n')
+        )
+        oldest = LineMessage.objects.filter(status='PENDING').aggregate(oldest=Min('created_at'))['oldest']
+        return {
+            'pending': counts.get('PENDING', 0),
+            'sent': counts.get('SENT', 0),
+            'failed': counts.get('FAILED', 0),
+            'oldest_pending_seconds': round((timezone.now() - oldest).total_seconds()) if oldest else None,
+        }
+
+
+class _OutboxDispatcher:
+    """
+    One background thread per process that sends freshly committed outbox
+    rows. Best effort: anything it misses is picked up by the worker.
+    """
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def submit(self, message_id):
+        self._queue.put(message_id)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='line-outbox', daemon=True)
+                self._thread.start()
+    
+    def _run(self):
+        while True:
+            ids = [self._queue.get()]
+            while True:
+                try:
+                    ids.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                close_old_connections()
+                for message in LineOutboxService.claim(limit=len(ids), ids=ids):
+                    LineOutboxService.deliver(message)
+            except Exception as e:
+                logger.warning(f"[LineOutbox] Immediate dispatch failed, leaving it to the worker: {e}")
+            finally:
+                connection.close()
+
+
+_dispatcher = _OutboxDispatcher()
@@ -0,0 +1,42 @@
+"""
+Background tasks for users (run by `manage.py run_tasks`).
+"""
+
+import logging
+
+from django.utils import timezone
+
+from apps.core.avatars import AvatarMirrorError, mirror_avatar
+from apps.core.tasks import task
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+@task('users.mirror_line_picture', max_concurrency=2, max_attempts=3, base_backoff=60)
+def mirror_line_picture(user_id):
+    """
+    Store thumbnails of the user's LINE picture. Queued by LineLoginView when
+    the picture changed. Network errors raise and are retried; a picture that
+    is gone or unreadable is skipped (the previous thumbnails stay).
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not user.needs_picture_mirror:
+        return
+
+    source_url = user.picture_url
+    try:
+        avatar = mirror_avatar(source_url, 'line')
+    except AvatarMirrorError as e:
+        logger.warning(f"[Avatars] User #{user_id}: LINE picture not mirrored: {e}")
+        return
+
+    # Only if the picture didn't change again meanwhile. updated_at moves too:
+    # the shared campaign page shows the thumbnail and its ETag reads it.
+    User.objects.filter(pk=user_id, picture_url=source_url).update(
+        picture_small_url=avatar.small_url,
+        picture_medium_url=avatar.medium_url,
+        picture_mirrored_from=source_url,
+        updated_at=timezone.now(),
+    )
@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'corsheaders',
     # Local apps
+    'apps.core',
     'apps.users',
     'apps.influencers',
     'apps.campaigns',
@@ -98,9 +99,37 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # On disk, so tests with several threads get real locking (an in-memory
+            # test database fails concurrent writers with "table is locked")
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
         }
     }
 
+# Cache
+# Local memory by default (single instance). Set REDIS_URL to share the cache
+# (campaign feed, counters) between Cloud Run instances.
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'influencer-platform',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# Campaign feed cache (apps.api.services.feed_cache)
+FEED_CACHE_ALIAS = 'default'
+FEED_CACHE_TIMEOUT = int(os.getenv('FEED_CACHE_TIMEOUT', '300'))
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
@@ -169,6 +198,13 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # Proxies in front of the app (Cloud Run's load balancer): throttles key
+    # on the X-Forwarded-For entry this many hops back
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '1')),
+    'DEFAULT_THROTTLE_RATES': {
+        'social_fetch_ip': os.getenv('SOCIAL_FETCH_IP_RATE', '30/min'),
+        'social_fetch_user': os.getenv('SOCIAL_FETCH_USER_RATE', '20/min'),
+    },
 }
 
 # JWT Settings
@@ -187,6 +223,102 @@ LINE_CHANNEL_ACCESS_TOKEN = os.getenv('LINE_CHANNEL_ACCESS_TOKEN', '')
 LIFF_ID = os.getenv('VITE_LIFF_ID', '') # Use the same env var as frontend if possible, or mapping
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'https://springgreen-finch-342097.hostingersite.com')
 
+# Outbound HTTP (apps.core.http): keep-alive pool per host (for at most
+# HTTP_MAX_SESSIONS hosts, least recently used closed first), default timeouts
+# and retries (connection errors; 502/503/504 for idempotent methods)
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+HTTP_MAX_SESSIONS = int(os.getenv('HTTP_MAX_SESSIONS', '64'))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '2'))
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '15'))
+
+# Image proxy (apps.api.services.image_proxy): on-disk LRU cache of proxied
+# images, per-image size cap, seconds before upstream is asked again
+# (If-None-Match / If-Modified-Since), and browser/CDN max-age
+IMAGE_PROXY_CACHE_DIR = os.getenv('IMAGE_PROXY_CACHE_DIR') or str(BASE_DIR / 'cache' / 'image_proxy')
+IMAGE_PROXY_CACHE_MAX_BYTES = int(os.getenv('IMAGE_PROXY_CACHE_MAX_BYTES', str(500 * 1024 * 1024)))
+IMAGE_PROXY_MAX_IMAGE_BYTES = int(os.getenv('IMAGE_PROXY_MAX_IMAGE_BYTES', str(10 * 1024 * 1024)))
+IMAGE_PROXY_FRESH_SECONDS = int(os.getenv('IMAGE_PROXY_FRESH_SECONDS', '86400'))
+IMAGE_PROXY_MAX_AGE = int(os.getenv('IMAGE_PROXY_MAX_AGE', '604800'))
+# Only for local development against images on localhost / a private network
+IMAGE_PROXY_ALLOW_PRIVATE_HOSTS = os.getenv('IMAGE_PROXY_ALLOW_PRIVATE_HOSTS', 'False') == 'True'
+
+# Largest avatar (bytes) downloaded for thumbnail mirroring (apps.core.avatars)
+AVATAR_MAX_BYTES = int(os.getenv('AVATAR_MAX_BYTES', str(5 * 1024 * 1024)))
+
+# Google Drive link validation: cache per file id (seconds) for public links
+# and for links that still need access; concurrent checks in batch requests
+DRIVE_LINK_CACHE_TTL = int(os.getenv('DRIVE_LINK_CACHE_TTL', '300'))
+DRIVE_LINK_CACHE_DENIED_TTL = int(os.getenv('DRIVE_LINK_CACHE_DENIED_TTL', '15'))
+DRIVE_LINK_VALIDATION_CONCURRENCY = int(os.getenv('DRIVE_LINK_VALIDATION_CONCURRENCY', '8'))
+
+# Shared campaign Excel report (apps.api.services.campaign_report): finished
+# files cached per campaign (seconds, largest size cached), slip thumbnails
+# read from storage this many at a time
+SHARED_REPORT_CACHE_ALIAS = 'default'
+SHARED_REPORT_CACHE_TIMEOUT = int(os.getenv('SHARED_REPORT_CACHE_TIMEOUT', '600'))
+SHARED_REPORT_CACHE_MAX_BYTES = int(os.getenv('SHARED_REPORT_CACHE_MAX_BYTES', str(20 * 1024 * 1024)))
+SLIP_READ_CONCURRENCY = int(os.getenv('SLIP_READ_CONCURRENCY', '8'))
+
+# LINE Messaging API (override to point at a stub server for benchmarks)
+LINE_API_BASE_URL = os.getenv('LINE_API_BASE_URL', 'https://api.line.me')
+LINE_HTTP_POOL_SIZE = int(os.getenv('LINE_HTTP_POOL_SIZE', '16'))
+LINE_BULK_CONCURRENCY = int(os.getenv('LINE_BULK_CONCURRENCY', '8'))
+
+# LINE outbox: also try to send right after commit from a background thread
+# (the deliver_line_messages worker retries anything this misses)
+LINE_OUTBOX_DISPATCH_ON_COMMIT = os.getenv('LINE_OUTBOX_DISPATCH_ON_COMMIT', 'True').lower() == 'true'
+
+# Gemini: shared by OCR, follow-up generation and insight analysis. The request
+# rate holds across all processes; the concurrency limit is per process.
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '4'))
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv('GEMINI_REQUESTS_PER_MINUTE', '60'))
+GEMINI_ACQUIRE_TIMEOUT = int(os.getenv('GEMINI_ACQUIRE_TIMEOUT', '60'))
+
+# Image ingest (apps.core.images): worker processes for resizing (0 = in the
+# request thread) and the largest image accepted, in pixels
+IMAGE_INGEST_PROCESSES = int(os.getenv('IMAGE_INGEST_PROCESSES', '2'))
+IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', str(40_000_000)))
+
+# Concurrent uploads per batch (apps.core.storage.upload_files)
+STORAGE_UPLOAD_CONCURRENCY = int(os.getenv('STORAGE_UPLOAD_CONCURRENCY', '8'))
+
+# Social profile fetches: spacing between requests to each platform, shared by
+# every process (apps.core.ratelimit). Fetches that can't start right away are
+# queued for run_tasks. YouTube goes through the official API and isn't paced.
+SOCIAL_FETCH_RATE_LIMITS = {
+    'default': {
+        'interval': float(os.getenv('SOCIAL_FETCH_INTERVAL', '3')),
+        'jitter': float(os.getenv('SOCIAL_FETCH_JITTER', '7')),
+        'burst': int(os.getenv('SOCIAL_FETCH_BURST', '1')),
+    },
+    'youtube': {'interval': 0, 'jitter': 0},
+}
+# Seconds a platform is paused for everyone after it starts blocking us
+SOCIAL_FETCH_BLOCK_BACKOFF = int(os.getenv('SOCIAL_FETCH_BLOCK_BACKOFF', '900'))
+# Queued fetches one caller (user, else client IP) may have waiting at once
+SOCIAL_FETCH_MAX_PENDING = int(os.getenv('SOCIAL_FETCH_MAX_PENDING', '3'))
+
+# TikTok lookups go to the run_tiktok_sidecar process (warm browser sessions).
+# "host:port" (e.g. 127.0.0.1:8765) or "unix:/path.sock"; empty (the default)
+# starts a browser per lookup in-process.
+TIKTOK_SIDECAR_ADDRESS = os.getenv('TIKTOK_SIDECAR_ADDRESS', '')
+TIKTOK_SIDECAR_TIMEOUT = int(os.getenv('TIKTOK_SIDECAR_TIMEOUT', '30'))
+TIKTOK_SIDECAR_SESSIONS = int(os.getenv('TIKTOK_SIDECAR_SESSIONS', '2'))
+
+# refresh_social_accounts: fetch workers per platform lane
+SOCIAL_REFRESH_CONCURRENCY = {
+    'default': int(os.getenv('SOCIAL_REFRESH_CONCURRENCY', '1')),
+    'youtube': int(os.getenv('SOCIAL_REFRESH_YOUTUBE_CONCURRENCY', '4')),
+}
+
+# Social profile cache (seconds): fresh successes, how long a success may still
+# be served by sync while it refreshes, failures, and blocked (security stop)
+SOCIAL_PROFILE_CACHE_TTL = int(os.getenv('SOCIAL_PROFILE_CACHE_TTL', '600'))
+SOCIAL_PROFILE_CACHE_STALE_TTL = int(os.getenv('SOCIAL_PROFILE_CACHE_STALE_TTL', '86400'))
+SOCIAL_PROFILE_CACHE_FAILURE_TTL = int(os.getenv('SOCIAL_PROFILE_CACHE_FAILURE_TTL', '60'))
+SOCIAL_PROFILE_CACHE_BLOCKED_TTL = int(os.getenv('SOCIAL_PROFILE_CACHE_BLOCKED_TTL', '30'))
+
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
@@ -2,6 +2,42 @@
 
 # Ultra-minimal entrypoint - just start Gunicorn immediately
 # Migrations and seeding should be run manually or via a separate job
+#
+# Role (first argument, or ROLE): "web" (default) or "worker".
+# The worker runs background loops (`manage.py <command> --loop`): the
+# commands given after "worker", else WORKER_COMMANDS, else the defaults
+# below. It is deployed as its own Cloud Run service (see cloudbuild.yaml).
+
+ROLE="${1:-${ROLE:-web}}"
+
+if [ "$ROLE" = "worker" ]; then
+    [ $# -gt 0 ] && shift
+    WORKER_COMMANDS="${*:-${WORKER_COMMANDS:-run_tasks update_campaign_statuses deliver_line_messages}}"
+
+    # Cloud Run only keeps a container that listens on $PORT
+    python -c "
+import http.server, os
+class Health(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200); self.end_headers(); self.wfile.write(b'ok')
+    def log_message(self, *args):
+        pass
+http.server.HTTPServer(('0.0.0.0', int(os.environ.get('PORT', 8080))), Health).serve_forever()
+" &
+
+    # Pass Cloud Run's SIGTERM on to the loops
+    trap 'kill $(jobs -p) 2>/dev/null' TERM INT
+
+    for command in $WORKER_COMMANDS; do
+        echo "[$(date -u +'%Y-%m-%dT%H:%M:%SZ')] Starting worker: manage.py $command --loop"
+        python manage.py "$command" --loop &
+    done
+
+    # If any loop dies, exit so Cloud Run restarts the whole container
+    wait -n
+    echo "[$(date -u +'%Y-%m-%dT%H:%M:%SZ')] A worker exited, stopping"
+    exit 1
+fi
 
 # Run migrations
 echo "[$(date -u +'%Y-%m-%dT%H:%M:%SZ')] Running database migrations..."
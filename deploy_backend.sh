@@ -4,6 +4,7 @@
 PROJECT_ID="kt69-85563"
 REGION="asia-southeast1"
 SERVICE_NAME="influencer-backend"
+WORKER_SERVICE_NAME="influencer-worker"
 
 echo "🚀 Preparing to deploy $SERVICE_NAME to $PROJECT_ID ($REGION)..."
 
@@ -44,4 +45,21 @@ gcloud run deploy $SERVICE_NAME \
     --allow-unauthenticated \
     --env-vars-file env.yaml
 
+# Background worker: same image, `entrypoint.sh worker <loops...>`
+echo "📦 Deploying worker to Cloud Run..."
+IMAGE=$(gcloud run services describe $SERVICE_NAME \
+    --project $PROJECT_ID \
+    --region $REGION \
+    --format 'value(spec.template.spec.containers[0].image)')
+gcloud run deploy $WORKER_SERVICE_NAME \
+    --project $PROJECT_ID \
+    --region $REGION \
+    --image "$IMAGE" \
+    --args worker,run_tasks,update_campaign_statuses,deliver_line_messages \
+    --no-cpu-throttling \
+    --min-instances 1 \
+    --max-instances 1 \
+    --no-allow-unauthenticated \
+    --env-vars-file env.yaml
+
 echo "✅ Deployment command finished."
@@ -31,7 +31,8 @@ const FollowUpModal = ({ isOpen, onClose, selectedUsers, campaign, token, onSucc
                     status: u.status,
                     due_date: u.due_date
                 })),
-                campaign_title: campaign.title
+                campaign_title: campaign.title,
+                campaign_id: campaign.id
             })
             setMessages(res.data.results)
         } catch (err) {
@@ -56,7 +57,9 @@ const FollowUpModal = ({ isOpen, onClose, selectedUsers, campaign, token, onSucc
                     name: user.name,
                     status: user.status,
                 }],
-                campaign_title: campaign.title
+                campaign_title: campaign.title,
+                campaign_id: campaign.id,
+                regenerate: true
             })
             if (res.data.results && res.data.results.length > 0) {
                 const newMessage = res.data.results[0].message
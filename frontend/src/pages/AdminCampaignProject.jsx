@@ -28,7 +28,7 @@ const cleanText = (text) => {
 const getStageBadge = (participant) => {
     const status = participant.status
     const submissions = participant.submissions || {}
-    const inRevision = Object.values(submissions).some(s => s.status === 'revision_requested')
+    const inRevision = participant.in_revision ?? Object.values(submissions).some(s => s.status === 'revision_requested')
 
     if (inRevision) {
         return (
@@ -209,12 +209,22 @@ const AdminCampaignProject = () => {
     const loadData = async () => {
         try {
             setIsLoading(true)
-            const res = await fetch(`${API_BASE}/admin/campaigns/${id}/`, {
-                headers: { 'Authorization': `Bearer ${token}` }
-            })
+            const headers = { 'Authorization': `Bearer ${token}` }
+            const res = await fetch(`${API_BASE}/admin/campaigns/${id}/?participants=0`, { headers })
             const data = await res.json()
+
+            // Participant rows come in pages, without the heavy submission/insight JSON
+            // (fetched per participant when one is opened)
+            const rows = []
+            let next = `${API_BASE}/admin/campaigns/${id}/participants/?page_size=200`
+            while (next) {
+                const page = await (await fetch(next, { headers })).json()
+                rows.push(...page.results)
+                next = page.next
+            }
+
             setCampaign(data.campaign)
-            setParticipants(data.participants)
+            setParticipants(rows)
             setShowSlip(data.campaign.show_slip_to_client) // Initialize state
         } catch (err) {
             console.error(err)
@@ -224,6 +234,20 @@ const AdminCampaignProject = () => {
         }
     }
 
+    const openParticipant = async (row) => {
+        setSelectedParticipant(row)
+        try {
+            const res = await fetch(`${API_BASE}/admin/campaigns/${id}/participants/${row.id}/`, {
+                headers: { 'Authorization': `Bearer ${token}` }
+            })
+            if (!res.ok) return
+            const detail = await res.json()
+            setSelectedParticipant(prev => prev && prev.id === row.id ? { ...prev, ...detail } : prev)
+        } catch (err) {
+            console.error(err)
+        }
+    }
+
     const handleToggleShowSlip = async () => {
         try {
             const newStatus = !showSlip
@@ -605,7 +629,7 @@ const AdminCampaignProject = () => {
                                 <tr
                                     key={row.id}
                                     className={`transition-colors cursor-pointer group ${selectedIds.includes(row.id) ? 'bg-purple-50/50' : 'hover:bg-gray-50/50'}`}
-                                    onClick={() => setSelectedParticipant(row)}
+                                    onClick={() => openParticipant(row)}
                                 >
                                     <td className="px-6 py-4" onClick={e => e.stopPropagation()}>
                                         {/* Allow selection for most statuses except fully finished/rejected if needed, or allow ALL for flexibility */}
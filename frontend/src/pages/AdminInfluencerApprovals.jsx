@@ -438,7 +438,7 @@ const AdminInfluencerApprovals = () => {
                                                 <td className="p-4">
                                                     <div className="flex items-center gap-3">
                                                         <img
-                                                            src={inf.picture_url || '/default-avatar.png'}
+                                                            src={inf.picture_small_url || inf.picture_url || '/default-avatar.png'}
                                                             className="w-10 h-10 rounded-full object-cover bg-gray-100"
                                                             alt=""
                                                         />
@@ -517,7 +517,7 @@ const AdminInfluencerApprovals = () => {
                                                 className="w-5 h-5 rounded border-gray-300 mt-1"
                                             />
                                             <img
-                                                src={inf.picture_url || '/default-avatar.png'}
+                                                src={inf.picture_small_url || inf.picture_url || '/default-avatar.png'}
                                                 className="w-12 h-12 rounded-full object-cover bg-gray-100"
                                                 alt=""
                                             />
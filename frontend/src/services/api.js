@@ -87,17 +87,41 @@ export const applicationAPI = {
 }
 
 export const utilityAPI = {
-    validateDriveLink: (link) => api.post('/validate-drive-link/', { link })
+    validateDriveLink: (link) => api.post('/validate-drive-link/', { link }),
+    validateDriveLinks: (links) => api.post('/validate-drive-links/', { links })
+}
+
+// Social fetches are rate limited per platform on the server. When a
+// platform was fetched too recently the API answers 202 with a job handle;
+// poll it until the fetch has run (by the backend worker) and resolve with
+// the final response. Gives up after SOCIAL_JOB_MAX_WAIT_MS so a stuck job
+// can't keep the form spinning.
+const SOCIAL_JOB_MAX_WAIT_MS = 2 * 60 * 1000
+
+const waitForSocialJob = async (request) => {
+    const deadline = Date.now() + SOCIAL_JOB_MAX_WAIT_MS
+    let response = await request
+    while (response.data?.pending && response.data.job?.status_url) {
+        if (Date.now() >= deadline) {
+            const error = new Error('ดึงข้อมูลโปรไฟล์นานเกินไป กรุณาลองใหม่อีกครั้ง')
+            error.job = response.data.job
+            throw error
+        }
+        const eta = response.data.job.eta_seconds || 0
+        await new Promise((resolve) => setTimeout(resolve, Math.min(Math.max(eta, 1), 5) * 1000))
+        response = await api.get(response.data.job.status_url)
+    }
+    return response
 }
 
 export const socialAPI = {
     listAccounts: () => api.get('/social/accounts/'),
-    connect: (platform, profileUrl, extraData = {}) => api.post('/social/connect/', {
+    connect: (platform, profileUrl, extraData = {}) => waitForSocialJob(api.post('/social/connect/', {
         platform,
         profile_url: profileUrl,
         ...extraData
-    }),
+    })),
     disconnect: (id) => api.delete(`/social/accounts/${id}/`),
-    sync: (id) => api.post(`/social/accounts/${id}/sync/`),
-    fetchInfo: (platform, url) => api.get(`/utils/fetch-social-info/?platform=${platform}&url=${encodeURIComponent(url)}`)
+    sync: (id) => waitForSocialJob(api.post(`/social/accounts/${id}/sync/`)),
+    fetchInfo: (platform, url) => waitForSocialJob(api.get(`/utils/fetch-social-info/?platform=${platform}&url=${encodeURIComponent(url)}`))
 }